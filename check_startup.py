@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Verificação de regressão do tempo de inicialização (python -X importtime).
+
+Importa cada ponto de entrada sem interface gráfica em um processo novo e
+falha se algum módulo pesado (matplotlib, geopandas, ...) for carregado na
+importação. Também mostra o tempo de importação ao lado do tempo de carregar
+data/distances.json, que é o piso esperado para o uso pela linha de comando.
+
+Uso:
+    python check_startup.py [--runs 5] [--max-ms 150]
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Módulos que só devem ser carregados quando usados
+HEAVY_MODULES = ("matplotlib", "geopandas", "shapely", "pandas", "networkx", "numpy", "tabulate", "requests", "tkinter")
+
+# Ponto de entrada -> módulos proibidos além dos pesados
+ENTRY_POINTS = {
+    "main": ("asyncio", "multiprocessing"),
+    "utils.batch": ("asyncio",),
+    "server": (),
+    "route_daemon": ("asyncio",),
+    # O cliente não deve carregar nada do projeto além dele mesmo
+    "route_client": ("main", "models", "search", "utils"),
+}
+
+LOAD_JSON = (
+    "import time; began = time.perf_counter(); "
+    "from utils.data_loader import DataLoader; DataLoader().load_from_json('data/distances.json'); "
+    "print((time.perf_counter() - began) * 1000)"
+)
+
+
+def import_profile(module):
+    """
+    Importa `module` em um interpretador novo.
+
+    Returns:
+        tuple: (tempo cumulativo da importação em ms, conjunto de módulos carregados)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+
+    loaded = set()
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # cabeçalho
+        loaded.add(name.strip())
+        if name.strip() == module and not name[1:].startswith(" "):
+            total_us = int(cumulative)
+
+    return total_us / 1000, loaded
+
+
+def json_load_time():
+    completed = subprocess.run([sys.executable, "-c", LOAD_JSON], capture_output=True, text=True, check=True)
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def forbidden_loaded(loaded, extra):
+    return sorted(
+        name for name in loaded
+        if any(name == prefix or name.startswith(prefix + ".") for prefix in HEAVY_MODULES + extra)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica o tempo de inicialização dos pontos de entrada")
+    parser.add_argument("--runs", type=int, default=5, help="Repetições por módulo (usa a melhor)")
+    parser.add_argument("--max-ms", type=float, default=None, help="Falha se alguma importação passar deste tempo")
+    args = parser.parse_args(argv)
+
+    json_ms = min(json_load_time() for _ in range(args.runs))
+    print(f"Carregar data/distances.json: {json_ms:.1f} ms\n")
+    print(f"{'Módulo':<16}{'Importação (ms)':>18}   Problemas")
+
+    failures = 0
+    for module, extra in ENTRY_POINTS.items():
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        best_ms = min(ms for ms, _ in profiles)
+        problems = forbidden_loaded(set().union(*(loaded for _, loaded in profiles)), extra)
+
+        messages = []
+        if problems:
+            top_level = sorted({name.split(".")[0] for name in problems})
+            messages.append("carrega " + ", ".join(top_level))
+        if args.max_ms is not None and best_ms > args.max_ms:
+            messages.append(f"acima de {args.max_ms:.0f} ms")
+        failures += bool(messages)
+
+        print(f"{module:<16}{best_ms:>18.1f}   {'; '.join(messages) or 'ok'}")
+
+    if failures:
+        print(f"\n{failures} ponto(s) de entrada com regressão.")
+        return 1
+    print("\nNenhuma regressão encontrada.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
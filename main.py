@@ -1,26 +1,38 @@
 import sys
 import os
+import argparse
+import contextlib
+import threading
+from collections import OrderedDict
 from models.city import City
-from utils.data_loader import DataLoader, MockDataLoader
+from utils.data_loader import DataLoader, MockDataLoader, DEFAULT_DATA_FILE
 from search.bfs import BFS
 from search.dfs import DFS
 from search.ucs import UCS
 from search.greedy import Greedy
 from search.astar import AStar
+from search.interface import SearchResult
+from search.dijkstra import bounded_dijkstra, nearest_target
+from utils.single_flight import SingleFlight
+
+# Limite de trechos memorizados: o PathFinder vive tanto quanto o servidor e o daemon
+MAX_CACHED_LEGS = 4096
 
 class PathFinder:
-    def __init__(self, use_mock_data=False):
-        # Carrega os dados
-        if use_mock_data:
+    def __init__(self, use_mock_data=False, graph=None):
+        # Carrega os dados (ou usa o grafo já carregado por quem chama)
+        if graph is not None:
+            self.graph = graph
+        elif use_mock_data:
             self.graph = MockDataLoader().load_data()
         else:
-            # Tenta carregar dados do JSON
+            # Tenta carregar o arquivo de distâncias (JSON, CSV ou binário)
             data_loader = DataLoader()
             
-            # Verifica se o arquivo JSON existe
-            json_path = "data/distances.json"
+            # Verifica se o arquivo existe
+            json_path = DEFAULT_DATA_FILE
             if os.path.exists(json_path):
-                self.graph = data_loader.load_from_json(json_path)
+                self.graph = data_loader.load(json_path)
             else:
                 print(f"Arquivo {json_path} não encontrado. Usando dados simulados.")
                 self.graph = data_loader._create_mock_data()
@@ -33,6 +45,19 @@ class PathFinder:
             "greedy": Greedy(),
             "astar": AStar()
         }
+        
+        # Cache LRU de trechos já calculados: (origem, destino, algoritmo, transporte) -> SearchResult
+        self.leg_cache = OrderedDict()
+        self._leg_lock = threading.Lock()
+        
+        # Índice espacial das capitais, criado sob demanda
+        self._spatial_index = None
+        
+        # Executores das comparações concorrentes, criados sob demanda
+        self._executors = {}
+        
+        # Coalesce buscas idênticas feitas ao mesmo tempo por várias threads
+        self.flight = SingleFlight()
     
     def find_path(self, origin, destination, algorithm_name="astar", transport_type="air"):
         # Converte strings para objetos City
@@ -50,9 +75,154 @@ class PathFinder:
             print(f"Erro: Algoritmo '{algorithm_name}' não encontrado.")
             return None
         
-        # Executa a busca
-        result = algorithm.search(self.graph, start, goal, transport_type)
-        return result
+        # Executa a busca; consultas idênticas simultâneas compartilham o resultado
+        key = (origin, destination, algorithm_name.lower(), transport_type)
+        return self.flight.do(key, algorithm.search, self.graph, start, goal, transport_type)
+    
+    def find_leg(self, origin, destination, algorithm_name="astar", transport_type="air"):
+        """Busca um trecho reaproveitando o resultado memorizado quando possível"""
+        return self._find_leg(origin, destination, algorithm_name, transport_type)[0]
+    
+    def _find_leg(self, origin, destination, algorithm_name, transport_type):
+        """Retorna (SearchResult ou None, True se o trecho veio do cache)"""
+        key = (origin, destination, algorithm_name.lower(), transport_type)
+        with self._leg_lock:
+            result = self.leg_cache.get(key)
+            if result is not None:
+                self.leg_cache.move_to_end(key)
+                return result, True
+        
+        result = self.find_path(origin, destination, algorithm_name, transport_type)
+        if result is not None:
+            with self._leg_lock:
+                self.leg_cache[key] = result
+                if len(self.leg_cache) > MAX_CACHED_LEGS:
+                    self.leg_cache.popitem(last=False)
+        return result, False
+    
+    def find_route_via(self, origin, via, destination, transport_type="air", algorithm_name="astar"):
+        """
+        Encontra uma rota que passa, em ordem, pelas capitais intermediárias em `via`.
+        
+        Cada trecho é buscado com find_leg, então itinerários que compartilham
+        trechos (ou que trocam apenas uma parada) só recalculam os trechos novos.
+        
+        Returns:
+            SearchResult com o caminho completo, ou None se algum trecho falhar.
+            expanded_nodes soma apenas os trechos buscados nesta chamada
+            (trechos vindos do cache contam zero).
+        """
+        stops = [origin] + list(via) + [destination]
+        path = []
+        distance = 0
+        expanded_nodes = 0
+        
+        for leg_origin, leg_destination in zip(stops, stops[1:]):
+            # Paradas repetidas em sequência não geram trecho
+            if leg_origin == leg_destination:
+                continue
+            
+            leg, cached = self._find_leg(leg_origin, leg_destination, algorithm_name, transport_type)
+            if leg is None or not leg.path:
+                return None
+            
+            # Evita duplicar a cidade de junção entre dois trechos
+            path.extend(leg.path if not path else leg.path[1:])
+            distance += leg.distance
+            if not cached:
+                expanded_nodes += leg.expanded_nodes
+        
+        if not path:
+            path = [City(origin)]
+        
+        return SearchResult(path, distance, expanded_nodes)
+    
+    def clear_leg_cache(self):
+        with self._leg_lock:
+            self.leg_cache.clear()
+    
+    def reachable_within(self, origin, max_km, transport_type="air"):
+        """
+        Retorna as capitais alcançáveis a partir de `origin` dentro de max_km.
+        
+        Usa um único Dijkstra limitado pelo raio, em vez de uma busca por destino.
+        
+        Returns:
+            dict {nome da capital: distância}, em ordem crescente de distância,
+            ou None se a origem não existir
+        """
+        start = City(origin)
+        if start not in self.graph.cities:
+            print(f"Erro: Cidade '{origin}' não encontrada.")
+            return None
+        
+        distances, _ = bounded_dijkstra(self.graph, start, transport_type, max_km)
+        return {city.name: distance for city, distance in distances.items() if city != start}
+    
+    def find_nearest_of(self, origin, candidates, transport_type="air"):
+        """
+        Determina qual das capitais candidatas está mais perto de `origin`
+        pela rota, usando um único Dijkstra com múltiplos alvos.
+        
+        Returns:
+            SearchResult cujo último elemento do caminho é a capital mais
+            próxima (a origem é ignorada se estiver entre as candidatas),
+            ou None se alguma cidade não existir
+        """
+        start = City(origin)
+        targets = {City(name) for name in candidates}
+        
+        if start not in self.graph.cities or not targets <= self.graph.cities:
+            print(f"Erro: Uma ou mais cidades não foram encontradas.")
+            return None
+        
+        return nearest_target(self.graph, start, targets, transport_type)
+    
+    @property
+    def spatial_index(self):
+        if self._spatial_index is None:
+            # Importado sob demanda para não exigir NumPy no uso básico
+            from utils.spatial_index import SpatialIndex
+            from geo_coordinates import CAPITAL_COORDINATES
+            
+            known = {city.name for city in self.graph.cities}
+            coordinates = {name: coord for name, coord in CAPITAL_COORDINATES.items() if name in known}
+            self._spatial_index = SpatialIndex(coordinates)
+        return self._spatial_index
+    
+    def snap_to_capital(self, lat, lon):
+        """Retorna (capital mais próxima, distância em km) de uma coordenada arbitrária"""
+        return self.spatial_index.nearest(lat, lon)
+    
+    def find_path_from_coordinates(self, origin_coords, destination_coords, algorithm_name="astar", transport_type="air"):
+        """
+        Busca uma rota entre coordenadas arbitrárias (lat, lon), começando e
+        terminando nas capitais mais próximas.
+        
+        Returns:
+            dict com as capitais de origem/destino, as distâncias até elas
+            e o SearchResult da rota, ou None se a busca falhar
+        """
+        # Uma única consulta em lote para os dois pontos
+        index = self.spatial_index
+        distances, indices = index.query(
+            [origin_coords[0], destination_coords[0]],
+            [origin_coords[1], destination_coords[1]]
+        )
+        origin, destination = index.names[indices[0, 0]], index.names[indices[1, 0]]
+        origin_km, destination_km = float(distances[0, 0]), float(distances[1, 0])
+        
+        result = self.find_path(origin, destination, algorithm_name, transport_type)
+        if result is None:
+            return None
+        
+        return {
+            "origin": origin,
+            "origin_snap_km": origin_km,
+            "destination": destination,
+            "destination_snap_km": destination_km,
+            "result": result
+        }
     
     def find_best_transport(self, origin, destination, algorithm_name="astar"):
         # Busca por via aérea
@@ -85,14 +255,246 @@ class PathFinder:
         
         for name, algorithm in self.algorithms.items():
             result = algorithm.search(self.graph, City(origin), City(destination), transport_type)
-            results[name] = {
-                "path": [city.name for city in result.path] if result.path else None,
-                "distance": result.distance,
-                "expanded_nodes": result.expanded_nodes,
-                "is_optimal": result.is_optimal() if hasattr(result, "is_optimal") else "N/A"
-            }
+            results[name] = self._summarize(result)
         
         return results
+    
+    def compare_algorithms_concurrent(self, origin, destination, transport_type="air", executor="thread", timeout=None):
+        """
+        Executa os algoritmos ao mesmo tempo sobre o grafo (somente leitura).
+        
+        Args:
+            executor: "thread" ou "process" (evita o GIL em grafos grandes)
+            timeout: Tempo limite por algoritmo em segundos (único ou dict)
+        
+        Returns:
+            tuple: (resultados no formato de compare_algorithms, acrescidos de
+            "status", "time" e "cpu_time"; dict com "wall_time" e "cpu_time")
+        """
+        # Importado sob demanda: concurrent.futures pesa no início do CLI
+        from utils.concurrent_search import create_executor, run_concurrent, discard_executor
+        
+        if executor not in self._executors:
+            self._executors[executor] = create_executor(executor, self.graph, max_workers=len(self.algorithms))
+        
+        timed_results, timing = run_concurrent(
+            self._executors[executor], self.algorithms, self.graph,
+            City(origin), City(destination), transport_type, timeout
+        )
+        
+        # Buscas em processos que estouraram o prazo continuam ocupando os
+        # trabalhadores; o executor é trocado para não atrasar as próximas
+        if executor == "process" and any(timed.status == "timeout" for timed in timed_results.values()):
+            discard_executor(self._executors.pop(executor))
+        
+        results = {}
+        for name, timed in timed_results.items():
+            summary = self._summarize(timed.result) if timed.result else {
+                "path": None,
+                "distance": float('inf'),
+                "expanded_nodes": 0,
+                "is_optimal": "N/A"
+            }
+            summary.update({"status": timed.status, "time": timed.elapsed, "cpu_time": timed.cpu_time})
+            results[name] = summary
+        
+        return results, timing
+    
+    def close(self):
+        """Encerra os executores criados para as comparações concorrentes"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+    
+    def _summarize(self, result):
+        return {
+            "path": [city.name for city in result.path] if result.path else None,
+            "distance": result.distance,
+            "expanded_nodes": result.expanded_nodes,
+            "is_optimal": result.is_optimal() if hasattr(result, "is_optimal") else "N/A"
+        }
+
+
+def run_sweep_command(output_file, algorithms=None, modes=("air", "land"), processes=None, synthetic=None, seed=0):
+    """Executa a varredura de todos os pares origem-destino em um Pool de processos"""
+    # Importados sob demanda: dependem de NumPy
+    from utils.shared_graph import SharedGraph
+    from utils.sweep import run_sweep
+    
+    if synthetic:
+        from utils.synthetic import generate_graph_arrays
+        names, _, adjacency = generate_graph_arrays(synthetic, seed=seed)
+        shared = SharedGraph.publish(names, adjacency)
+    else:
+        shared = SharedGraph.from_graph(PathFinder().graph)
+    
+    def progress(done, total):
+        print(f"\rOrigens concluídas: {done}/{total}", end="", file=sys.stderr, flush=True)
+    
+    try:
+        summary = run_sweep(shared, output_file, algorithms, modes, processes, progress=progress)
+    finally:
+        shared.close()
+    
+    print(file=sys.stderr)
+    print(f"{summary['rows']} resultados gravados em {output_file} ({summary['elapsed']:.2f} s)")
+    return summary
+
+
+def _batch_path_finder():
+    """Cria o PathFinder do lote; mensagens de carregamento vão para stderr"""
+    with contextlib.redirect_stdout(sys.stderr):
+        return PathFinder()
+
+
+def run_batch_command(input_file=None, output_file=None, algorithm="astar", transport_type="air",
+                      processes=1, chunk_size=256, show_progress=False):
+    """Responde consultas de um arquivo (ou stdin) e grava JSONL em fluxo"""
+    from utils.batch import run_batch, read_queries, open_input, input_format_for
+    
+    def progress(done, elapsed):
+        print(f"\rConsultas respondidas: {done} ({done / max(elapsed, 1e-9):.0f}/s)", end="", file=sys.stderr, flush=True)
+    
+    source = open_input(input_file)
+    output = open(output_file, 'w', encoding='utf-8') if output_file not in (None, "-") else sys.stdout
+    try:
+        queries = read_queries(source, input_format_for(input_file))
+        summary = run_batch(
+            _batch_path_finder, queries, output, algorithm, transport_type,
+            processes, chunk_size, progress if show_progress else None
+        )
+    except BrokenPipeError:
+        # Leitor fechou a saída (ex.: `| head`); encerra sem rastreamento
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return None
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    
+    if show_progress:
+        print(file=sys.stderr)
+        print(f"{summary['queries']} consultas ({summary['errors']} com erro) em {summary['elapsed']:.2f} s", file=sys.stderr)
+    return summary
+
+
+def run_render_command(input_file=None, all_pairs=False, output_dir="output/maps", algorithm="astar",
+                       transport_type="air", processes=None, chunk_size=16, figsize=(10, 8), dpi=100,
+                       cache_options=None, show_progress=False, output_format="png"):
+    """Renderiza mapas das rotas de um arquivo de consultas (ou de todos os pares) sem display"""
+    from utils.batch import read_queries, open_input, input_format_for
+    from utils.render_batch import render_routes, all_pairs_queries
+    
+    def progress(done, elapsed):
+        print(f"\rRotas renderizadas: {done} ({done / max(elapsed, 1e-9):.1f}/s)", end="", file=sys.stderr, flush=True)
+    
+    source = None
+    if all_pairs:
+        names = sorted(city.name for city in _batch_path_finder().graph.cities)
+        queries = all_pairs_queries(names, (transport_type,))
+    else:
+        source = open_input(input_file)
+        queries = read_queries(source, input_format_for(input_file))
+    
+    os.makedirs(output_dir, exist_ok=True)
+    try:
+        with open(os.path.join(output_dir, "manifest.jsonl"), 'w', encoding='utf-8') as manifest:
+            summary = render_routes(
+                _batch_path_finder, queries, output_dir, manifest, algorithm, transport_type,
+                processes, chunk_size, figsize, dpi, cache_options, progress if show_progress else None,
+                output_format
+            )
+    finally:
+        if source is not None and source is not sys.stdin:
+            source.close()
+    
+    if show_progress:
+        print(file=sys.stderr)
+    print(f"{summary['images']} arquivos em {output_dir} ({summary['cached']} do cache, "
+          f"{summary['errors']} consultas com erro, {summary['elapsed']:.2f} s)")
+    return summary
+
+
+def run_corridors_command(json_file="data/distances.json"):
+    """Calcula (ou valida) os corredores terrestres de todos os trechos por terra"""
+    import time
+    from geo_coordinates import CAPITAL_COORDINATES
+    from utils.map_renderer import load_map_basemap
+    from utils.land_corridors import land_edges_from_json, load_corridors
+    
+    began = time.perf_counter()
+    edges = land_edges_from_json(json_file)
+    corridors = load_corridors(load_map_basemap(verbose=False), CAPITAL_COORDINATES, edges, verbose=True)
+    print(f"{len(corridors)} trechos terrestres, {len(corridors.points)} pontos "
+          f"({time.perf_counter() - began:.2f} s)")
+    return corridors
+
+
+def run_convert_command(input_file, output_file):
+    """Converte o arquivo de distâncias (JSON, CSV ou binário) para CSV de arestas ou binário"""
+    import time
+    from utils.graph_formats import write_edge_csv, write_graph_binary
+    
+    began = time.perf_counter()
+    try:
+        graph = DataLoader().read(input_file)
+    except (OSError, ValueError, KeyError) as e:
+        sys.exit(f"Erro ao ler {input_file}: {e}")
+    if os.path.splitext(output_file)[1].lower() == ".csv":
+        write_edge_csv(graph, output_file)
+    else:
+        write_graph_binary(graph, output_file)
+    print(f"{input_file} -> {output_file}: {len(graph.cities)} cidades, "
+          f"{os.path.getsize(output_file) / 1024:.1f} KB ({time.perf_counter() - began:.2f} s)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de Rotas entre Capitais")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    sweep = subparsers.add_parser("sweep", help="Executa todos os algoritmos para todos os pares origem-destino")
+    sweep.add_argument("--output", default="output/sweep.csv", help="Arquivo de saída (.csv ou .jsonl)")
+    sweep.add_argument("--algorithms", default="bfs,dfs,ucs,greedy,astar", help="Algoritmos separados por vírgula")
+    sweep.add_argument("--modes", default="air,land", help="Meios de transporte separados por vírgula")
+    sweep.add_argument("--processes", type=int, default=None, help="Número de processos (padrão: núcleos disponíveis)")
+    sweep.add_argument("--synthetic", type=int, default=None, help="Usa um grafo sintético com N cidades")
+    sweep.add_argument("--seed", type=int, default=0, help="Semente do grafo sintético")
+    
+    batch = subparsers.add_parser("batch", help="Responde consultas de um arquivo CSV/JSONL ou da entrada padrão")
+    batch.add_argument("input", nargs="?", default="-", help="Arquivo de consultas (padrão: entrada padrão)")
+    batch.add_argument("--output", default="-", help="Arquivo JSONL de saída (padrão: saída padrão)")
+    batch.add_argument("--algorithm", default="astar", help="Algoritmo padrão das consultas")
+    batch.add_argument("--transport", choices=("air", "land"), default="air", help="Transporte padrão das consultas")
+    batch.add_argument("--processes", type=int, default=1, help="Número de processos (padrão: 1)")
+    batch.add_argument("--chunk-size", type=int, default=256, help="Consultas enviadas por vez a cada processo")
+    batch.add_argument("--progress", action="store_true", help="Mostra o progresso na saída de erro")
+    
+    render = subparsers.add_parser("render", help="Gera mapas das rotas (PNG, SVG ou GeoJSON) sem interface gráfica")
+    render.add_argument("input", nargs="?", default="-", help="Arquivo de consultas CSV/JSONL (padrão: entrada padrão)")
+    render.add_argument("--all-pairs", action="store_true", help="Renderiza todos os pares origem-destino")
+    render.add_argument("--output-dir", default="output/maps", help="Diretório das imagens e do manifest.jsonl")
+    render.add_argument("--format", choices=("png", "svg", "geojson"), default="png",
+                        help="png usa o matplotlib; svg e geojson são gerados direto, muito mais rápido")
+    render.add_argument("--algorithm", default="astar", help="Algoritmo padrão das consultas")
+    render.add_argument("--transport", choices=("air", "land"), default="air", help="Transporte padrão das consultas")
+    render.add_argument("--processes", type=int, default=None, help="Número de processos (padrão: núcleos disponíveis)")
+    render.add_argument("--chunk-size", type=int, default=16, help="Rotas enviadas por vez a cada processo")
+    render.add_argument("--size", default="10x8", help="Tamanho da figura em polegadas, LARGURAxALTURA")
+    render.add_argument("--dpi", type=int, default=100, help="Resolução das imagens")
+    render.add_argument("--cache-dir", default="data/cache/images", help="Cache de imagens já renderizadas")
+    render.add_argument("--cache-size", type=float, default=200, help="Tamanho máximo do cache em MB")
+    render.add_argument("--no-cache", action="store_true", help="Renderiza todas as rotas, sem usar o cache")
+    render.add_argument("--progress", action="store_true", help="Mostra o progresso na saída de erro")
+    
+    corridors = subparsers.add_parser("corridors", help="Pré-calcula os corredores terrestres usados nos mapas")
+    corridors.add_argument("--data", default="data/distances.json", help="Arquivo de distâncias com os trechos terrestres")
+    
+    convert = subparsers.add_parser("convert", help="Converte o arquivo de distâncias para CSV de arestas ou binário")
+    convert.add_argument("input", help="Arquivo de origem (JSON, CSV de arestas ou binário)")
+    convert.add_argument("output", help="Arquivo de destino: .csv para CSV de arestas, qualquer outra extensão (ex.: .rcg) para binário")
+    
+    return parser.parse_args(argv)
 
 
 def print_menu():
@@ -100,11 +502,53 @@ def print_menu():
     print("1. Encontrar rota entre duas capitais")
     print("2. Comparar algoritmos para uma rota")
     print("3. Analisar cenários de teste")
+    print("4. Rota com paradas intermediárias")
+    print("5. Capitais alcançáveis dentro de um raio")
+    print("6. Rota entre coordenadas (lat, lon)")
+    print("7. Capital mais próxima entre candidatas")
+    print("8. Varredura completa (todos os pares)")
     print("0. Sair")
     print("==========================================")
 
 
-def main():
+def main(argv=None):
+    args = parse_args(argv)
+    
+    if args.command == "sweep":
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        run_sweep_command(
+            args.output, args.algorithms.split(","), args.modes.split(","),
+            args.processes, args.synthetic, args.seed
+        )
+        return
+    
+    if args.command == "batch":
+        run_batch_command(
+            args.input, args.output, args.algorithm, args.transport,
+            args.processes, args.chunk_size, args.progress
+        )
+        return
+    
+    if args.command == "render":
+        width, height = (float(value) for value in args.size.lower().split("x"))
+        cache_options = None if args.no_cache else {"directory": args.cache_dir, "max_bytes": int(args.cache_size * 1024 * 1024)}
+        run_render_command(
+            args.input, args.all_pairs, args.output_dir, args.algorithm, args.transport,
+            args.processes, args.chunk_size, (width, height), args.dpi, cache_options, args.progress,
+            args.format
+        )
+        return
+    
+    if args.command == "corridors":
+        run_corridors_command(args.data)
+        return
+    
+    if args.command == "convert":
+        run_convert_command(args.input, args.output)
+        return
+    
     # Inicializa o sistema
     path_finder = PathFinder(use_mock_data=False)  # Agora usa dados do JSON por padrão
     
@@ -114,6 +558,7 @@ def main():
         
         if option == "0":
             print("Encerrando o programa...")
+            path_finder.close()
             break
             
         elif option == "1":
@@ -140,8 +585,13 @@ def main():
             origin = input("Cidade de origem: ")
             destination = input("Cidade de destino: ")
             transport = input("Meio de transporte (air/land): ") or "air"
+            executor = input("Execução (sequential/thread/process): ") or "sequential"
             
-            results = path_finder.compare_algorithms(origin, destination, transport)
+            timing = None
+            if executor in ("thread", "process"):
+                results, timing = path_finder.compare_algorithms_concurrent(origin, destination, transport, executor)
+            else:
+                results = path_finder.compare_algorithms(origin, destination, transport)
             
             print("\n--- Comparação de Algoritmos ---")
             for name, result in results.items():
@@ -150,6 +600,12 @@ def main():
                 print(f"Distância: {result['distance']} km")
                 print(f"Nós expandidos: {result['expanded_nodes']}")
                 print(f"Solução ótima: {result['is_optimal']}")
+                if timing:
+                    print(f"Status: {result['status']} ({result['time'] * 1000:.2f} ms)")
+            
+            if timing:
+                print(f"\nTempo total (relógio): {timing['wall_time'] * 1000:.2f} ms")
+                print(f"Tempo de CPU somado: {timing['cpu_time'] * 1000:.2f} ms")
                 
         elif option == "3":
             # Análise de cenários
@@ -170,6 +626,86 @@ def main():
                     print(f"  Distância: {result['distance']} km")
                     print(f"  Nós expandidos: {result['expanded_nodes']}")
                 
+        elif option == "4":
+            origin = input("Cidade de origem: ")
+            via = input("Paradas intermediárias (separadas por vírgula): ")
+            destination = input("Cidade de destino: ")
+            transport = input("Meio de transporte (air/land): ") or "air"
+            algorithm = input("Algoritmo (bfs, dfs, ucs, greedy, astar): ") or "astar"
+            
+            stops = [stop.strip() for stop in via.split(",") if stop.strip()]
+            result = path_finder.find_route_via(origin, stops, destination, transport, algorithm)
+            
+            if result and result.path:
+                print("\n--- Rota com Paradas ---")
+                print(f"Caminho: {' -> '.join(city.name for city in result.path)}")
+                print(f"Distância total: {result.distance} km")
+                print(f"Nós expandidos: {result.expanded_nodes}")
+                print(f"Trechos em cache: {len(path_finder.leg_cache)}")
+            else:
+                print("Não foi possível encontrar um caminho.")
+                
+        elif option == "5":
+            origin = input("Cidade de origem: ")
+            max_km = input("Distância máxima (km): ")
+            transport = input("Meio de transporte (air/land): ") or "air"
+            
+            try:
+                max_km = float(max_km)
+            except ValueError:
+                print("Distância inválida.")
+                continue
+            
+            reachable = path_finder.reachable_within(origin, max_km, transport)
+            
+            if reachable is not None:
+                print(f"\n--- Capitais a até {max_km:g} km de {origin} ---")
+                for name, distance in reachable.items():
+                    print(f"{name}: {distance} km")
+                print(f"Total: {len(reachable)} capitais")
+                
+        elif option == "6":
+            try:
+                origin_coords = [float(v) for v in input("Origem (lat, lon): ").split(",")]
+                destination_coords = [float(v) for v in input("Destino (lat, lon): ").split(",")]
+            except ValueError:
+                print("Coordenadas inválidas.")
+                continue
+            transport = input("Meio de transporte (air/land): ") or "air"
+            algorithm = input("Algoritmo (bfs, dfs, ucs, greedy, astar): ") or "astar"
+            
+            snapped = path_finder.find_path_from_coordinates(origin_coords, destination_coords, algorithm, transport)
+            
+            if snapped and snapped["result"].path:
+                print("\n--- Rota entre Coordenadas ---")
+                print(f"Capital de origem: {snapped['origin']} ({snapped['origin_snap_km']:.1f} km do ponto)")
+                print(f"Capital de destino: {snapped['destination']} ({snapped['destination_snap_km']:.1f} km do ponto)")
+                print(f"Caminho: {' -> '.join(city.name for city in snapped['result'].path)}")
+                print(f"Distância: {snapped['result'].distance} km")
+            else:
+                print("Não foi possível encontrar um caminho.")
+                
+        elif option == "7":
+            origin = input("Cidade de origem: ")
+            candidates = input("Capitais candidatas (separadas por vírgula): ")
+            transport = input("Meio de transporte (air/land): ") or "air"
+            
+            candidates = [name.strip() for name in candidates.split(",") if name.strip()]
+            result = path_finder.find_nearest_of(origin, candidates, transport)
+            
+            if result and result.path:
+                print("\n--- Capital Mais Próxima ---")
+                print(f"Capital: {result.path[-1].name}")
+                print(f"Distância: {result.distance} km")
+                print(f"Caminho: {' -> '.join(city.name for city in result.path)}")
+                print(f"Nós expandidos: {result.expanded_nodes}")
+            else:
+                print("Não foi possível encontrar um caminho.")
+                
+        elif option == "8":
+            output_file = input("Arquivo de saída (.csv ou .jsonl): ") or "sweep.csv"
+            run_sweep_command(output_file)
+                
         else:
             print("Opção inválida. Tente novamente.")
 
@@ -12,7 +12,7 @@ from search.dfs import DFS
 from search.ucs import UCS
 from search.greedy import Greedy
 from search.astar import AStar
-from utils.data_loader import DataLoader
+from utils.data_loader import DataLoader, DEFAULT_DATA_FILE
 
 class RouteFinderApp(tk.Tk):
     def __init__(self):
@@ -43,10 +43,10 @@ class RouteFinderApp(tk.Tk):
     
     def load_graph(self):
         try:
-            # Tenta carregar dados do JSON
-            json_path = "data/distances.json"
+            # Tenta carregar o arquivo de distâncias (JSON, CSV ou binário)
+            json_path = DEFAULT_DATA_FILE
             if os.path.exists(json_path):
-                return self.data_loader.load_from_json(json_path)
+                return self.data_loader.load(json_path)
             else:
                 messagebox.showwarning("Aviso", f"Arquivo {json_path} não encontrado. Usando dados simulados.")
                 return self.data_loader._create_mock_data()
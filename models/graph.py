@@ -1,42 +1,49 @@
 class Graph:
     def __init__(self):
         self.cities = set()
-        self.air_distances = {}
-        self.land_distances = {}
+        # Adjacência de cada modo: cidade -> {vizinho: distância}
+        self.adjacency = {"air": {}, "land": {}}
+    
+    @property
+    def air_distances(self):
+        """Distâncias aéreas por par (cidade1, cidade2); cópia montada a partir da adjacência"""
+        return self._pairs("air")
+    
+    @property
+    def land_distances(self):
+        """Distâncias terrestres por par (cidade1, cidade2); cópia montada a partir da adjacência"""
+        return self._pairs("land")
+    
+    def _pairs(self, mode):
+        return {(city, neighbor): distance
+                for city, neighbors in self.adjacency[mode].items()
+                for neighbor, distance in neighbors.items()}
     
     def add_city(self, city):
         self.cities.add(city)
     
-    def add_air_distance(self, city1, city2, distance):
+    def _add_distance(self, mode, city1, city2, distance):
         if city1 not in self.cities:
             self.add_city(city1)
         if city2 not in self.cities:
             self.add_city(city2)
         
-        self.air_distances[(city1, city2)] = distance
-        self.air_distances[(city2, city1)] = distance
+        adjacency = self.adjacency[mode]
+        adjacency.setdefault(city1, {})[city2] = distance
+        adjacency.setdefault(city2, {})[city1] = distance
+    
+    def add_air_distance(self, city1, city2, distance):
+        self._add_distance("air", city1, city2, distance)
     
     def add_land_distance(self, city1, city2, distance):
-        if city1 not in self.cities:
-            self.add_city(city1)
-        if city2 not in self.cities:
-            self.add_city(city2)
-        
-        self.land_distances[(city1, city2)] = distance
-        self.land_distances[(city2, city1)] = distance
+        self._add_distance("land", city1, city2, distance)
     
     def get_neighbors(self, city, transport_type="air"):
-        neighbors = []
-        distances = self.air_distances if transport_type == "air" else self.land_distances
-        
-        for key, distance in distances.items():
-            if key[0] == city:
-                neighbors.append((key[1], distance))
-        
-        return neighbors
+        adjacency = self.adjacency["air" if transport_type == "air" else "land"]
+        return list(adjacency.get(city, {}).items())
     
     def get_air_distance(self, city1, city2):
-        return self.air_distances.get((city1, city2), float('inf'))
+        return self.adjacency["air"].get(city1, {}).get(city2, float('inf'))
     
     def get_land_distance(self, city1, city2):
-        return self.land_distances.get((city1, city2), float('inf'))
\ No newline at end of file
+        return self.adjacency["land"].get(city1, {}).get(city2, float('inf'))
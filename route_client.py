@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Cliente leve do route_daemon.py (usa apenas socket e json).
+
+Uso:
+    python route_client.py route "São Paulo" Manaus [--transport land] [--algorithm ucs]
+    python route_client.py via "Porto Alegre" Manaus --via Brasília Palmas
+    python route_client.py compare Curitiba Recife
+    python route_client.py best-transport Curitiba Recife
+    python route_client.py reachable Brasília 1000 [--transport land]
+    python route_client.py nearest Cuiabá --candidates Manaus Belém Palmas
+    python route_client.py snap -- -23.55 -46.63
+    python route_client.py ping | stats | shutdown
+
+Com --json a resposta do daemon é impressa sem formatação.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+DEFAULT_SOCKET = os.environ.get("ROTAS_SOCKET", "/tmp/rotas-capitais.sock")
+
+
+def send_request(request, socket_path=DEFAULT_SOCKET):
+    """Envia uma requisição ao daemon e retorna a resposta decodificada"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("O daemon fechou a conexão sem responder")
+    return json.loads(line)
+
+
+def build_request(args):
+    request = {"command": args.command}
+    for name in ("origin", "destination", "via", "max_km", "candidates", "lat", "lon", "transport", "algorithm"):
+        value = getattr(args, name, None)
+        if value is not None:
+            request[name] = value
+    return request
+
+
+def print_path_result(result):
+    if not result or not result["path"]:
+        print("Nenhum caminho encontrado.")
+        return
+    print(" -> ".join(result["path"]))
+    print(f"Distância: {result['distance']:.1f} km | Nós expandidos: {result['expanded_nodes']}")
+
+
+def print_result(command, result):
+    if command in ("route", "via", "nearest"):
+        print_path_result(result)
+    elif command == "compare":
+        for name, data in result.items():
+            if data["path"] is None:
+                print(f"{name}: nenhum caminho ({data['expanded_nodes']} nós expandidos)")
+            else:
+                print(f"{name}: {data['distance']:.1f} km, {len(data['path']) - 2} paradas, {data['expanded_nodes']} nós expandidos")
+    elif command == "best-transport":
+        if result is None:
+            print("Nenhum caminho encontrado.")
+        else:
+            print(f"Melhor transporte: {result['best_transport']}")
+            print_path_result(result["best_result"])
+    elif command == "reachable":
+        for name, distance in sorted(result.items(), key=lambda item: item[1]):
+            print(f"{name}: {distance:.1f} km")
+    elif command == "snap":
+        print(f"{result['capital']} ({result['distance']:.1f} km)")
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2) if isinstance(result, dict) else result)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Cliente do daemon de rotas")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Caminho do socket Unix")
+    parser.add_argument("--json", action="store_true", help="Imprime a resposta em JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def with_options(sub):
+        sub.add_argument("--transport", choices=("air", "land"))
+        sub.add_argument("--algorithm")
+        return sub
+
+    route = with_options(commands.add_parser("route"))
+    route.add_argument("origin")
+    route.add_argument("destination")
+
+    via = with_options(commands.add_parser("via"))
+    via.add_argument("origin")
+    via.add_argument("destination")
+    via.add_argument("--via", nargs="+", required=True)
+
+    for name in ("compare", "best-transport"):
+        sub = with_options(commands.add_parser(name))
+        sub.add_argument("origin")
+        sub.add_argument("destination")
+
+    reachable = with_options(commands.add_parser("reachable"))
+    reachable.add_argument("origin")
+    reachable.add_argument("max_km", type=float)
+
+    nearest = with_options(commands.add_parser("nearest"))
+    nearest.add_argument("origin")
+    nearest.add_argument("--candidates", nargs="+", required=True)
+
+    snap = commands.add_parser("snap")
+    snap.add_argument("lat", type=float)
+    snap.add_argument("lon", type=float)
+
+    for name in ("ping", "stats", "shutdown"):
+        commands.add_parser(name)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        response = send_request(build_request(args), args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Daemon não encontrado em {args.socket}. Inicie com: python route_daemon.py", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(response, ensure_ascii=False))
+    elif not response["ok"]:
+        print(f"Erro: {response['error']}", file=sys.stderr)
+    else:
+        print_result(args.command, response["result"])
+
+    return 0 if response["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
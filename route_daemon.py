@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Daemon de consultas de rotas com os dados sempre carregados.
+
+O grafo e o índice espacial ficam em memória, e
+as consultas chegam por um socket Unix, uma requisição JSON por linha. Use o
+cliente route_client.py para enviar consultas a partir de scripts.
+
+Uso:
+    python route_daemon.py [--socket /tmp/rotas-capitais.sock]
+"""
+
+import argparse
+import errno
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+
+from main import PathFinder
+from models.city import City
+from utils import json_output
+
+DEFAULT_SOCKET = os.environ.get("ROTAS_SOCKET", "/tmp/rotas-capitais.sock")
+
+
+def _name_list(request, key):
+    """Lista de nomes de cidades em request[key] (ausente = lista vazia)"""
+    names = request.get(key, [])
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise ValueError(f"Parâmetro '{key}' deve ser uma lista de nomes de cidades")
+    return names
+
+
+def _remove_stale_socket(socket_path):
+    """
+    Remove o socket deixado por uma execução anterior. Falha se outro daemon
+    ainda estiver aceitando conexões nele ou se o caminho não for um socket.
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EEXIST, f"{socket_path} existe e não é um socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(socket_path)
+            return
+    raise OSError(errno.EADDRINUSE, f"Outro daemon já está ouvindo em {socket_path}")
+
+
+def _serialize_result(result):
+    return {
+        "path": [city.name for city in result.path],
+        "distance": result.distance,
+        "expanded_nodes": result.expanded_nodes
+    }
+
+
+class RouteDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor em socket Unix que mantém o PathFinder e os índices residentes"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        started = time.perf_counter()
+        # Antes de carregar os dados: não adianta carregar se o socket está ocupado
+        _remove_stale_socket(socket_path)
+
+        self.path_finder = PathFinder()
+        # Constrói os índices agora, e não na primeira consulta
+        self.path_finder.spatial_index
+        self.started_at = time.time()
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        super().__init__(socket_path, RequestHandler)
+
+        print(f"Dados carregados em {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def count_request(self):
+        with self._requests_lock:
+            self.requests += 1
+
+    def handle_command(self, request):
+        """
+        Executa um comando e retorna o resultado serializável em JSON.
+
+        Raises:
+            ValueError: Comando ou parâmetros inválidos
+        """
+        command = request.get("command")
+        pf = self.path_finder
+        transport = request.get("transport", "air")
+        algorithm = request.get("algorithm", "astar")
+
+        if command == "ping":
+            return "pong"
+
+        if command == "stats":
+            return {
+                "uptime": time.time() - self.started_at,
+                "requests": self.requests,
+                "cities": len(pf.graph.cities),
+                "cached_legs": len(pf.leg_cache),
+                "single_flight": pf.flight.stats()
+            }
+
+        # Valida antes de buscar, para que o erro chegue ao cliente
+        if transport not in ("air", "land"):
+            raise ValueError("Parâmetro 'transport' deve ser 'air' ou 'land'")
+        if not isinstance(algorithm, str) or algorithm.lower() not in pf.algorithms:
+            raise ValueError(f"Algoritmo '{algorithm}' não encontrado")
+        endpoints = [request.get("origin"), request.get("destination")]
+        if not all(name is None or isinstance(name, str) for name in endpoints):
+            raise ValueError("Parâmetros 'origin' e 'destination' devem ser nomes de cidades")
+        names = endpoints + _name_list(request, "via") + _name_list(request, "candidates")
+        unknown = [name for name in names if name is not None and City(name) not in pf.graph.cities]
+        if unknown:
+            raise ValueError(f"Cidade(s) não encontrada(s): {', '.join(unknown)}")
+
+        if command == "route":
+            result = pf.find_path(request["origin"], request["destination"], algorithm, transport)
+            return _serialize_result(result) if result else None
+
+        if command == "via":
+            result = pf.find_route_via(request["origin"], request.get("via", []), request["destination"], transport, algorithm)
+            return _serialize_result(result) if result else None
+
+        if command == "compare":
+            return pf.compare_algorithms(request["origin"], request["destination"], transport)
+
+        if command == "best-transport":
+            best = pf.find_best_transport(request["origin"], request["destination"], algorithm)
+            return dict(best, best_result=_serialize_result(best["best_result"])) if best else None
+
+        if command == "reachable":
+            return pf.reachable_within(request["origin"], float(request["max_km"]), transport)
+
+        if command == "nearest":
+            result = pf.find_nearest_of(request["origin"], request["candidates"], transport)
+            return _serialize_result(result) if result else None
+
+        if command == "snap":
+            name, distance = pf.snap_to_capital(float(request["lat"]), float(request["lon"]))
+            return {"capital": name, "distance": distance}
+
+        raise ValueError(f"Comando desconhecido: {command}")
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Atende uma conexão; cada linha é uma requisição JSON independente"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("A requisição deve ser um objeto JSON")
+                if request.get("command") == "shutdown":
+                    response = {"ok": True, "result": "bye"}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    response = {"ok": True, "result": self.server.handle_command(request)}
+            except (ValueError, KeyError, TypeError) as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            except Exception as e:
+                # Uma falha inesperada responde com erro sem derrubar a conexão
+                response = {"ok": False, "error": f"Erro interno: {type(e).__name__}: {e}"}
+
+            self.server.count_request()
+            # compare pode ter distâncias infinitas (algoritmo sem caminho)
+            self.wfile.write(json_output.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daemon de consultas de rotas via socket Unix")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Caminho do socket Unix")
+    args = parser.parse_args(argv)
+
+    try:
+        daemon = RouteDaemon(args.socket)
+    except OSError as e:
+        sys.exit(f"Não foi possível iniciar o daemon: {e}")
+
+    # SIGTERM encerra o laço de atendimento (shutdown precisa de outra thread)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=daemon.shutdown, daemon=True).start())
+
+    print(f"Daemon ouvindo em {args.socket}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        print("Daemon encerrado.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
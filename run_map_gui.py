@@ -6,36 +6,22 @@ Este script verifica as dependências e inicia a aplicação.
 
 import sys
 import os
+import importlib.util
 
 def check_dependencies():
     """Verifica se todas as dependências estão instaladas"""
-    required_modules = [
-        'tkinter',
-        'matplotlib',
-        'networkx', 
-        'numpy',
-        'geopandas',
-        'shapely'
-    ]
-    
-    missing_modules = []
+    # Nome exibido -> módulo procurado. Só localiza os módulos (sem
+    # importá-los); a aplicação os carrega quando precisar.
+    required_modules = {
+        'tkinter': '_tkinter',
+        'matplotlib': 'matplotlib',
+        'numpy': 'numpy'
+    }
     
-    for module in required_modules:
-        try:
-            if module == 'tkinter':
-                import tkinter
-            elif module == 'matplotlib':
-                import matplotlib.pyplot
-            elif module == 'networkx':
-                import networkx
-            elif module == 'numpy':
-                import numpy
-            elif module == 'geopandas':
-                import geopandas
-            elif module == 'shapely':
-                import shapely.geometry
-        except ImportError:
-            missing_modules.append(module)
+    missing_modules = [
+        module for module, spec_name in required_modules.items()
+        if importlib.util.find_spec(spec_name) is None
+    ]
     
     if missing_modules:
         print("❌ Dependências faltando:")
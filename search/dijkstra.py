@@ -0,0 +1,107 @@
+import heapq
+from search.interface import SearchResult
+
+def bounded_dijkstra(graph, start, transport_type="air", max_distance=float('inf')):
+    """
+    Executa Dijkstra a partir de `start`, parando ao ultrapassar max_distance.
+
+    Diferente de rodar uma busca por destino, uma única execução fornece a
+    distância mínima para todas as cidades dentro do raio.
+
+    Args:
+        graph: O grafo que representa as cidades e conexões
+        start: A cidade de origem
+        transport_type: Tipo de transporte ("air" ou "land")
+        max_distance: Distância máxima (km) a partir da origem
+
+    Returns:
+        tuple: (distâncias, predecessores), dicionários indexados por City.
+        As distâncias seguem a ordem em que as cidades foram fixadas.
+    """
+    priority_queue = [(0, start)]
+    distances = {}
+    parents = {start: None}
+    best = {start: 0}
+
+    while priority_queue:
+        cost, current = heapq.heappop(priority_queue)
+
+        # Entrada obsoleta na fila
+        if current in distances:
+            continue
+
+        # Todas as cidades restantes estão fora do raio
+        if cost > max_distance:
+            break
+
+        distances[current] = cost
+
+        for neighbor, step_cost in graph.get_neighbors(current, transport_type):
+            new_cost = cost + step_cost
+            if neighbor not in distances and new_cost <= max_distance and new_cost < best.get(neighbor, float('inf')):
+                best[neighbor] = new_cost
+                parents[neighbor] = current
+                heapq.heappush(priority_queue, (new_cost, neighbor))
+
+    return distances, {city: parents[city] for city in distances}
+
+
+def nearest_target(graph, start, targets, transport_type="air"):
+    """
+    Encontra, com um único Dijkstra, o alvo mais próximo de `start`.
+
+    A busca para assim que o primeiro alvo é fixado: como as cidades são
+    fixadas em ordem crescente de distância, ele é o mais próximo. A própria
+    origem não conta como alvo.
+
+    Args:
+        graph: O grafo que representa as cidades e conexões
+        start: A cidade de origem
+        targets: Conjunto de cidades candidatas
+        transport_type: Tipo de transporte ("air" ou "land")
+
+    Returns:
+        SearchResult: Caminho até o alvo mais próximo (o último elemento)
+    """
+    targets = set(targets)
+    targets.discard(start)
+    if not targets:
+        return SearchResult()
+
+    priority_queue = [(0, start)]
+    settled = set()
+    parents = {start: None}
+    best = {start: 0}
+    expanded_nodes = 0
+
+    while priority_queue:
+        cost, current = heapq.heappop(priority_queue)
+
+        if current in settled:
+            continue
+
+        settled.add(current)
+        expanded_nodes += 1
+
+        if current in targets:
+            return SearchResult(rebuild_path(parents, current), cost, expanded_nodes)
+
+        for neighbor, step_cost in graph.get_neighbors(current, transport_type):
+            new_cost = cost + step_cost
+            if neighbor not in settled and new_cost < best.get(neighbor, float('inf')):
+                best[neighbor] = new_cost
+                parents[neighbor] = current
+                heapq.heappush(priority_queue, (new_cost, neighbor))
+
+    # Nenhum alvo alcançável
+    return SearchResult(expanded_nodes=expanded_nodes)
+
+
+def rebuild_path(parents, goal):
+    """Reconstrói o caminho até `goal` a partir do dicionário de predecessores"""
+    path = []
+    current = goal
+    while current is not None:
+        path.append(current)
+        current = parents[current]
+    return list(reversed(path))
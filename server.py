@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP/JSON local para consultas de rotas (apenas biblioteca padrão).
+
+Uso:
+    python server.py --port 8080 --workers 4
+
+Endpoints (GET com parâmetros na URL ou POST com corpo JSON):
+    /route?origin=...&destination=...&algorithm=astar&transport=air
+    /compare?origin=...&destination=...&transport=air
+    /best-transport?origin=...&destination=...&algorithm=astar
+    /map?origin=...&destination=...&transport=air&width=1000&height=800&dpi=100&format=png  (png, svg ou geojson)
+    /cache-stats
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl
+
+from main import PathFinder
+from models.city import City
+from utils.single_flight import AsyncSingleFlight
+from utils import json_output
+from utils.image_cache import ImageCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, base_fingerprint, route_key
+
+# PathFinder usado pelas tarefas (no processo principal ou em cada trabalhador)
+_path_finder = None
+
+# Renderizadores de mapas por (formato, largura, altura, dpi), criados sob demanda
+_renderers = {}
+_renderers_lock = threading.Lock()
+_map_base = None
+MAX_RENDERERS = 4
+
+# Limites dos parâmetros de /map
+MAP_SIZE_RANGE = (200, 3000)
+MAP_DPI_RANGE = (50, 300)
+
+# Parâmetros usados por cada endpoint e seus valores padrão
+ENDPOINT_PARAMS = {
+    "/route": ("origin", "destination", "algorithm", "transport"),
+    "/compare": ("origin", "destination", "transport"),
+    "/best-transport": ("origin", "destination", "algorithm"),
+    "/map": ("origin", "destination", "algorithm", "transport", "width", "height", "dpi", "format"),
+}
+PARAM_DEFAULTS = {"algorithm": "astar", "transport": "air", "width": "1000", "height": "800", "dpi": "100", "format": "png"}
+
+
+def _init_worker():
+    global _path_finder
+    _path_finder = PathFinder()
+
+
+def _serialize_result(result):
+    return {
+        "path": [city.name for city in result.path],
+        "distance": result.distance,
+        "expanded_nodes": result.expanded_nodes
+    }
+
+
+def normalize_params(endpoint, params):
+    """
+    Parâmetros que `endpoint` usa, com os valores padrão preenchidos, o
+    algoritmo em minúsculas e números sem zeros à esquerda: consultas
+    equivalentes ficam iguais e são coalescidas pelo single-flight.
+    """
+    normalized = {}
+    for name in ENDPOINT_PARAMS.get(endpoint, ()):
+        value = params.get(name, PARAM_DEFAULTS.get(name))
+        if value is None:
+            continue
+        if name == "algorithm":
+            value = value.lower()
+        elif name in ("width", "height", "dpi"):
+            try:
+                value = str(int(value))
+            except ValueError:
+                pass  # recusado depois por _map_params
+        normalized[name] = value
+    return normalized
+
+
+def _map_base_id():
+    """Identificação do mapa base (contorno + capitais) usada nas chaves do cache"""
+    global _map_base
+    if _map_base is None:
+        from utils.map_renderer import load_map_basemap
+
+        basemap = load_map_basemap(verbose=False)
+        _map_base = (basemap, base_fingerprint(basemap.source_hash, [city.name for city in _path_finder.graph.cities]))
+    return _map_base
+
+
+def _map_params(params):
+    """Valida largura, altura e dpi de /map"""
+    try:
+        width = int(params.get("width", 1000))
+        height = int(params.get("height", 800))
+        dpi = int(params.get("dpi", 100))
+    except ValueError:
+        raise ValueError("Parâmetros 'width', 'height' e 'dpi' devem ser inteiros")
+    if not all(MAP_SIZE_RANGE[0] <= value <= MAP_SIZE_RANGE[1] for value in (width, height)):
+        raise ValueError(f"Largura e altura devem estar entre {MAP_SIZE_RANGE[0]} e {MAP_SIZE_RANGE[1]} pixels")
+    if not MAP_DPI_RANGE[0] <= dpi <= MAP_DPI_RANGE[1]:
+        raise ValueError(f"'dpi' deve estar entre {MAP_DPI_RANGE[0]} e {MAP_DPI_RANGE[1]}")
+    if params.get("format", "png") not in ("png", "svg", "geojson"):
+        raise ValueError("Parâmetro 'format' deve ser 'png', 'svg' ou 'geojson'")
+    return width, height, dpi
+
+
+def _renderer_for(key, create):
+    """Renderizador em cache para `key` (chamar com _renderers_lock)"""
+    renderer = _renderers.get(key)
+    if renderer is None:
+        if len(_renderers) >= MAX_RENDERERS:
+            _renderers.pop(next(iter(_renderers)))
+        renderer = _renderers[key] = create()
+    return renderer
+
+
+def render_vector(path_names, transport_type, width, height, dpi, output_format):
+    """SVG/GeoJSON da rota, gerado como texto (rápido o bastante para dispensar o cache)"""
+    from utils.vector_writer import VectorRouteWriter
+
+    basemap, _ = _map_base_id()
+    with _renderers_lock:
+        writer = _renderer_for((output_format, width, height, dpi), lambda: VectorRouteWriter(
+            basemap, [city.name for city in _path_finder.graph.cities], width, height, dpi, output_format
+        ))
+    return writer.content_type, writer.route_bytes(path_names, transport_type)
+
+
+def render_map(path_names, transport_type, width, height, dpi):
+    """Renderiza o PNG de uma rota (roda no executor)"""
+    from utils.map_renderer import MapRenderer, encode_png
+
+    basemap, _ = _map_base_id()
+    # O matplotlib não é seguro entre threads: um desenho por vez em cada processo
+    with _renderers_lock:
+        renderer = _renderer_for(("png", width, height, dpi), lambda: MapRenderer(
+            basemap, [city.name for city in _path_finder.graph.cities],
+            figsize=(width / dpi, height / dpi), dpi=dpi
+        ))
+        return encode_png(renderer.render(path_names, transport_type), dpi)
+
+
+def execute_query(endpoint, params):
+    """
+    Executa uma consulta no PathFinder. Roda dentro do executor, e o
+    resultado já sai serializável em JSON.
+
+    Returns:
+        tuple: (status HTTP, corpo da resposta)
+    """
+    origin = params.get("origin")
+    destination = params.get("destination")
+    algorithm = params.get("algorithm", "astar")
+    transport = params.get("transport", "air")
+
+    if not origin or not destination:
+        return HTTPStatus.BAD_REQUEST, {"error": "Parâmetros 'origin' e 'destination' são obrigatórios"}
+    if transport not in ("air", "land"):
+        return HTTPStatus.BAD_REQUEST, {"error": "Parâmetro 'transport' deve ser 'air' ou 'land'"}
+    if algorithm.lower() not in _path_finder.algorithms:
+        return HTTPStatus.BAD_REQUEST, {"error": f"Algoritmo '{algorithm}' não encontrado"}
+
+    known = _path_finder.graph.cities
+    if City(origin) not in known or City(destination) not in known:
+        return HTTPStatus.NOT_FOUND, {"error": "Uma ou ambas as cidades não foram encontradas"}
+
+    if endpoint == "/route":
+        result = _path_finder.find_path(origin, destination, algorithm, transport)
+        if not result.path:
+            return HTTPStatus.NOT_FOUND, {"error": "Não foi possível encontrar um caminho"}
+        return HTTPStatus.OK, _serialize_result(result)
+
+    if endpoint == "/map":
+        # Só a busca e a chave; a imagem vem do cache ou de render_map
+        try:
+            width, height, dpi = _map_params(params)
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        result = _path_finder.find_path(origin, destination, algorithm, transport)
+        if not result.path:
+            return HTTPStatus.NOT_FOUND, {"error": "Não foi possível encontrar um caminho"}
+        path_names = [city.name for city in result.path]
+        output_format = params.get("format", "png")
+        if output_format != "png":
+            return HTTPStatus.OK, render_vector(path_names, transport, width, height, dpi, output_format)
+        _, base = _map_base_id()
+        return HTTPStatus.OK, {
+            "path": path_names, "transport": transport, "width": width, "height": height, "dpi": dpi,
+            "key": route_key(path_names, transport, (width, height), dpi, base)
+        }
+
+    if endpoint == "/compare":
+        return HTTPStatus.OK, _path_finder.compare_algorithms(origin, destination, transport)
+
+    if endpoint == "/best-transport":
+        best = _path_finder.find_best_transport(origin, destination, algorithm)
+        if best is None:
+            return HTTPStatus.NOT_FOUND, {"error": "Não foi possível encontrar um caminho"}
+        return HTTPStatus.OK, dict(best, best_result=_serialize_result(best["best_result"]))
+
+    return HTTPStatus.NOT_FOUND, {"error": f"Endpoint '{endpoint}' não existe"}
+
+
+class RouteServer:
+    """Servidor asyncio com conexões persistentes (keep-alive) e encerramento gracioso"""
+
+    ENDPOINTS = ("/route", "/compare", "/best-transport", "/map", "/cache-stats")
+    # Tempo máximo (s) de espera por uma nova requisição em conexão ociosa
+    KEEP_ALIVE_TIMEOUT = 15
+    # Tamanho máximo do corpo de uma requisição
+    MAX_BODY = 64 * 1024
+
+    def __init__(self, host="127.0.0.1", port=8080, workers=4, executor="thread", max_pending=256,
+                 cache_dir=DEFAULT_CACHE_DIR, cache_bytes=DEFAULT_MAX_BYTES):
+        global _path_finder
+
+        self.host = host
+        self.port = port
+
+        # Buscas são CPU-bound: saem do loop de eventos para um executor limitado
+        if executor == "process":
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        else:
+            _path_finder = PathFinder()
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+
+        # Limita as consultas em andamento (as demais aguardam a vez)
+        self.slots = asyncio.Semaphore(max_pending)
+
+        # Consultas idênticas simultâneas executam uma única busca
+        self.flight = AsyncSingleFlight()
+        
+        # Imagens de rotas já renderizadas (consultado no processo principal)
+        self.image_cache = ImageCache(cache_dir, cache_bytes)
+        self.connections = {}  # writer -> True se estiver processando uma requisição
+        self.closing = False
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_until_stopped(self):
+        """Atende até receber SIGINT/SIGTERM e então encerra de forma graciosa"""
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        print(f"Servidor ouvindo em http://{self.host}:{self.port}")
+        await stop.wait()
+        await self.shutdown()
+
+    async def shutdown(self, grace=10):
+        """Para de aceitar conexões, conclui as requisições em andamento e libera o executor"""
+        print("Encerrando servidor...")
+        self.closing = True
+        self.server.close()
+
+        # Conexões ociosas são fechadas; as ocupadas fecham após responder
+        for writer, busy in list(self.connections.items()):
+            if not busy:
+                writer.close()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + grace
+        while self.connections and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+
+        await self.server.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    async def handle_connection(self, reader, writer):
+        self.connections[writer] = False
+        try:
+            while not self.closing:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.KEEP_ALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                self.connections[writer] = True
+                keep_alive = await self.handle_request(head, reader, writer)
+                self.connections[writer] = False
+
+                if not keep_alive:
+                    break
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+    async def handle_request(self, head, reader, writer):
+        """Lê uma requisição, responde e indica se a conexão continua aberta"""
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            await self.respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Requisição inválida"}, False)
+            return False
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        keep_alive = keep_alive and not self.closing
+
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Sem um tamanho válido não há como saber onde o corpo termina
+            await self.respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Content-Length inválido"}, False)
+            return False
+        if length > self.MAX_BODY:
+            await self.respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Corpo muito grande"}, False)
+            return False
+        if length:
+            try:
+                body = json.loads(await reader.readexactly(length))
+                params.update({key: str(value) for key, value in body.items()})
+            except (ValueError, AttributeError, asyncio.IncompleteReadError):
+                await self.respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Corpo JSON inválido"}, keep_alive)
+                return keep_alive
+
+        if method not in ("GET", "POST"):
+            status, payload = HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"Método {method} não suportado"}
+        elif url.path not in self.ENDPOINTS:
+            status, payload = HTTPStatus.NOT_FOUND, {"error": f"Endpoint '{url.path}' não existe"}
+        else:
+            status, payload = await self.run_query(url.path, params)
+
+        await self.respond(writer, status, payload, keep_alive and not self.closing)
+        return keep_alive and not self.closing
+
+    async def run_query(self, endpoint, params):
+        if endpoint == "/cache-stats":
+            return HTTPStatus.OK, self.image_cache.stats()
+        
+        params = normalize_params(endpoint, params)
+        key = (endpoint, tuple(sorted(params.items())))
+        try:
+            return await self.flight.do(key, self._execute, endpoint, params)
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+    async def _execute(self, endpoint, params):
+        async with self.slots:
+            loop = asyncio.get_running_loop()
+            status, payload = await loop.run_in_executor(self.executor, execute_query, endpoint, params)
+            if endpoint != "/map" or status != HTTPStatus.OK or isinstance(payload, tuple):
+                return status, payload
+            
+            # Rotas repetidas saem do cache sem passar pelo matplotlib. O cache
+            # lê e grava arquivos (e a gravação pode varrer o diretório para
+            # remover entradas antigas): roda no executor padrão de threads,
+            # fora do loop de eventos
+            image = await loop.run_in_executor(None, self.image_cache.get, payload["key"])
+            if image is None:
+                image = await loop.run_in_executor(
+                    self.executor, render_map, payload["path"], payload["transport"],
+                    payload["width"], payload["height"], payload["dpi"]
+                )
+                await loop.run_in_executor(None, self.image_cache.put, payload["key"], image)
+            return status, ("image/png", image)
+
+    async def respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, tuple):
+            content_type, body = payload
+        else:
+            body = json_output.dumps(payload).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON de consultas de rotas")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço (padrão: apenas localhost)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=4, help="Tamanho do executor das buscas")
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    parser.add_argument("--max-pending", type=int, default=256, help="Consultas simultâneas em andamento")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Cache das imagens de /map")
+    parser.add_argument("--cache-size", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024), help="Tamanho máximo do cache em MB")
+    args = parser.parse_args(argv)
+
+    async def run():
+        server = RouteServer(args.host, args.port, args.workers, args.executor, args.max_pending,
+                             args.cache_dir, int(args.cache_size * 1024 * 1024))
+        await server.start()
+        await server.serve_until_stopped()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
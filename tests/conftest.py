@@ -0,0 +1,78 @@
+"""
+Configuração comum dos testes (python -m pytest, a partir da raiz do projeto).
+
+Os caminhos padrão do projeto (data/...) são relativos à raiz, então os
+testes rodam com ela como diretório atual.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_FILE = os.path.join(ROOT, "data", "distances.json")
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from models.city import City  # noqa: E402
+from search.bfs import BFS  # noqa: E402
+from search.dfs import DFS  # noqa: E402
+from search.ucs import UCS  # noqa: E402
+from search.greedy import Greedy  # noqa: E402
+from search.astar import AStar  # noqa: E402
+from utils.data_loader import DataLoader  # noqa: E402
+
+ALGORITHMS = {"bfs": BFS, "dfs": DFS, "ucs": UCS, "greedy": Greedy, "astar": AStar}
+TRANSPORT_TYPES = ("air", "land")
+
+
+def search_all(graph, algorithms=None, modes=TRANSPORT_TYPES):
+    """
+    Resultado de todos os algoritmos para todos os pares e modos:
+    {(algoritmo, modo, origem, destino): (caminho, distância, nós expandidos)}
+    """
+    names = sorted(city.name for city in graph.cities)
+    results = {}
+    for name in algorithms or ALGORITHMS:
+        algorithm = ALGORITHMS[name]()
+        for mode in modes:
+            for origin in names:
+                for destination in names:
+                    if origin == destination:
+                        continue
+                    result = algorithm.search(graph, City(origin), City(destination), mode)
+                    path = [city.name for city in result.path] if result.path else None
+                    results[(name, mode, origin, destination)] = (path, result.distance, result.expanded_nodes)
+    return results
+
+
+def neighbor_lists(graph):
+    """{(modo, cidade): [(vizinho, distância), ...]} na ordem de get_neighbors"""
+    return {
+        (mode, city.name): [(neighbor.name, distance) for neighbor, distance in graph.get_neighbors(city, mode)]
+        for mode in TRANSPORT_TYPES
+        for city in sorted(graph.cities, key=lambda city: city.name)
+    }
+
+
+@pytest.fixture(scope="session")
+def graph():
+    """Grafo dos dados reais, lido sem snapshot"""
+    return DataLoader().load(DATA_FILE, snapshot_dir=None)
+
+
+@pytest.fixture(scope="session")
+def reference_results(graph):
+    return search_all(graph)
+
+
+@pytest.fixture
+def path_finder():
+    from main import PathFinder
+
+    finder = PathFinder()
+    yield finder
+    finder.close()
@@ -0,0 +1,93 @@
+import gc
+import threading
+import time
+
+import pytest
+
+from models.city import City
+from search.ucs import UCS
+from utils.background_worker import BackgroundWorker, CancellableGraph, CancelToken, SearchCancelled
+
+
+@pytest.fixture
+def worker():
+    worker = BackgroundWorker()
+    yield worker
+    worker.shutdown()
+
+
+def poll_until_idle(worker, timeout=5):
+    deadline = time.monotonic() + timeout
+    while worker.busy and time.monotonic() < deadline:
+        worker.poll()
+        time.sleep(0.005)
+    worker.poll()
+
+
+def test_result_is_delivered_by_poll(worker, graph):
+    done = []
+
+    def search(job, origin, destination):
+        return UCS().search(CancellableGraph(graph, job), City(origin), City(destination), "land")
+
+    worker.submit(search, "Natal", "Manaus", on_done=done.append)
+    # Nada é entregue sem poll()
+    time.sleep(0.05)
+    assert done == []
+    poll_until_idle(worker)
+
+    assert done[0].path == UCS().search(graph, City("Natal"), City("Manaus"), "land").path
+
+
+def test_new_submit_supersedes_the_previous_job(worker):
+    started = threading.Event()
+    done = []
+
+    def slow(job):
+        started.set()
+        while True:
+            job.progress({"tick": 1})
+            time.sleep(0.001)
+
+    worker.submit(slow, on_done=done.append)
+    assert started.wait(5)
+    worker.submit(lambda job: "novo", on_done=done.append)
+    poll_until_idle(worker)
+
+    assert done == ["novo"]
+
+
+def test_errors_and_progress_reach_the_callbacks(worker):
+    progress, errors = [], []
+
+    def failing(job):
+        job.progress("meio")
+        raise RuntimeError("falhou")
+
+    worker.submit(failing, on_progress=progress.append, on_error=errors.append)
+    poll_until_idle(worker)
+
+    assert progress == ["meio"]
+    assert isinstance(errors[0], RuntimeError)
+
+
+def test_job_does_not_disable_the_garbage_collector(worker):
+    assert gc.isenabled()
+    seen = []
+
+    worker.submit(lambda job: gc.isenabled(), on_done=seen.append)
+    poll_until_idle(worker)
+
+    assert seen == [True]
+    assert gc.isenabled()
+
+
+def test_cancellable_graph_stops_at_the_next_expansion(graph):
+    token = CancelToken()
+    wrapped = CancellableGraph(graph, token)
+
+    assert wrapped.get_neighbors(City("Natal"), "land") == graph.get_neighbors(City("Natal"), "land")
+    assert wrapped.cities is graph.cities
+    token.cancel()
+    with pytest.raises(SearchCancelled):
+        wrapped.get_neighbors(City("Natal"), "land")
@@ -0,0 +1,147 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from utils.basemap import Basemap, build_cache, douglas_peucker, load_basemap, simplify_ring
+
+SQUARE = [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]]
+HOLE = [[1, 1], [2, 1], [2, 2], [1, 2], [1, 1]]
+
+
+def write_geojson(path, geometries):
+    features = [{"type": "Feature", "properties": {}, "geometry": geometry} for geometry in geometries]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+    return str(path)
+
+
+def distance_to_polyline(points, line, block=256):
+    """Menor distância de cada ponto a algum segmento da polilinha"""
+    a, b = line[:-1][None], line[1:][None]
+    ab = b - a
+    length2 = np.maximum((ab * ab).sum(-1), 1e-300)
+    result = []
+    for start in range(0, len(points), block):
+        p = points[start:start + block, None]
+        t = np.clip(((p - a) * ab).sum(-1) / length2, 0, 1)
+        closest = a + t[..., None] * ab
+        result.append(np.hypot(*(p - closest).transpose(2, 0, 1)).min(axis=1))
+    return np.concatenate(result)
+
+
+def test_from_geojson(tmp_path):
+    path = write_geojson(tmp_path / "mapa.geojson", [
+        {"type": "Polygon", "coordinates": [SQUARE, HOLE]},
+        {"type": "MultiPolygon", "coordinates": [[[[10, 0, 5], [11, 0, 5], [11, 1, 5], [10, 0, 5]]]]},
+        None,
+    ])
+
+    basemap = Basemap.from_geojson(path)
+
+    assert basemap.ring_offsets.tolist() == [0, 5, 10, 14]
+    assert basemap.polygon_offsets.tolist() == [0, 2, 3]
+    assert basemap.coordinates.shape == (14, 2)
+    assert basemap.bounds == (0, 0, 11, 4)
+    assert [ring.tolist() for ring in basemap.rings()][1] == HOLE
+    assert len(basemap.source_hash) == 64
+
+
+def test_douglas_peucker_keeps_points_within_tolerance():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 400)
+    points = np.stack([x, np.sin(x) + rng.normal(0, 0.02, len(x))], axis=1)
+
+    for tolerance in (0.01, 0.05, 0.2, 1.0):
+        keep = douglas_peucker(points, tolerance)
+        assert keep[0] and keep[-1]
+        assert distance_to_polyline(points, points[keep]).max() <= tolerance + 1e-12
+
+    straight = np.stack([np.arange(10.0), np.zeros(10)], axis=1)
+    assert douglas_peucker(straight, 0.1).tolist() == [True] + [False] * 8 + [True]
+
+
+def test_simplify_ring():
+    circle = np.stack([np.cos(np.linspace(0, 2 * np.pi, 200)), np.sin(np.linspace(0, 2 * np.pi, 200))], axis=1)
+    circle[-1] = circle[0]
+
+    simplified = simplify_ring(circle, 0.05)
+
+    assert 4 <= len(simplified) < len(circle)
+    assert np.array_equal(simplified[0], simplified[-1])
+    assert distance_to_polyline(circle, simplified).max() <= 0.05 + 1e-12
+    assert simplify_ring(circle, 0) is circle
+    assert simplify_ring(circle * 0.01, 0.05) is None
+
+
+@pytest.fixture(scope="module")
+def brazil():
+    return load_basemap()
+
+
+def test_levels_of_detail(brazil):
+    levels = brazil.levels
+
+    assert [level.tolerance for level in levels] == sorted(level.tolerance for level in levels)
+    counts = [level.vertex_count for level in levels]
+    assert counts == sorted(counts, reverse=True)
+    # O contorno principal (maior anel) continua a menos de `tolerância` do
+    # original (nos níveis mais grossos, para o teste ser rápido)
+    exterior = max(brazil.rings(), key=len)
+    for level in (level for level in levels if level.tolerance >= 0.05):
+        simplified = max(level.rings(), key=len)
+        assert distance_to_polyline(exterior, simplified).max() <= level.tolerance + 1e-9
+
+
+def test_level_for_picks_coarsest_invisible_level(brazil):
+    assert brazil.level_for(0.0) is brazil
+    assert brazil.level_for(0.02, max_error_pixels=0.5).tolerance == 0.01
+    assert brazil.level_for(1.0).tolerance == max(level.tolerance for level in brazil.levels)
+
+
+def test_load_basemap_cache(tmp_path, capsys):
+    source = write_geojson(tmp_path / "mapa.geojson", [{"type": "Polygon", "coordinates": [SQUARE, HOLE]}])
+    cache_dir = str(tmp_path / "cache")
+
+    built = load_basemap(source, cache_dir)
+    (name,) = os.listdir(cache_dir)
+    cached = load_basemap(source, cache_dir)
+
+    assert "Cache do mapa criado" in capsys.readouterr().out
+    assert np.array_equal(cached.coordinates, built.coordinates)
+    assert [level.tolerance for level in cached.levels] == [level.tolerance for level in built.levels]
+    assert cached.source_hash == built.source_hash
+
+    # Arquivo corrompido: recriado
+    with open(os.path.join(cache_dir, name), "wb") as f:
+        f.write(b"lixo")
+    assert np.array_equal(load_basemap(source, cache_dir).coordinates, built.coordinates)
+    assert "recriando" in capsys.readouterr().out
+
+    # Outro conteúdo: outro cache, e o anterior é removido
+    write_geojson(tmp_path / "mapa.geojson", [{"type": "Polygon", "coordinates": [SQUARE]}])
+    assert load_basemap(source, cache_dir).vertex_count == 5
+    assert os.listdir(cache_dir) != [name] and len(os.listdir(cache_dir)) == 1
+    assert load_basemap(str(tmp_path / "nada.geojson"), cache_dir) is None
+
+
+def test_build_cache_alongside_another_writer(tmp_path, monkeypatch):
+    source = write_geojson(tmp_path / "mapa.geojson", [{"type": "Polygon", "coordinates": [SQUARE]}])
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    # Gravação em andamento de outro processo e um cache antigo que ele remove antes de nós
+    other = cache_dir / "mapa.0123456789abcdef.v1.99999.partial.npz"
+    other.write_bytes(b"gravando")
+    (cache_dir / "mapa.fedcba9876543210.v1.npz").write_bytes(b"antigo")
+    real_remove = os.remove
+
+    def remove(path):
+        real_remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "remove", remove)
+    basemap, cache_file = build_cache(source, str(cache_dir))
+    monkeypatch.undo()
+
+    assert sorted(os.listdir(cache_dir)) == sorted([other.name, os.path.basename(cache_file)])
+    assert np.array_equal(load_basemap(source, str(cache_dir)).coordinates, basemap.coordinates)
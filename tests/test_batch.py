@@ -0,0 +1,130 @@
+import io
+import json
+
+import pytest
+
+from main import PathFinder, run_batch_command
+from utils.batch import answer_query, input_format_for, read_queries, run_batch
+
+CITIES = ["São Paulo", "Manaus", "Recife", "Porto Alegre", "Brasília", "Belém"]
+
+
+def make_path_finder():
+    return PathFinder()
+
+
+def valid_queries():
+    return [
+        {"id": i, "origin": origin, "destination": destination,
+         "algorithm": ("bfs", "ucs", "astar")[i % 3], "transport": ("air", "land")[i % 2]}
+        for i, (origin, destination) in enumerate(
+            (origin, destination) for origin in CITIES for destination in CITIES if origin != destination
+        )
+    ]
+
+
+INVALID_QUERIES = [
+    ({"id": "a", "origin": "São Paulo"}, "obrigatórios"),
+    ({"id": "b", "origin": "São Paulo", "destination": "Atlântida"}, "Atlântida"),
+    ({"id": "c", "origin": "São Paulo", "destination": "Manaus", "algorithm": "sorte"}, "sorte"),
+    ({"id": "d", "origin": "São Paulo", "destination": "Manaus", "transport": "trem"}, "trem"),
+    ({"id": "e", "error": "Linha 3 inválida"}, "Linha 3"),
+    # Campos que não são texto (JSONL aceita qualquer valor)
+    ({"id": "f", "origin": ["São Paulo"], "destination": "Manaus"}, "'origin'"),
+    ({"id": "g", "origin": "São Paulo", "destination": 5}, "'destination'"),
+    ({"id": "h", "origin": "São Paulo", "destination": "Manaus", "transport": ["air"]}, "'transport'"),
+]
+
+
+def test_read_csv_queries():
+    stream = io.StringIO("\n origin, destination ,algorithm,id\n"
+                         "São Paulo, Manaus ,BFS,1\n"
+                         "Recife,Belém,,\n")
+
+    queries = list(read_queries(stream))
+
+    assert queries == [
+        {"origin": "São Paulo", "destination": "Manaus", "algorithm": "BFS", "id": "1"},
+        {"origin": "Recife", "destination": "Belém"},
+    ]
+
+
+def test_read_jsonl_queries_keeps_bad_lines_as_errors():
+    stream = io.StringIO('{"origin": "Recife", "destination": "Belém"}\n'
+                         '\n'
+                         '{"origin": \n'
+                         '[1, 2]\n'
+                         '{"id": 3, "origin": "Manaus", "destination": "Natal"}\n')
+
+    queries = list(read_queries(stream))
+
+    assert queries[0] == {"origin": "Recife", "destination": "Belém"}
+    assert queries[1]["error"].startswith("Linha 3 inválida")
+    assert queries[2]["error"].startswith("Linha 4 inválida")
+    assert queries[3] == {"id": 3, "origin": "Manaus", "destination": "Natal"}
+    assert list(read_queries(io.StringIO("\n\n"))) == []
+
+
+def test_input_format_for():
+    assert input_format_for("consultas.CSV") == "csv"
+    assert input_format_for("consultas.ndjson") == "jsonl"
+    assert input_format_for("consultas.txt") is None
+    assert input_format_for("-") is None
+
+
+def test_answer_query_matches_find_path(path_finder):
+    record = answer_query(path_finder, {"id": 9, "origin": "São Paulo", "destination": "Manaus", "algorithm": "UCS"},
+                          transport_type="land")
+    result = path_finder.find_path("São Paulo", "Manaus", "ucs", "land")
+
+    assert record["id"] == 9
+    assert (record["algorithm"], record["transport"]) == ("ucs", "land")
+    assert record["path"] == [city.name for city in result.path]
+    assert record["distance"] == result.distance
+    assert record["expanded_nodes"] == result.expanded_nodes
+
+
+@pytest.mark.parametrize("query, message", INVALID_QUERIES)
+def test_answer_query_reports_errors(path_finder, query, message):
+    record = answer_query(path_finder, query)
+
+    assert record["id"] == query["id"]
+    assert message in record["error"]
+    assert "path" not in record
+
+
+@pytest.mark.parametrize("processes, chunk_size", [(1, 4), (2, 3), (2, 1000)])
+def test_run_batch_keeps_input_order(path_finder, processes, chunk_size):
+    queries = valid_queries()
+    # Erros intercalados com consultas válidas
+    for position, (query, _) in zip((0, 7, 8, 20, 30, 31, 40, 45), INVALID_QUERIES):
+        queries.insert(position, query)
+    output = io.StringIO()
+    progress = []
+
+    summary = run_batch(make_path_finder, iter(queries), output, processes=processes, chunk_size=chunk_size,
+                        progress=lambda done, elapsed: progress.append(done))
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [record["id"] for record in records] == [query["id"] for query in queries]
+    assert records == [answer_query(path_finder, query) for query in queries]
+    assert (summary["queries"], summary["errors"]) == (len(queries), len(INVALID_QUERIES))
+    assert progress == sorted(progress) and progress[-1] == len(queries)
+
+
+def test_batch_command_from_csv_file(tmp_path):
+    source = tmp_path / "consultas.csv"
+    source.write_text("id,origin,destination,transport\n"
+                      "1,São Paulo,Manaus,land\n"
+                      "2,São Paulo,Atlântida,\n", encoding="utf-8")
+    output = tmp_path / "respostas.jsonl"
+
+    summary = run_batch_command(str(source), str(output), algorithm="bfs")
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert (summary["queries"], summary["errors"]) == (2, 1)
+    assert [(record["id"], record["algorithm"], record["transport"]) for record in records] == [
+        ("1", "bfs", "land"), ("2", "bfs", "air")
+    ]
+    assert records[0]["path"][0] == "São Paulo" and records[0]["path"][-1] == "Manaus"
+    assert "Atlântida" in records[1]["error"]
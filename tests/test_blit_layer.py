@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from utils.blit_layer import BlitLayer
+
+
+def make_figure():
+    figure = Figure(figsize=(3, 2), dpi=50)
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    ax.set_xlim(0, 10)
+    ax.set_ylim(0, 10)
+    # Sem eixos: bordas e marcas seriam desenhadas por cima das linhas no draw completo
+    ax.set_axis_off()
+    ax.plot([0, 10], [5, 5], color="gray")
+    return figure, canvas, ax
+
+
+def pixels(canvas):
+    return np.array(canvas.buffer_rgba())
+
+
+def reference(*lines):
+    """Mesma figura desenhada por inteiro, com as linhas como artistas comuns"""
+    _, canvas, ax = make_figure()
+    for xs, ys, color in lines:
+        ax.plot(xs, ys, color=color)
+    canvas.draw()
+    return pixels(canvas)
+
+
+@pytest.fixture
+def layer():
+    figure, canvas, ax = make_figure()
+    blit = BlitLayer(canvas)
+    yield blit, ax
+    blit.detach()
+
+
+def test_update_matches_full_draw(layer):
+    blit, ax = layer
+    first = ([0, 10], [0, 10], "red")
+    second = ([0, 10], [10, 0], "blue")
+
+    blit.set_artists(ax.plot(*first[:2], color=first[2]))
+    blit.update()
+    assert blit.background is not None
+    assert np.array_equal(pixels(blit.canvas), reference(first))
+
+    # Trocar a camada dinâmica remove os artistas anteriores da figura
+    old = blit.artists[0]
+    blit.set_artists(ax.plot(*second[:2], color=second[2]))
+    blit.update()
+    assert old.axes is None
+    assert np.array_equal(pixels(blit.canvas), reference(second))
+
+
+def test_full_redraw_recaptures_background(layer):
+    blit, ax = layer
+    line = ([2, 8], [1, 9], "green")
+    blit.set_artists(ax.plot(*line[:2], color=line[2]))
+    blit.update()
+
+    ax.figure.set_facecolor("yellow")
+    blit.canvas.draw()
+    ax.figure.set_facecolor("white")
+    blit.update()
+
+    # O fundo capturado no último draw completo (amarelo) é o restaurado
+    expected_figure, expected_canvas, expected_ax = make_figure()
+    expected_figure.set_facecolor("yellow")
+    expected_ax.plot(*line[:2], color=line[2])
+    expected_canvas.draw()
+    assert np.array_equal(pixels(blit.canvas), pixels(expected_canvas))
+
+
+def test_detach_stops_capturing(layer):
+    blit, ax = layer
+    blit.update()
+    blit.detach()
+
+    blit.canvas.draw()
+
+    assert blit.background is None
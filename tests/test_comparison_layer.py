@@ -0,0 +1,89 @@
+import math
+
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from geo_coordinates import CAPITAL_COORDINATES
+from utils.map_renderer import ComparisonLayer, route_legs, simplified_brazil_basemap
+
+NAMES = ["bfs", "dfs", "ucs", "greedy", "astar"]
+
+
+@pytest.fixture
+def layer():
+    figure = Figure(figsize=(6, 4), dpi=50)
+    canvas = FigureCanvasAgg(figure)
+    layer = ComparisonLayer(figure, canvas, simplified_brazil_basemap(), list(CAPITAL_COORDINATES), NAMES)
+    yield layer
+    layer.detach()
+
+
+# Sem resultado para greedy e astar
+ROUTES = {
+    "bfs": (["São Paulo", "Manaus"], 2700, 2),
+    "dfs": (["São Paulo", "Brasília", "Manaus"], 2900, 5),
+    "ucs": (["São Paulo", "Manaus"], 2700, 9),
+}
+
+
+def show(layer, transport_type="air"):
+    layer.show(dict(ROUTES), transport_type)
+
+
+def test_panels_and_legend(layer):
+    assert len(layer.axes) == len(NAMES)
+    # Duas linhas: os painéis e a legenda
+    assert len(layer.figure.axes) == len(NAMES) + 1
+    assert [ax.get_title() for ax in layer.axes] == NAMES
+    # Uma única imagem do mapa base, exibida em todos os painéis
+    assert len(layer.images) == len(NAMES)
+    assert all(np.array_equal(image.get_array(), layer.images[0].get_array()) for image in layer.images)
+
+
+def test_show_sets_each_panel(layer):
+    show(layer, "land")
+
+    panels = layer.panels
+    lons, lats = panels["dfs"]["route"].get_data()
+    expected = [point for leg in route_legs(["São Paulo", "Brasília", "Manaus"], "land") for point in leg]
+    assert [(lon, lat) for lon, lat in zip(lons, lats) if not math.isnan(lon)] == expected
+    assert panels["dfs"]["route"].get_color() == '#8B4513'
+    assert list(panels["dfs"]["stops"].get_data()[0]) == [CAPITAL_COORDINATES["Brasília"][1]]
+    assert list(panels["bfs"]["origin"].get_data()[1]) == [CAPITAL_COORDINATES["São Paulo"][0]]
+    assert list(panels["bfs"]["destination"].get_data()[1]) == [CAPITAL_COORDINATES["Manaus"][0]]
+
+    # Menor distância em destaque, inclusive empatada
+    assert panels["bfs"]["summary"].get_text() == "2700 km · 2 nós"
+    assert [panels[name]["summary"].get_fontweight() for name in ("bfs", "dfs", "ucs")] == ["bold", "normal", "bold"]
+    # Algoritmos sem resultado ficam vazios
+    for name in ("greedy", "astar"):
+        assert panels[name]["summary"].get_text() == "Nenhum caminho encontrado"
+        assert len(panels[name]["route"].get_data()[0]) == 0
+    assert layer.title.get_text() == "Rota Terrestre:\nSão Paulo → Manaus"
+
+
+def test_show_reuses_artists_and_background(layer):
+    show(layer)
+    background = layer.blit.background
+    artists = list(layer.blit.artists)
+    first = np.array(layer.canvas.buffer_rgba())
+
+    layer.show({"astar": (["Recife", "Natal"], 250, 1)}, "air")
+    show(layer)
+
+    assert layer.blit.background is background
+    assert layer.blit.artists == artists
+    assert np.array_equal(np.array(layer.canvas.buffer_rgba()), first)
+
+
+def test_resize_rasterizes_the_base_again(layer):
+    show(layer)
+    size = layer.base_size
+
+    layer.figure.set_size_inches(8, 5)
+    show(layer)
+
+    assert layer.base_size != size
+    assert layer.images[0].get_array().shape[:2] == (layer.base_size[1], layer.base_size[0])
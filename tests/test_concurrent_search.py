@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from models.city import City
+from search.interface import SearchAlgorithm, SearchResult
+from utils.concurrent_search import create_executor, discard_executor, run_concurrent
+from conftest import ALGORITHMS
+
+
+class SlowSearch(SearchAlgorithm):
+    """Expande a origem repetidamente, `delay` segundos por expansão"""
+
+    def __init__(self, expansions, delay=0.005):
+        self.expansions = expansions
+        self.delay = delay
+        self.calls = 0
+
+    def search(self, graph, start, goal, transport_type="air"):
+        for _ in range(self.expansions):
+            graph.get_neighbors(start, transport_type)
+            self.calls += 1
+            time.sleep(self.delay)
+        return SearchResult([start, goal], 0, self.expansions)
+
+
+@pytest.fixture
+def thread_executor():
+    executor = create_executor("thread", None, max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_concurrent_results_match_sequential(graph, kind):
+    algorithms = {name: cls() for name, cls in ALGORITHMS.items()}
+    executor = create_executor(kind, graph, max_workers=2)
+    try:
+        for mode in ("air", "land"):
+            results, timing = run_concurrent(executor, algorithms, graph, City("Porto Alegre"), City("Manaus"), mode)
+
+            assert list(results) == list(algorithms)
+            for name, timed in results.items():
+                expected = algorithms[name].search(graph, City("Porto Alegre"), City("Manaus"), mode)
+                assert timed.status == "ok"
+                assert timed.result.path == expected.path
+                assert timed.result.distance == expected.distance
+                assert timed.result.expanded_nodes == expected.expanded_nodes
+            assert timing["wall_time"] > 0
+    finally:
+        executor.shutdown(wait=True)
+
+
+def test_deadline_counts_from_start_not_submission(graph, thread_executor):
+    # Com uma única thread, a segunda busca espera a primeira terminar
+    algorithms = {"first": SlowSearch(60), "second": SlowSearch(60)}
+
+    results, _ = run_concurrent(thread_executor, algorithms, graph, City("Natal"), City("Recife"), timeout=0.5)
+
+    assert {name: timed.status for name, timed in results.items()} == {"first": "ok", "second": "ok"}
+
+
+def test_timed_out_thread_search_is_cancelled(graph, thread_executor):
+    slow = SlowSearch(10_000)
+
+    results, _ = run_concurrent(thread_executor, {"slow": slow}, graph, City("Natal"), City("Recife"), timeout=0.05)
+    assert results["slow"].status == "timeout"
+
+    # A busca abandonada para na próxima expansão e libera a única thread
+    fast = SlowSearch(1, delay=0)
+    results, _ = run_concurrent(thread_executor, {"fast": fast}, graph, City("Natal"), City("Recife"), timeout=1.0)
+    assert results["fast"].status == "ok"
+    calls = slow.calls
+    time.sleep(0.05)
+    assert slow.calls == calls < 10_000
+
+
+def test_discard_executor_terminates_processes(graph):
+    executor = create_executor("process", graph, max_workers=1)
+    executor.submit(time.sleep, 30)
+    time.sleep(0.2)
+    processes = list(executor._processes.values())
+
+    discard_executor(executor)
+
+    for process in processes:
+        process.join(timeout=5)
+        assert not process.is_alive()
+
+
+def test_path_finder_replaces_process_executor_after_timeout(path_finder):
+    path_finder.compare_algorithms_concurrent("Natal", "Recife", "air", executor="process")
+    first = path_finder._executors["process"]
+
+    results, _ = path_finder.compare_algorithms_concurrent("Natal", "Recife", "air", executor="process", timeout=0)
+
+    assert any(result["status"] == "timeout" for result in results.values())
+    assert path_finder._executors.get("process") is not first
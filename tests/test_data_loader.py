@@ -0,0 +1,153 @@
+import copy
+import json
+import math
+import random
+
+import pytest
+
+from conftest import DATA_FILE, neighbor_lists, search_all
+from geo_coordinates import CAPITAL_COORDINATES
+from models.city import City
+from utils.data_loader import DataLoader
+
+
+class LegacyGraph:
+    """Grafo como era antes do build_graph: pares em dicionários e get_neighbors por varredura"""
+
+    def __init__(self):
+        self.cities = set()
+        self.air_distances = {}
+        self.land_distances = {}
+        self._neighbors = {}
+
+    def add_city(self, city):
+        self.cities.add(city)
+
+    def add_air_distance(self, city1, city2, distance):
+        self.cities.update((city1, city2))
+        self.air_distances[(city1, city2)] = distance
+        self.air_distances[(city2, city1)] = distance
+
+    def add_land_distance(self, city1, city2, distance):
+        self.cities.update((city1, city2))
+        self.land_distances[(city1, city2)] = distance
+        self.land_distances[(city2, city1)] = distance
+
+    def get_neighbors(self, city, transport_type="air"):
+        # A varredura é a original; guardada porque o grafo não muda depois de montado
+        if (city, transport_type) not in self._neighbors:
+            distances = self.air_distances if transport_type == "air" else self.land_distances
+            self._neighbors[(city, transport_type)] = [
+                (key[1], distance) for key, distance in distances.items() if key[0] == city
+            ]
+        return list(self._neighbors[(city, transport_type)])
+
+    def get_air_distance(self, city1, city2):
+        return self.air_distances.get((city1, city2), float('inf'))
+
+    def get_land_distance(self, city1, city2):
+        return self.land_distances.get((city1, city2), float('inf'))
+
+
+def legacy_graph(data):
+    """Montagem antiga do DataLoader, par a par com add_*_distance"""
+    graph = LegacyGraph()
+    for capital in data['capitals']:
+        graph.add_city(City(capital))
+    for origin, destinations in data['distances']['land'].items():
+        for destination, distance in destinations.items():
+            if origin != destination:
+                graph.add_land_distance(City(origin), City(destination), distance)
+    air = data['distances'].get('air', data['distances']['land'])
+    for origin, destinations in air.items():
+        for destination, distance in destinations.items():
+            if origin != destination:
+                graph.add_air_distance(City(origin), City(destination), distance)
+    return graph
+
+
+def shuffled(data, seed=0):
+    """Mesmos dados com capitais, linhas e colunas em ordem aleatória"""
+    rng = random.Random(seed)
+    data = copy.deepcopy(data)
+    rng.shuffle(data['capitals'])
+    for mode, matrix in data['distances'].items():
+        rows = list(matrix.items())
+        rng.shuffle(rows)
+        shuffled_rows = {}
+        for origin, row in rows:
+            items = list(row.items())
+            rng.shuffle(items)
+            shuffled_rows[origin] = dict(items)
+        data['distances'][mode] = shuffled_rows
+    return data
+
+
+def without_air(data):
+    data = copy.deepcopy(data)
+    del data['distances']['air']
+    return data
+
+
+def complete(data, asymmetric=False):
+    """
+    Matrizes completas (toda linha na ordem das linhas), o caso copiado linha
+    a linha; com asymmetric=True, a ida e a volta têm distâncias diferentes
+    """
+    names = [name for name in data['capitals'] if name in CAPITAL_COORDINATES]
+
+    def distance(a, b, factor):
+        (lat1, lon1), (lat2, lon2) = CAPITAL_COORDINATES[a], CAPITAL_COORDINATES[b]
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        h = (math.sin((phi2 - phi1) / 2) ** 2
+             + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+        return round(factor * 2 * 6371 * math.asin(math.sqrt(h))) + (asymmetric and a < b)
+
+    return {
+        'capitals': names,
+        'distances': {
+            'land': {a: {b: distance(a, b, 1.3) for b in names} for a in names},
+            'air': {a: {b: distance(a, b, 1.0) for b in names} for a in names},
+        }
+    }
+
+
+with open(DATA_FILE, encoding='utf-8') as f:
+    REAL_DATA = json.load(f)
+
+VARIANTS = {
+    "real": REAL_DATA,
+    "embaralhado": shuffled(REAL_DATA),
+    "sem_aereo": without_air(REAL_DATA),
+    "completo": complete(REAL_DATA),
+    "completo_assimetrico": complete(REAL_DATA, asymmetric=True),
+}
+
+
+@pytest.fixture(params=list(VARIANTS))
+def variant(request, tmp_path):
+    path = tmp_path / "distances.json"
+    path.write_text(json.dumps(VARIANTS[request.param], ensure_ascii=False), encoding='utf-8')
+    return VARIANTS[request.param], DataLoader().read(str(path))
+
+
+def test_build_graph_matches_legacy_neighbors(variant):
+    data, graph = variant
+    legacy = legacy_graph(data)
+
+    assert {city.name for city in graph.cities} == {city.name for city in legacy.cities}
+    assert neighbor_lists(graph) == neighbor_lists(legacy)
+
+
+def test_build_graph_matches_legacy_search_results(variant):
+    data, graph = variant
+
+    assert search_all(graph) == search_all(legacy_graph(data))
+
+
+def test_build_graph_interns_cities(graph):
+    cities = {city.name: city for city in graph.cities}
+    for mode in ("air", "land"):
+        for city, neighbors in graph.adjacency[mode].items():
+            assert city is cities[city.name]
+            assert all(neighbor is cities[neighbor.name] for neighbor in neighbors)
@@ -0,0 +1,78 @@
+import pytest
+
+from models.city import City
+from search.dijkstra import bounded_dijkstra, nearest_target
+from search.ucs import UCS
+
+
+def shortest(graph, origin, destination, mode):
+    return UCS().search(graph, City(origin), City(destination), mode).distance
+
+
+@pytest.mark.parametrize("mode", ["air", "land"])
+@pytest.mark.parametrize("max_km", [0, 800, 2500, float('inf')])
+def test_bounded_dijkstra_matches_ucs(graph, mode, max_km):
+    start = City("Brasília")
+
+    distances, parents = bounded_dijkstra(graph, start, mode, max_km)
+
+    for city in graph.cities:
+        expected = 0 if city == start else shortest(graph, "Brasília", city.name, mode)
+        if expected <= max_km:
+            assert distances[city] == expected
+        else:
+            assert city not in distances
+    # Fixadas em ordem crescente de distância, cada uma pelo seu predecessor
+    assert list(distances.values()) == sorted(distances.values())
+    for city, parent in parents.items():
+        if parent is not None:
+            step = graph.get_air_distance(parent, city) if mode == "air" else graph.get_land_distance(parent, city)
+            assert distances[city] == distances[parent] + step
+
+
+@pytest.mark.parametrize("mode", ["air", "land"])
+def test_nearest_target_is_closest_candidate(graph, mode):
+    candidates = ["Manaus", "Salvador", "Porto Alegre", "Recife"]
+
+    result = nearest_target(graph, City("Belo Horizonte"), {City(name) for name in candidates}, mode)
+
+    distances = {name: shortest(graph, "Belo Horizonte", name, mode) for name in candidates}
+    assert result.path[0] == City("Belo Horizonte")
+    assert result.path[-1].name == min(distances, key=distances.get)
+    assert result.distance == min(distances.values())
+
+
+def test_nearest_target_ignores_origin(graph):
+    targets = {City("Manaus"), City("Salvador"), City("Brasília")}
+
+    result = nearest_target(graph, City("Brasília"), targets, "air")
+
+    assert result.path[-1] != City("Brasília")
+    assert result.distance > 0
+    assert not nearest_target(graph, City("Brasília"), {City("Brasília")}, "air").path
+
+
+def test_find_nearest_of_with_origin_among_candidates(path_finder):
+    result = path_finder.find_nearest_of("Brasília", ["Manaus", "Salvador", "Brasília"], "air")
+
+    assert result.path[-1].name in ("Manaus", "Salvador")
+    assert path_finder.find_nearest_of("Brasília", ["Atlântida"]) is None
+
+
+def test_reachable_within(path_finder):
+    reachable = path_finder.reachable_within("Natal", 600, "land")
+
+    assert "Natal" not in reachable
+    assert reachable and all(distance <= 600 for distance in reachable.values())
+    assert reachable["Recife"] == shortest(path_finder.graph, "Natal", "Recife", "land")
+
+
+def test_reachable_within_on_a_given_graph(graph):
+    from main import PathFinder
+
+    finder = PathFinder(graph=graph)
+    reachable = finder.reachable_within("Natal", 600, "land")
+
+    assert finder.graph is graph
+    assert list(reachable.values()) == sorted(reachable.values())
+    assert finder.reachable_within("Atlântida", 600) is None
@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+import pytest
+
+from geo_coordinates import CAPITAL_COORDINATES
+from utils.geodesy import (EARTH_RADIUS_KM, CoordinateSet, chord_to_km, coordinate_set, great_circle_arc,
+                           haversine, initial_bearing, km_to_chord, polyline_lengths_km, to_unit_vectors)
+
+
+def reference_km(lat1, lon1, lat2, lon2):
+    """Lei esférica dos cossenos, escalar e independente do módulo"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    cos_angle = (math.sin(phi1) * math.sin(phi2)
+                 + math.cos(phi1) * math.cos(phi2) * math.cos(math.radians(lon2 - lon1)))
+    return EARTH_RADIUS_KM * math.acos(max(-1.0, min(1.0, cos_angle)))
+
+
+def test_haversine_matches_reference_for_capitals():
+    names = list(CAPITAL_COORDINATES)
+    for a in names:
+        for b in names:
+            expected = reference_km(*CAPITAL_COORDINATES[a], *CAPITAL_COORDINATES[b])
+            assert float(haversine(*CAPITAL_COORDINATES[a], *CAPITAL_COORDINATES[b])) == pytest.approx(expected, abs=1e-3)
+
+
+def test_haversine_broadcasts():
+    lats = np.array([0.0, 10.0, -20.0])
+    distances = haversine(lats[:, None], 0.0, lats[None, :], 0.0)
+
+    assert distances.shape == (3, 3)
+    assert np.allclose(distances, distances.T)
+    assert distances[0, 1] == pytest.approx(math.radians(10) * EARTH_RADIUS_KM)
+
+
+@pytest.mark.parametrize("target, expected", [((10, 0), 0), ((0, 10), 90), ((-10, 0), 180), ((0, -10), 270)])
+def test_initial_bearing_cardinal_directions(target, expected):
+    assert float(initial_bearing(0, 0, *target)) == pytest.approx(expected)
+
+
+def test_chord_conversions_are_inverse():
+    distances = np.array([0.0, 1.0, 500.0, 10000.0, math.pi * EARTH_RADIUS_KM])
+
+    assert np.allclose(chord_to_km(km_to_chord(distances)), distances)
+    vectors = to_unit_vectors([0, 0], [0, 90])
+    assert float(chord_to_km(np.linalg.norm(vectors[0] - vectors[1]))) == pytest.approx(math.pi / 2 * EARTH_RADIUS_KM)
+
+
+@pytest.mark.parametrize("a, b", [("Porto Alegre", "Boa Vista"), ("Rio Branco", "João Pessoa"), ("Recife", "Natal")])
+def test_great_circle_arc(a, b):
+    (lat1, lon1), (lat2, lon2) = CAPITAL_COORDINATES[a], CAPITAL_COORDINATES[b]
+
+    arc = great_circle_arc(lat1, lon1, lat2, lon2, step_km=50)
+
+    assert tuple(arc[0]) == (lon1, lat1) and tuple(arc[-1]) == (lon2, lat2)
+    steps = polyline_lengths_km(arc[:, 0], arc[:, 1])
+    assert steps.max() <= 50 + 1e-6
+    # Os pontos estão sobre o grande círculo: os segmentos somam a distância total
+    assert steps.sum() == pytest.approx(reference_km(lat1, lon1, lat2, lon2), rel=1e-9)
+
+
+def test_great_circle_arc_of_a_point():
+    assert great_circle_arc(-10, -50, -10, -50).tolist() == [[-50, -10], [-50, -10]]
+
+
+def test_coordinate_set_matches_functions():
+    coordinates = CoordinateSet(CAPITAL_COORDINATES)
+    names = coordinates.names
+
+    row = coordinates.distances_from("Manaus")
+    assert coordinates.distances[coordinates.index["Manaus"]] == pytest.approx(row)
+    assert coordinates.distance("Manaus", "Belém") == pytest.approx(
+        reference_km(*CAPITAL_COORDINATES["Manaus"], *CAPITAL_COORDINATES["Belém"]), abs=1e-3)
+    before = coordinates.bearing(names[0], names[1])
+    assert coordinates.bearings[0, 1] == pytest.approx(before)
+    assert coordinates.bearing(names[0], names[1]) == pytest.approx(before)
+
+
+def test_coordinate_set_arcs_are_cached_read_only():
+    coordinates = CoordinateSet(CAPITAL_COORDINATES)
+
+    arc = coordinates.arc("São Paulo", "Manaus")
+
+    assert coordinates.arc("São Paulo", "Manaus") is arc
+    with pytest.raises(ValueError):
+        arc[0, 0] = 0
+
+
+def test_coordinate_set_is_shared_by_content():
+    subset = {name: CAPITAL_COORDINATES[name] for name in ("Recife", "Natal")}
+
+    assert coordinate_set() is coordinate_set(dict(CAPITAL_COORDINATES))
+    assert coordinate_set(subset) is coordinate_set(dict(subset))
+    assert coordinate_set(subset) is not coordinate_set({"Recife": (0.0, 0.0), "Natal": subset["Natal"]})
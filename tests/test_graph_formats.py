@@ -0,0 +1,286 @@
+import json
+import os
+import struct
+
+import pytest
+
+from conftest import DATA_FILE, neighbor_lists, search_all
+from main import run_convert_command
+from models.city import City
+from models.graph import Graph
+from utils.data_loader import DataLoader
+from utils.graph_formats import (BINARY_VERSION, MAGIC, BinaryGraph, MappedGraph, graph_format_for,
+                                 read_edge_csv, write_graph_binary)
+
+
+@pytest.fixture
+def converted(tmp_path):
+    """Dados reais convertidos JSON -> CSV -> binário -> CSV pela linha de comando"""
+    paths = {"csv": str(tmp_path / "distances.csv"), "binary": str(tmp_path / "distances.rcg"),
+             "csv_from_binary": str(tmp_path / "back.csv")}
+    run_convert_command(DATA_FILE, paths["csv"])
+    run_convert_command(paths["csv"], paths["binary"])
+    run_convert_command(paths["binary"], paths["csv_from_binary"])
+    return paths
+
+
+def test_format_detection(converted, tmp_path):
+    assert graph_format_for(DATA_FILE) == "json"
+    assert graph_format_for(converted["csv"]) == "csv"
+    assert graph_format_for(converted["binary"]) == "binary"
+
+    # Sem extensão conhecida, o formato vem do conteúdo
+    for name, source in (("a.dat", DATA_FILE), ("b.dat", converted["csv"]), ("c.dat", converted["binary"])):
+        with open(source, "rb") as f:
+            (tmp_path / name).write_bytes(f.read())
+    assert [graph_format_for(str(tmp_path / name)) for name in ("a.dat", "b.dat", "c.dat")] == ["json", "csv", "binary"]
+
+
+def test_round_trip_keeps_neighbors(graph, converted):
+    expected = neighbor_lists(graph)
+
+    for name in ("csv", "binary", "csv_from_binary"):
+        loaded = DataLoader().read(converted[name])
+        assert neighbor_lists(loaded) == expected, name
+        assert {city.name for city in loaded.cities} == {city.name for city in graph.cities}
+        if isinstance(loaded, MappedGraph):
+            loaded.close()
+
+
+def test_round_trip_keeps_search_results(reference_results, converted):
+    for name in ("csv", "binary"):
+        loaded = DataLoader().read(converted[name])
+        assert search_all(loaded) == reference_results, name
+        if isinstance(loaded, MappedGraph):
+            loaded.close()
+
+
+def test_binary_round_trip_of_float_distances(tmp_path):
+    graph = Graph()
+    a, b, c = City("A"), City("B"), City("C")
+    graph.add_air_distance(a, b, 10.25)
+    # Não representável em float32: a conversão não pode arredondar
+    graph.add_air_distance(b, c, 1234.567)
+    graph.add_land_distance(a, c, 7)
+    path = str(tmp_path / "floats.rcg")
+
+    write_graph_binary(graph, path, {"origem": "teste"})
+    loaded = MappedGraph(path)
+
+    assert loaded.metadata == {"origem": "teste"}
+    assert loaded.get_neighbors(City("B"), "air") == [(a, 10.25), (c, 1234.567)]
+    assert loaded.get_land_distance(City("C"), City("A")) == 7
+    assert loaded.get_air_distance(City("A"), City("C")) == float("inf")
+    assert loaded.get_neighbors(City("Z")) == []
+    loaded.close()
+
+
+def test_csv_edges_listed_in_one_direction(tmp_path):
+    path = tmp_path / "one_way.csv"
+    path.write_text("mode,origin,destination,distance\n"
+                    "land,A,B,5\n"
+                    "land,A,C,2.5\n"
+                    "air,B,C,4\n", encoding="utf-8")
+
+    names, matrices = read_edge_csv(str(path))
+    graph = DataLoader().read(str(path))
+
+    assert names == ["A", "B", "C"]
+    assert matrices == {"land": {"A": {"B": 5, "C": 2.5}}, "air": {"B": {"C": 4}}}
+    assert graph.get_neighbors(City("C"), "land") == [(City("A"), 2.5)]
+    assert graph.get_air_distance(City("C"), City("B")) == 4
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / "edges.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("text, message", [
+    ("origin,destination,distance\nA,B,1\n", "cabeçalho esperado"),
+    ("", "cabeçalho esperado"),
+    ("mode,origin,destination,distance\nland,A,B,1\nrail,A,B,1\n", "linha 3 inválida: modo desconhecido: rail"),
+    ("mode,origin,destination,distance\nland,A,B,longe\n", "linha 2 inválida"),
+    ("mode,origin,destination,distance\nland,A,B\n", "linha 2 inválida"),
+])
+def test_csv_errors(tmp_path, text, message):
+    path = write_csv(tmp_path, text)
+
+    with pytest.raises(ValueError, match=message):
+        read_edge_csv(path)
+    with pytest.raises(ValueError):
+        DataLoader().read(path)
+
+
+def test_invalid_csv_falls_back_to_mock_data(tmp_path, capsys):
+    path = write_csv(tmp_path, "mode,origin,destination,distance\nrail,A,B,1\n")
+
+    graph = DataLoader().load(path, snapshot_dir=None)
+
+    assert graph.cities
+    assert "modo desconhecido" in capsys.readouterr().out
+
+
+def rewrite_header(path, change):
+    """Regrava o cabeçalho JSON do arquivo binário, mantendo o tamanho"""
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    start = len(MAGIC) + 4
+    (size,) = struct.unpack_from("<I", data, len(MAGIC))
+    header = json.loads(data[start:start + size].decode("utf-8"))
+    change(header)
+    encoded = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert len(encoded) <= size
+    data[start:start + size] = encoded.ljust(size)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_binary_wrong_magic(converted, tmp_path):
+    path = tmp_path / "bad.rcg"
+    with open(converted["binary"], "rb") as f:
+        path.write_bytes(b"XXGRAPH\x00" + f.read()[len(MAGIC):])
+
+    with pytest.raises(ValueError, match="não é um grafo binário"):
+        BinaryGraph(str(path))
+    with pytest.raises(ValueError):
+        DataLoader().read(str(path))
+
+
+def test_binary_wrong_version(converted):
+    def change(header):
+        header["version"] = BINARY_VERSION + 1
+
+    rewrite_header(converted["binary"], change)
+
+    with pytest.raises(ValueError, match="versão"):
+        BinaryGraph(converted["binary"])
+    with pytest.raises(ValueError):
+        DataLoader().read(converted["binary"])
+
+
+def test_convert_reports_read_errors(tmp_path):
+    path = write_csv(tmp_path, "mode,origin,destination,distance\nland,A,B,longe\n")
+
+    with pytest.raises(SystemExit, match="Erro ao ler"):
+        run_convert_command(path, str(tmp_path / "out.rcg"))
+    assert not (tmp_path / "out.rcg").exists()
+
+
+@pytest.fixture
+def snapshot_source(tmp_path):
+    """Cópia dos dados reais e o diretório dos snapshots"""
+    source = tmp_path / "distances.json"
+    with open(DATA_FILE, "rb") as f:
+        source.write_bytes(f.read())
+    return str(source), str(tmp_path / "cache")
+
+
+def snapshot_files(snapshot_dir):
+    return sorted(os.listdir(snapshot_dir))
+
+
+def load_snapshot(source, snapshot_dir):
+    graph = DataLoader().load_snapshot(source, snapshot_dir)
+    lists = neighbor_lists(graph)
+    if isinstance(graph, MappedGraph):
+        graph.close()
+    return graph, lists
+
+
+def test_snapshot_is_reused(graph, snapshot_source):
+    source, snapshot_dir = snapshot_source
+
+    first, first_lists = load_snapshot(source, snapshot_dir)
+    second, second_lists = load_snapshot(source, snapshot_dir)
+
+    assert not isinstance(first, MappedGraph)
+    assert isinstance(second, MappedGraph)
+    assert first_lists == second_lists == neighbor_lists(graph)
+    assert len(snapshot_files(snapshot_dir)) == 1
+
+
+def test_stale_snapshot_is_replaced(snapshot_source):
+    source, snapshot_dir = snapshot_source
+    load_snapshot(source, snapshot_dir)
+    old_files = snapshot_files(snapshot_dir)
+
+    with open(source, encoding="utf-8") as f:
+        data = json.load(f)
+    origin = next(iter(data["distances"]["land"]))
+    destination = next(name for name in data["distances"]["land"][origin] if name != origin)
+    # Nos dois sentidos: o par é gravado de novo ao ler a linha do destino
+    for a, b in ((origin, destination), (destination, origin)):
+        data["distances"]["land"][a][b] += 1
+    with open(source, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+    graph, _ = load_snapshot(source, snapshot_dir)
+    reloaded, _ = load_snapshot(source, snapshot_dir)
+
+    assert not isinstance(graph, MappedGraph)
+    assert isinstance(reloaded, MappedGraph)
+    assert graph.get_land_distance(City(origin), City(destination)) == data["distances"]["land"][origin][destination]
+    assert len(snapshot_files(snapshot_dir)) == 1
+    assert snapshot_files(snapshot_dir) != old_files
+
+
+def corrupt_truncate(path):
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 8)
+
+
+def corrupt_version(path):
+    def change(header):
+        header["version"] = BINARY_VERSION - 1
+    rewrite_header(path, change)
+
+
+def corrupt_header(path):
+    with open(path, "r+b") as f:
+        f.seek(len(MAGIC) + 4)
+        f.write(b"\xff\xfe{{")
+
+
+def corrupt_offsets(path):
+    def change(header):
+        header["modes"]["land"]["weights"] += 1 << 20
+    rewrite_header(path, change)
+
+
+def corrupt_indptr(path):
+    def change(header):
+        header["modes"]["air"]["edges"] -= 1
+    rewrite_header(path, change)
+
+
+@pytest.mark.parametrize("corrupt", [corrupt_truncate, corrupt_version, corrupt_header, corrupt_offsets, corrupt_indptr])
+def test_invalid_snapshot_is_rebuilt(graph, snapshot_source, corrupt, capsys):
+    source, snapshot_dir = snapshot_source
+    load_snapshot(source, snapshot_dir)
+    (name,) = snapshot_files(snapshot_dir)
+    path = os.path.join(snapshot_dir, name)
+    corrupt(path)
+
+    with pytest.raises(ValueError):
+        BinaryGraph(path)
+    rebuilt, rebuilt_lists = load_snapshot(source, snapshot_dir)
+    reloaded, reloaded_lists = load_snapshot(source, snapshot_dir)
+
+    assert "Snapshot do grafo inválido" in capsys.readouterr().out
+    assert not isinstance(rebuilt, MappedGraph)
+    assert isinstance(reloaded, MappedGraph)
+    assert rebuilt_lists == reloaded_lists == neighbor_lists(graph)
+    assert snapshot_files(snapshot_dir) == [name]
+
+
+def test_truncated_binary_at_any_point_raises(converted, tmp_path):
+    with open(converted["binary"], "rb") as f:
+        data = f.read()
+    path = tmp_path / "truncated.rcg"
+
+    for size in (len(MAGIC), len(MAGIC) + 2, len(MAGIC) + 20, len(data) // 2, len(data) - 1):
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            BinaryGraph(str(path))
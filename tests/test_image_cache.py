@@ -0,0 +1,136 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from tests.test_single_flight import wait_until
+from utils import map_renderer
+from utils.image_cache import ImageCache, base_fingerprint, route_key
+
+
+def test_get_put_and_stats(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=1000)
+
+    assert cache.get("aa01") is None
+    cache.put("aa01", b"x" * 10)
+    assert cache.get("aa01") == b"x" * 10
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+    assert (stats["entries"], stats["bytes"]) == (1, 10)
+    assert stats["hit_rate"] == 0.5
+    assert not [name for _, _, files in os.walk(tmp_path) for name in files if name.endswith(".partial")]
+
+
+def test_get_or_create_calls_create_once(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    calls = []
+
+    def create():
+        calls.append(1)
+        return b"png"
+
+    assert cache.get_or_create("bb01", create) == (b"png", False)
+    assert cache.get_or_create("bb01", create) == (b"png", True)
+    assert len(calls) == 1
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=350)
+    for key in ("k1", "k2", "k3"):
+        cache.put(key, b"x" * 100)
+        # A ordem de uso vem da data de modificação dos arquivos
+        time.sleep(0.02)
+    assert cache.get("k1") is not None
+    time.sleep(0.02)
+
+    cache.put("k4", b"x" * 100)
+
+    assert cache.get("k2") is None
+    assert all(cache.get(key) is not None for key in ("k1", "k3", "k4"))
+    stats = cache.stats()
+    assert (stats["evictions"], stats["entries"], stats["bytes"]) == (1, 3, 300)
+
+
+def test_shared_directory_between_instances(tmp_path):
+    writer = ImageCache(str(tmp_path))
+    writer.put("cc01", b"abc")
+
+    reader = ImageCache(str(tmp_path))
+
+    assert reader.stats()["entries"] == 1
+    assert reader.get("cc01") == b"abc"
+    reader.clear()
+    assert writer.get("cc01") is None
+
+
+def test_route_key_depends_on_every_field():
+    base = base_fingerprint("hash", ["São Paulo", "Manaus"])
+    key = route_key(["São Paulo", "Manaus"], "air", (800, 600), 100, base)
+
+    assert base == base_fingerprint("hash", ["Manaus", "São Paulo"])
+    assert key != route_key(["Manaus", "São Paulo"], "air", (800, 600), 100, base)
+    assert key != route_key(["São Paulo", "Manaus"], "land", (800, 600), 100, base)
+    assert key != route_key(["São Paulo", "Manaus"], "air", (801, 600), 100, base)
+    assert key != route_key(["São Paulo", "Manaus"], "air", (800, 600), 100, base_fingerprint("outro", []))
+
+
+@pytest.fixture
+def route_layer(tmp_path):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(4, 3), dpi=50)
+    canvas = FigureCanvasAgg(figure)
+    layer = map_renderer.RouteLayer(figure, canvas, map_renderer.simplified_brazil_basemap(),
+                                    list(map_renderer.CAPITAL_COORDINATES), cache=ImageCache(str(tmp_path)))
+    canvas.draw()
+    yield layer
+    layer.detach()
+
+
+def frame(layer):
+    return np.array(layer.canvas.buffer_rgba())
+
+
+def test_route_layer_cache_hit_skips_drawing(route_layer, monkeypatch):
+    first = (["São Paulo", "Brasília", "Manaus"], "air")
+    second = (["Recife", "Salvador"], "land")
+
+    route_layer.show_route(*first)
+    wait_until(lambda: route_layer.cache.stats()["stores"] == 1)
+    drawn = frame(route_layer)
+    route_layer.show_route(*second)
+    wait_until(lambda: route_layer.cache.stats()["stores"] == 2)
+
+    calls = []
+    original = map_renderer.draw_route
+    monkeypatch.setattr(map_renderer, "draw_route", lambda *args: calls.append(args) or original(*args))
+    route_layer.show_route(*first)
+
+    assert calls == []
+    assert route_layer.blit.artists == []
+    assert np.array_equal(frame(route_layer), drawn)
+
+    # Um redesenho completo cria os artistas da rota que veio do cache
+    route_layer.canvas.draw()
+
+    assert len(calls) == 1
+    assert route_layer.blit.artists
+    assert np.array_equal(frame(route_layer), drawn)
+
+
+def test_route_layer_detach_disconnects(route_layer, monkeypatch):
+    route_layer.show_route(["Recife", "Salvador"], "land")
+    wait_until(lambda: route_layer.cache.stats()["stores"] == 1)
+    route_layer.show_route(["Recife", "Salvador"], "land")
+    assert route_layer.pending is not None
+
+    route_layer.detach()
+    calls = []
+    monkeypatch.setattr(map_renderer, "draw_route", lambda *args: calls.append(args))
+    route_layer.canvas.draw()
+
+    assert calls == []
+    assert route_layer.blit.background is None
@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+from utils.label_placement import CANDIDATES, SEGMENT_COST, Label, LabelPlacer, _segment_hits_box, text_size
+
+
+def overlap(a, b):
+    return max(0, min(a[2], b[2]) - max(a[0], b[0])) * max(0, min(a[3], b[3]) - max(a[1], b[1]))
+
+
+def test_label_boxes_around_anchor():
+    label = Label("Natal", (100, 50), (40, 10), gap=(4, 2))
+
+    assert label.box("left", "center") == (104, 45, 144, 55)
+    assert label.box("right", "center") == (56, 45, 96, 55)
+    assert label.box("center", "bottom") == (80, 52, 120, 62)
+    assert label.box("center", "top") == (80, 38, 120, 48)
+    assert Label("a", (0, 0), (1, 1), preferred=("right", "top")).candidates()[0] == ("right", "top")
+    assert sorted(Label("a", (0, 0), (1, 1), preferred=("right", "top")).candidates()) == sorted(CANDIDATES)
+
+
+def test_segment_hits_box_matches_sampling():
+    rng = random.Random(3)
+    box = (10, 10, 30, 20)
+    for _ in range(2000):
+        p = (rng.uniform(0, 40), rng.uniform(0, 30))
+        q = (rng.uniform(0, 40), rng.uniform(0, 30))
+        samples = [(p[0] + (q[0] - p[0]) * t / 400, p[1] + (q[1] - p[1]) * t / 400) for t in range(401)]
+        inside = any(box[0] < x < box[2] and box[1] < y < box[3] for x, y in samples)
+        if inside:
+            assert _segment_hits_box(p, q, box)
+        elif _segment_hits_box(p, q, box):
+            # Só toca a borda (ou passa entre duas amostras rente a um canto)
+            grown = (box[0] - 0.1, box[1] - 0.1, box[2] + 0.1, box[3] + 0.1)
+            assert any(grown[0] <= x <= grown[2] and grown[1] <= y <= grown[3] for x, y in samples)
+
+
+def obstacles(seed):
+    rng = random.Random(seed)
+    boxes, segments = [], []
+    for _ in range(40):
+        x, y = rng.uniform(0, 500), rng.uniform(0, 400)
+        boxes.append((x, y, x + rng.uniform(1, 60), y + rng.uniform(1, 30)))
+    for _ in range(30):
+        segments.append(((rng.uniform(0, 500), rng.uniform(0, 400)), (rng.uniform(0, 500), rng.uniform(0, 400)),
+                         rng.uniform(0, 6)))
+    return boxes, segments
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_grid_cost_matches_brute_force(seed):
+    boxes, segments = obstacles(seed)
+    placer = LabelPlacer(bounds=(0, 0, 500, 400), cell_size=32)
+    for box in boxes:
+        placer.add_box(box)
+    for p, q, width in segments:
+        placer.add_segment(p, q, width)
+
+    rng = random.Random(seed + 100)
+    for _ in range(300):
+        x, y = rng.uniform(-20, 500), rng.uniform(-20, 400)
+        query = (x, y, x + rng.uniform(5, 80), y + rng.uniform(5, 20))
+        expected = sum(overlap(query, box) for box in boxes)
+        for p, q, width in segments:
+            half = width / 2
+            if _segment_hits_box(p, q, (query[0] - half, query[1] - half, query[2] + half, query[3] + half)):
+                expected += SEGMENT_COST
+        outside = max(0, -query[0]) + max(0, -query[1]) + max(0, query[2] - 500) + max(0, query[3] - 400)
+
+        assert placer.cost(query) == pytest.approx(expected + outside * 50.0)
+
+
+def test_place_avoids_overlaps_when_there_is_room():
+    rng = random.Random(7)
+    placer = LabelPlacer(bounds=(0, 0, 1000, 800))
+    labels = [Label(f"c{i}", (rng.uniform(100, 900), rng.uniform(100, 700)), text_size(f"cidade {i}", 12))
+              for i in range(25)]
+
+    placements = placer.place(labels)
+
+    boxes = [label.box(*placements[label.text]) for label in labels]
+    assert all(overlap(a, b) == 0 for i, a in enumerate(boxes) for b in boxes[i + 1:])
+
+
+def test_place_uses_priority_preference_and_ignore():
+    placer = LabelPlacer(bounds=(0, 0, 200, 200))
+    marker = placer.add_box((95, 95, 105, 105))
+    # O segmento passa à direita do ponto: a primeira candidata livre é a da esquerda
+    placer.add_segment((110, 0), (110, 200), width=4)
+    labels = [
+        Label("baixa", (100, 100), (30, 10), priority=0),
+        Label("alta", (100, 100), (30, 10), priority=5, ignore=(marker,)),
+        Label("preferida", (50, 170), (30, 10), preferred=("center", "top")),
+    ]
+
+    placements = placer.place(labels)
+
+    assert placements["alta"] == ("right", "center")
+    assert placements["baixa"] != placements["alta"]
+    assert placements["preferida"] == ("center", "top")
+
+
+def test_optional_label_is_dropped_without_free_position():
+    placer = LabelPlacer(bounds=(0, 0, 100, 100))
+    placer.add_box((0, 0, 100, 100))
+
+    placements = placer.place([Label("opcional", (50, 50), (20, 10), optional=True),
+                               Label("obrigatório", (50, 50), (20, 10))])
+
+    assert placements["opcional"] is None
+    assert placements["obrigatório"] in CANDIDATES
@@ -0,0 +1,122 @@
+import os
+
+import numpy as np
+import pytest
+from matplotlib.path import Path
+
+from utils.basemap import Basemap
+from utils.geodesy import haversine
+from utils.land_corridors import LandCorridors, _Grid, build_corridors, load_corridors, rasterize
+
+# Terra em forma de U: a baía entre os braços obriga o corredor A-B a contorná-la
+U_SHAPE = [(0, 0), (10, 0), (10, 10), (7, 10), (7, 3), (3, 3), (3, 10), (0, 10), (0, 0)]
+# Quadrado com um lago no meio (buraco)
+LAKE = [[(20, 0), (30, 0), (30, 10), (20, 10), (20, 0)], [(23, 3), (27, 3), (27, 7), (23, 7), (23, 3)]]
+
+COORDINATES = {"A": (9.0, 1.5), "B": (9.0, 8.5), "C": (1.0, 5.0)}
+EDGES = [("A", "B"), ("B", "A"), ("A", "C"), ("C", "B"), ("A", "A")]
+RESOLUTION = 0.25
+
+
+@pytest.fixture(scope="module")
+def basemap():
+    return Basemap.from_polygons([[U_SHAPE], LAKE], source_hash="teste")
+
+
+@pytest.fixture(scope="module")
+def corridors(basemap):
+    return build_corridors(basemap, COORDINATES, EDGES, RESOLUTION, key="k")
+
+
+def test_rasterize_matches_point_in_polygon(basemap):
+    mask, origin = rasterize(basemap, RESOLUTION)
+
+    rows, columns = mask.shape
+    centers = np.array([(origin[0] + (c + 0.5) * RESOLUTION, origin[1] + (r + 0.5) * RESOLUTION)
+                        for r in range(rows) for c in range(columns)])
+    expected = Path(np.array(U_SHAPE, dtype=float)).contains_points(centers)
+    expected |= (Path(np.array(LAKE[0], dtype=float)).contains_points(centers)
+                 & ~Path(np.array(LAKE[1], dtype=float)).contains_points(centers))
+    assert np.array_equal(mask.ravel(), expected)
+
+
+def test_corridor_pairs_and_endpoints(corridors):
+    assert len(corridors) == 3
+    assert ("A", "B") in corridors and ("B", "A") in corridors
+    assert corridors.leg("A", "Z") is None
+
+    leg = corridors.leg("A", "B")
+    assert tuple(leg[0]) == (1.5, 9.0) and tuple(leg[-1]) == (8.5, 9.0)
+    assert np.array_equal(corridors.leg("B", "A"), leg[::-1])
+
+
+@pytest.mark.parametrize("pair", [("A", "B"), ("A", "C"), ("C", "B")])
+def test_corridors_stay_on_land(basemap, corridors, pair):
+    mask, origin = rasterize(basemap, RESOLUTION)
+    grid = _Grid(mask, origin, RESOLUTION)
+
+    leg = corridors.leg(*pair)
+
+    assert all(grid.segment_on_land(tuple(p), tuple(q)) for p, q in zip(leg, leg[1:]))
+
+
+def test_corridor_goes_around_the_bay(corridors):
+    straight = float(haversine(9.0, 1.5, 9.0, 8.5))
+
+    # Desce pelo braço esquerdo, passa abaixo da baía e sobe pelo direito
+    assert corridors.leg("A", "B")[:, 1].min() < 3
+    assert corridors.length_km("A", "B") > 2 * straight
+
+
+def test_position_along_corridor(corridors):
+    cumulative = corridors.cumulative_km("A", "C")
+    leg = corridors.leg("A", "C")
+
+    assert corridors.position_at("A", "C", -5) == tuple(leg[0])
+    assert corridors.position_at("A", "C", cumulative[-1] + 5) == pytest.approx(tuple(leg[-1]))
+    assert corridors.position_at("A", "C", cumulative[1]) == pytest.approx(tuple(leg[1]))
+    middle = corridors.position_at("A", "C", (cumulative[0] + cumulative[1]) / 2)
+    assert middle == pytest.approx(tuple((leg[0] + leg[1]) / 2), abs=1e-3)
+
+
+def test_load_corridors_uses_and_refreshes_cache(basemap, corridors, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    first = load_corridors(basemap, COORDINATES, EDGES, RESOLUTION, cache_dir)
+    (name,) = os.listdir(cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("o cache deveria ter sido usado")
+
+    monkeypatch.setattr("utils.land_corridors.build_corridors", fail)
+    cached = load_corridors(basemap, COORDINATES, EDGES, RESOLUTION, cache_dir)
+    assert isinstance(cached, LandCorridors)
+    assert np.array_equal(cached.leg("A", "B"), first.leg("A", "B"))
+    assert np.array_equal(cached.leg("A", "B"), corridors.leg("A", "B"))
+    monkeypatch.undo()
+
+    # Outros trechos: outro arquivo, e o anterior é removido
+    changed = load_corridors(basemap, COORDINATES, EDGES[:1], RESOLUTION, cache_dir)
+    assert len(changed) == 1
+    assert os.listdir(cache_dir) != [name] and len(os.listdir(cache_dir)) == 1
+
+
+def test_load_corridors_alongside_another_writer(basemap, corridors, tmp_path, monkeypatch):
+    # Gravação em andamento de outro processo e um cache antigo que ele remove antes de nós
+    other = tmp_path / "land_corridors.0123456789abcdef.v1.99999.partial.npz"
+    other.write_bytes(b"gravando")
+    (tmp_path / "land_corridors.fedcba9876543210.v1.npz").write_bytes(b"antigo")
+    real_remove = os.remove
+
+    def remove(path):
+        real_remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "remove", remove)
+    monkeypatch.setattr("utils.land_corridors.build_corridors", lambda *args: corridors)
+    load_corridors(basemap, COORDINATES, EDGES, RESOLUTION, str(tmp_path))
+    monkeypatch.undo()
+
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) == 2 and other.name in names
+    cached = load_corridors(basemap, COORDINATES, EDGES, RESOLUTION, str(tmp_path))
+    assert np.array_equal(cached.leg("A", "B"), corridors.leg("A", "B"))
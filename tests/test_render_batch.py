@@ -0,0 +1,85 @@
+import io
+import json
+
+import pytest
+
+from utils.batch import chunks
+from utils.render_batch import image_name, render_routes, slugify, all_pairs_queries
+
+
+def make_path_finder():
+    from main import PathFinder
+    return PathFinder()
+
+
+def test_chunks_preserve_order_and_size():
+    assert list(chunks(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunks([], 3)) == []
+
+
+def test_slugify():
+    assert slugify("São Paulo") == "sao-paulo"
+    assert slugify("  Belo   Horizonte ") == "belo-horizonte"
+
+
+def test_image_names_differ_by_algorithm_and_transport():
+    base = {"origin": "São Paulo", "destination": "Manaus", "transport": "air", "algorithm": "astar"}
+    names = {
+        image_name(dict(base)),
+        image_name(dict(base, algorithm="bfs")),
+        image_name(dict(base, transport="land")),
+        image_name(dict(base, id=7)),
+    }
+    assert len(names) == 4
+    assert image_name(dict(base, id="a 1"), ".svg") == "a-1_sao-paulo_manaus_air_astar.svg"
+
+
+def test_all_pairs_queries():
+    queries = list(all_pairs_queries(["A", "B", "C"], ("air", "land")))
+    assert len(queries) == 12
+    assert all(query["origin"] != query["destination"] for query in queries)
+
+
+@pytest.mark.parametrize("output_format, processes", [("svg", 1), ("geojson", 1), ("svg", 2)])
+def test_render_routes_writes_one_file_per_query(tmp_path, output_format, processes):
+    queries = [
+        {"origin": "São Paulo", "destination": "Manaus", "algorithm": "bfs"},
+        {"origin": "São Paulo", "destination": "Manaus", "algorithm": "astar"},
+        {"origin": "São Paulo", "destination": "Manaus", "transport": "land"},
+        {"origin": "São Paulo", "destination": "Atlântida"},
+        {"id": "x", "origin": "Natal", "destination": "Recife"},
+    ]
+    manifest = io.StringIO()
+
+    summary = render_routes(make_path_finder, queries, str(tmp_path), manifest,
+                            processes=processes, chunk_size=2, output_format=output_format)
+
+    records = [json.loads(line) for line in manifest.getvalue().splitlines()]
+    assert [record["origin"] for record in records] == [query["origin"] for query in queries]
+    assert summary == dict(summary, queries=5, images=4, errors=1, cached=0)
+    images = [record["image"] for record in records if record.get("image")]
+    assert len(set(images)) == 4
+    for name in images:
+        assert (tmp_path / name).stat().st_size > 0
+    assert "error" in records[3]
+
+
+def test_render_png_reuses_image_cache(tmp_path):
+    queries = [
+        {"origin": "São Paulo", "destination": "Manaus"},
+        {"origin": "Natal", "destination": "Recife", "transport": "land"},
+    ]
+    options = {"directory": str(tmp_path / "cache")}
+    runs = []
+    for run in ("primeira", "segunda"):
+        manifest = io.StringIO()
+        summary = render_routes(make_path_finder, queries, str(tmp_path / run), manifest, processes=1,
+                                figsize=(4, 3), dpi=40, cache_options=options)
+        records = [json.loads(line) for line in manifest.getvalue().splitlines()]
+        runs.append((summary, {record["image"]: (tmp_path / run / record["image"]).read_bytes() for record in records}))
+
+    (first, first_images), (second, second_images) = runs
+    assert (first["images"], first["cached"]) == (2, 0)
+    assert (second["images"], second["cached"]) == (2, 2)
+    assert second_images == first_images
+    assert all(data.startswith(b"\x89PNG") for data in first_images.values())
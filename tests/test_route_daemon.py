@@ -0,0 +1,137 @@
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from route_client import send_request
+from route_daemon import RouteDaemon
+
+
+class DaemonThread:
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+        self.daemon = RouteDaemon(socket_path)
+        self.thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.daemon.shutdown()
+        self.daemon.server_close()
+        self.thread.join(5)
+
+
+@pytest.fixture(scope="module")
+def socket_path(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("daemon") / "rotas.sock")
+
+
+@pytest.fixture(scope="module")
+def running(socket_path):
+    running = DaemonThread(socket_path)
+    yield running
+    running.close()
+
+
+def send_lines(socket_path, lines):
+    """
+    Envia várias linhas pela mesma conexão e lê uma resposta por linha;
+    NaN/Infinity nas respostas falham o teste
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(b"".join(line.encode("utf-8") + b"\n" for line in lines))
+        with sock.makefile("rb") as f:
+            return [json.loads(f.readline(), parse_constant=lambda name: pytest.fail(f"{name} na resposta"))
+                    for _ in lines]
+
+
+def test_route_and_via(running, path_finder):
+    response = send_request({"command": "route", "origin": "Natal", "destination": "Manaus"}, running.socket_path)
+    assert response["ok"]
+    assert response["result"]["path"] == [city.name for city in path_finder.find_path("Natal", "Manaus").path]
+
+    response = send_request({"command": "via", "origin": "Natal", "via": ["Recife"], "destination": "Salvador"},
+                            running.socket_path)
+    assert response["ok"]
+    assert response["result"]["path"][:2] == ["Natal", "Recife"]
+
+
+@pytest.mark.parametrize("line", [
+    "[]",
+    '"x"',
+    "42",
+    "null",
+    "{nada",
+    '{"command": "via", "origin": "Natal", "via": "Recife", "destination": "Salvador"}',
+    '{"command": "nearest", "origin": "Natal", "candidates": "Recife"}',
+    '{"command": "route", "origin": ["Natal"], "destination": "Recife"}',
+    '{"command": "route", "origin": "Natal", "destination": "Recife", "algorithm": 7}',
+    '{"command": "route", "origin": "Natal", "destination": "Atlântida"}',
+    '{"command": "voar"}',
+])
+def test_invalid_requests_get_an_error_and_keep_the_connection(running, line):
+    error, pong = send_lines(running.socket_path, [line, '{"command": "ping"}'])
+
+    assert error["ok"] is False and error["error"]
+    assert pong == {"ok": True, "result": "pong"}
+
+
+def test_request_counter_is_exact_under_concurrency(running):
+    before = send_request({"command": "stats"}, running.socket_path)["result"]["requests"]
+
+    def client():
+        send_lines(running.socket_path, ['{"command": "ping"}'] * 50)
+
+    threads = [threading.Thread(target=client) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    after = send_request({"command": "stats"}, running.socket_path)["result"]["requests"]
+    # A própria consulta de stats anterior também conta
+    assert after - before == 8 * 50 + 1
+
+
+def test_live_daemon_socket_is_not_replaced(running):
+    with pytest.raises(OSError, match="já está ouvindo"):
+        RouteDaemon(running.socket_path)
+
+    assert send_request({"command": "ping"}, running.socket_path)["result"] == "pong"
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    path = str(tmp_path / "stale.sock")
+    # Socket criado e abandonado, como após um kill -9
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    assert os.path.exists(path)
+
+    running = DaemonThread(path)
+    try:
+        assert send_request({"command": "ping"}, path)["result"] == "pong"
+    finally:
+        running.close()
+
+
+def test_regular_file_is_not_removed(tmp_path):
+    path = tmp_path / "not-a-socket"
+    path.write_text("dados")
+
+    with pytest.raises(OSError):
+        RouteDaemon(str(path))
+    assert path.read_text() == "dados"
+
+
+def test_infinite_distances_become_null(running, monkeypatch):
+    monkeypatch.setattr(running.daemon.path_finder, "compare_algorithms", lambda *args: {
+        "ucs": {"path": None, "distance": float('inf'), "expanded_nodes": 3, "is_optimal": None}
+    })
+
+    (response,) = send_lines(running.socket_path, ['{"command": "compare", "origin": "Natal", "destination": "Recife"}'])
+
+    assert response["ok"]
+    assert response["result"]["ucs"]["distance"] is None
@@ -0,0 +1,79 @@
+import pytest
+
+from conftest import ALGORITHMS, TRANSPORT_TYPES
+from models.city import City
+
+INF = float('inf')
+
+
+def all_pairs(graph, mode, weight=True):
+    """Floyd-Warshall: {(origem, destino): menor custo}, por distância ou por número de trechos"""
+    names = sorted(city.name for city in graph.cities)
+    best = {(a, b): (0 if a == b else INF) for a in names for b in names}
+    for city in graph.cities:
+        for neighbor, distance in graph.get_neighbors(city, mode):
+            best[(city.name, neighbor.name)] = min(best[(city.name, neighbor.name)], distance if weight else 1)
+    for k in names:
+        for a in names:
+            through = best[(a, k)]
+            if through == INF:
+                continue
+            for b in names:
+                if through + best[(k, b)] < best[(a, b)]:
+                    best[(a, b)] = through + best[(k, b)]
+    return best
+
+
+@pytest.fixture(scope="module")
+def shortest(graph):
+    return {mode: all_pairs(graph, mode) for mode in TRANSPORT_TYPES}
+
+
+@pytest.fixture(scope="module")
+def fewest_legs(graph):
+    return {mode: all_pairs(graph, mode, weight=False) for mode in TRANSPORT_TYPES}
+
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_paths_are_valid(graph, reference_results, shortest, name):
+    for (algorithm, mode, origin, destination), (path, distance, expanded) in reference_results.items():
+        if algorithm != name:
+            continue
+        optimal = shortest[mode][(origin, destination)]
+        # Encontra caminho sempre que existe um
+        assert (path is not None) == (optimal != INF)
+        assert expanded >= 1
+        if path is None:
+            continue
+        assert (path[0], path[-1]) == (origin, destination)
+        assert len(set(path)) == len(path)
+        legs = [dict((n.name, d) for n, d in graph.get_neighbors(City(a), mode))[b] for a, b in zip(path, path[1:])]
+        assert distance == sum(legs)
+        assert distance >= optimal
+
+
+def test_ucs_is_optimal(reference_results, shortest):
+    for (algorithm, mode, origin, destination), (path, distance, _) in reference_results.items():
+        if algorithm == "ucs" and path is not None:
+            assert distance == shortest[mode][(origin, destination)]
+
+
+def test_bfs_uses_fewest_legs(reference_results, fewest_legs):
+    for (algorithm, mode, origin, destination), (path, _, _) in reference_results.items():
+        if algorithm == "bfs" and path is not None:
+            assert len(path) - 1 == fewest_legs[mode][(origin, destination)]
+
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_same_origin_and_destination(graph, name):
+    result = ALGORITHMS[name]().search(graph, City("Recife"), City("Recife"), "air")
+
+    assert [city.name for city in result.path] == ["Recife"]
+    assert result.distance == 0
+
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_unknown_destination(graph, name):
+    result = ALGORITHMS[name]().search(graph, City("Recife"), City("Atlântida"), "land")
+
+    assert result.path == []
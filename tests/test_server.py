@@ -0,0 +1,185 @@
+import asyncio
+import json
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+import server as server_module
+from server import RouteServer
+from test_single_flight import wait_until
+
+
+class RunningServer:
+    """RouteServer em uma thread com o próprio loop de eventos"""
+
+    def __init__(self, cache_dir):
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=asyncio.run, args=(self._serve(cache_dir),), daemon=True)
+        self.thread.start()
+        assert self.ready.wait(30)
+
+    async def _serve(self, cache_dir):
+        self.loop = asyncio.get_running_loop()
+        self.stop = asyncio.Event()
+        self.server = await RouteServer(port=0, workers=4, cache_dir=cache_dir).start()
+        self.ready.set()
+        await self.stop.wait()
+        await self.server.shutdown(grace=1)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.stop.set)
+        self.thread.join(10)
+
+    def get(self, path):
+        """(status, corpo JSON) de um GET; NaN/Infinity no corpo falham o teste"""
+        url = f"http://127.0.0.1:{self.server.port}{urllib.parse.quote(path, safe='/?=&')}"
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                status, body = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, body = e.code, e.read()
+        return status, json.loads(body, parse_constant=lambda name: pytest.fail(f"{name} na resposta"))
+
+
+@pytest.fixture(scope="module")
+def running(tmp_path_factory):
+    running = RunningServer(str(tmp_path_factory.mktemp("images")))
+    yield running
+    running.close()
+
+
+def test_route(running, path_finder):
+    status, body = running.get("/route?origin=Natal&destination=Manaus&transport=land")
+
+    expected = path_finder.find_path("Natal", "Manaus", "astar", "land")
+    assert status == 200
+    assert body["path"] == [city.name for city in expected.path]
+    assert body["distance"] == expected.distance
+
+
+@pytest.mark.parametrize("path, status", [
+    ("/route?origin=Natal", 400),
+    ("/route?origin=Natal&destination=Recife&transport=sea", 400),
+    ("/route?origin=Natal&destination=Recife&algorithm=dijkstra", 400),
+    ("/route?origin=Natal&destination=Atlântida", 404),
+    ("/nothing", 404),
+])
+def test_errors(running, path, status):
+    assert running.get(path)[0] == status
+
+
+def test_infinite_distances_become_null(running, monkeypatch):
+    finder = server_module._path_finder
+    monkeypatch.setattr(finder, "compare_algorithms", lambda *args: {
+        "ucs": {"path": None, "distance": float('inf'), "expanded_nodes": 3, "is_optimal": None}
+    })
+    monkeypatch.setattr(finder, "find_best_transport", lambda *args: {
+        "air_distance": 100, "land_distance": float('inf'), "best_transport": "aéreo",
+        "best_result": finder.find_path("Natal", "Recife")
+    })
+
+    status, body = running.get("/compare?origin=Natal&destination=Recife")
+    assert status == 200
+    assert body["ucs"]["distance"] is None
+
+    status, body = running.get("/best-transport?origin=Natal&destination=Recife")
+    assert status == 200
+    assert body["land_distance"] is None
+    assert body["air_distance"] == 100
+
+
+@pytest.mark.parametrize("a, b", [
+    ({"origin": "Natal", "destination": "Recife", "algorithm": "AStar"}, {"origin": "Natal", "destination": "Recife"}),
+    ({"origin": "Natal", "destination": "Recife", "transport": "air", "algorithm": "UCS"},
+     {"origin": "Natal", "destination": "Recife", "algorithm": "ucs"}),
+])
+def test_equivalent_route_params_share_a_key(a, b):
+    assert server_module.normalize_params("/route", a) == server_module.normalize_params("/route", b)
+
+
+def test_normalized_params_keep_what_changes_the_answer():
+    normalize = server_module.normalize_params
+    base = {"origin": "Natal", "destination": "Recife"}
+
+    assert normalize("/route", base) != normalize("/route", dict(base, transport="land"))
+    assert normalize("/route", base) != normalize("/route", dict(base, origin="natal"))
+    # /compare ignora o algoritmo; /map normaliza os números
+    assert normalize("/compare", dict(base, algorithm="bfs")) == normalize("/compare", base)
+    assert normalize("/map", dict(base, width="0800", dpi="100")) == normalize("/map", dict(base, width="800"))
+
+
+def test_case_variants_are_coalesced(running, monkeypatch):
+    release = threading.Event()
+    real_execute = server_module.execute_query
+
+    def slow_execute(endpoint, params):
+        release.wait(5)
+        return real_execute(endpoint, params)
+
+    monkeypatch.setattr(server_module, "execute_query", slow_execute)
+    flight = running.server.flight
+    before = flight.stats()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda path=path: results.append(running.get(path)))
+        for path in ("/route?origin=Natal&destination=Recife&algorithm=AStar",
+                     "/route?origin=Natal&destination=Recife&algorithm=astar",
+                     "/route?origin=Natal&destination=Recife")
+    ]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: flight.stats()["shared"] - before["shared"] >= 2)
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert flight.stats()["executed"] - before["executed"] == 1
+    assert len(results) == 3 and all(result == results[0] for result in results)
+    assert results[0][0] == 200
+
+
+def test_map_cache_io_runs_off_the_event_loop(running, monkeypatch):
+    cache = running.server.image_cache
+    threads = []
+
+    def record(method):
+        def wrapper(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+        return wrapper
+
+    monkeypatch.setattr(server_module, "render_map", lambda *args: b"png")
+    monkeypatch.setattr(cache, "get", record(cache.get))
+    monkeypatch.setattr(cache, "put", record(cache.put))
+
+    url = f"http://127.0.0.1:{running.server.port}/map?origin=Natal&destination=Recife&width=321"
+    for _ in range(2):
+        with urllib.request.urlopen(url, timeout=10) as response:
+            assert response.read() == b"png"
+
+    # Falha, gravação e acerto, nenhum na thread do loop de eventos
+    assert len(threads) == 3
+    assert running.thread not in threads
+
+
+@pytest.mark.parametrize("value", ["abc", "-5", "1.5"])
+def test_invalid_content_length(running, value):
+    request = (f"POST /route HTTP/1.1\r\nHost: localhost\r\nContent-Length: {value}\r\n\r\n"
+               '{"origin": "Natal", "destination": "Recife"}').encode("latin-1")
+
+    async def send():
+        reader, writer = await asyncio.open_connection("127.0.0.1", running.server.port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 10)
+        writer.close()
+        return response
+
+    response = asyncio.run(send())
+
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert "Content-Length inválido" in json.loads(response.split(b"\r\n\r\n", 1)[1])["error"]
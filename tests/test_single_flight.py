@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight, AsyncSingleFlight
+
+
+def wait_until(condition, timeout=5):
+    """Espera `condition()` ficar verdadeira (sem travar o teste se não ficar)"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return object()
+
+    threads = run_threads(5, lambda: results.append(flight.do("key", work)))
+    wait_until(lambda: flight.stats()["shared"] >= 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 5 and all(result is results[0] for result in results)
+    assert flight.stats() == {"executed": 1, "shared": 4, "in_flight": 0}
+
+
+def test_errors_reach_every_waiter_and_nothing_is_memoized():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def fail():
+        release.wait(5)
+        raise ValueError("falhou")
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = run_threads(3, call)
+    wait_until(lambda: flight.stats()["shared"] >= 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3 and all(error is errors[0] for error in errors)
+    # Depois do término, uma nova chamada executa de novo
+    assert flight.do("key", lambda: 42) == 42
+    assert flight.stats()["executed"] == 2
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert [flight.do(key, lambda key=key: key * 2) for key in (1, 2, 3)] == [2, 4, 6]
+    assert flight.stats()["executed"] == 3
+
+
+def test_async_single_flight_survives_cancelled_waiter():
+    async def scenario():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await release.wait()
+            return value
+
+        first = asyncio.ensure_future(flight.do("key", work, 1))
+        second = asyncio.ensure_future(flight.do("key", work, 2))
+        await asyncio.sleep(0)
+        # Quem desistiu não cancela a execução compartilhada
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == 1
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert calls == [1]
+        assert flight.stats() == {"executed": 1, "shared": 1, "in_flight": 0}
+
+    asyncio.run(scenario())
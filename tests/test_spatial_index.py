@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+import pytest
+
+from geo_coordinates import CAPITAL_COORDINATES
+from utils.spatial_index import SpatialIndex
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Haversine escalar, independente de utils.geodesy"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def brute_force(coordinates, lat, lon):
+    """[(distância, nome)] de todos os pontos, do mais próximo ao mais distante"""
+    return sorted((haversine_km(lat, lon, *coord), name) for name, coord in coordinates.items())
+
+
+def random_coordinates(count, seed, lat_range=(-90, 90), lon_range=(-180, 180)):
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(*lat_range, count)
+    lons = rng.uniform(*lon_range, count)
+    return {f"p{i}": (float(lat), float(lon)) for i, (lat, lon) in enumerate(zip(lats, lons))}
+
+
+def random_queries(count, seed):
+    rng = np.random.default_rng(seed)
+    # Metade dentro do Brasil, metade em qualquer lugar do globo
+    lats = np.concatenate([rng.uniform(-34, 5, count // 2), rng.uniform(-90, 90, count - count // 2)])
+    lons = np.concatenate([rng.uniform(-74, -34, count // 2), rng.uniform(-180, 180, count - count // 2)])
+    return lats, lons
+
+
+COORDINATE_SETS = {
+    "capitais": CAPITAL_COORDINATES,
+    "globo": random_coordinates(3000, seed=1),
+    "brasil": random_coordinates(3000, seed=2, lat_range=(-34, 5), lon_range=(-74, -34)),
+}
+
+
+@pytest.mark.parametrize("name", COORDINATE_SETS)
+@pytest.mark.parametrize("k", [1, 3, 8])
+def test_knn_matches_brute_force(name, k):
+    coordinates = COORDINATE_SETS[name]
+    index = SpatialIndex(coordinates)
+    lats, lons = random_queries(60, seed=k)
+
+    distances, indices = index.query(lats, lons, k=k)
+
+    assert distances.shape == indices.shape == (len(lats), k)
+    for lat, lon, row_distances, row_indices in zip(lats, lons, distances, indices):
+        expected = brute_force(coordinates, lat, lon)[:k]
+        assert row_distances == pytest.approx([d for d, _ in expected], abs=1e-6)
+        assert [index.names[i] for i in row_indices] == [n for _, n in expected]
+
+
+@pytest.mark.parametrize("name", COORDINATE_SETS)
+@pytest.mark.parametrize("radius_km", [0.0, 150.0, 800.0, 5000.0, 25000.0])
+def test_radius_matches_brute_force(name, radius_km):
+    coordinates = COORDINATE_SETS[name]
+    index = SpatialIndex(coordinates)
+    lats, lons = random_queries(40, seed=int(radius_km))
+
+    results = index.query_radius(lats, lons, radius_km)
+
+    assert len(results) == len(lats)
+    for lat, lon, (ids, distances) in zip(lats, lons, results):
+        # Tolerância na borda do raio para erros de arredondamento
+        expected = [(d, n) for d, n in brute_force(coordinates, lat, lon) if d <= radius_km + 1e-6]
+        found = [index.names[i] for i in ids]
+        assert set(found) >= {n for d, n in expected if d <= radius_km - 1e-6}
+        assert set(found) <= {n for _, n in expected}
+        assert list(distances) == sorted(distances)
+        for name_found, distance in zip(found, distances):
+            assert distance == pytest.approx(haversine_km(lat, lon, *coordinates[name_found]), abs=1e-6)
+
+
+def test_k_larger_than_points_returns_all():
+    coordinates = dict(list(CAPITAL_COORDINATES.items())[:4])
+    index = SpatialIndex(coordinates)
+
+    distances, indices = index.query(-15.78, -47.93, k=10)
+
+    assert distances.shape == (1, 4)
+    assert sorted(index.names[i] for i in indices[0]) == sorted(coordinates)
+
+
+def test_nearest_capital():
+    index = SpatialIndex(CAPITAL_COORDINATES)
+
+    # Um ponto a poucos quilômetros do centro de Brasília
+    name, distance = index.nearest(-15.80, -47.90)
+
+    assert name == "Brasília"
+    assert distance == pytest.approx(haversine_km(-15.80, -47.90, *CAPITAL_COORDINATES["Brasília"]), abs=1e-6)
+    assert index.nearest_names([-23.55, -3.10], [-46.63, -60.02]) == ["São Paulo", "Manaus"]
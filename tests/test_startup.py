@@ -0,0 +1,18 @@
+import pytest
+
+from check_startup import ENTRY_POINTS, forbidden_loaded, import_profile
+
+
+@pytest.mark.parametrize("module", list(ENTRY_POINTS))
+def test_entry_point_does_not_import_heavy_modules(module):
+    _, loaded = import_profile(module)
+
+    assert module in loaded
+    assert forbidden_loaded(loaded, ENTRY_POINTS[module]) == []
+
+
+def test_forbidden_loaded_matches_packages_only():
+    loaded = {"numpy", "numpy.linalg", "numpyx", "json", "utils.batch"}
+
+    assert forbidden_loaded(loaded, ()) == ["numpy", "numpy.linalg"]
+    assert forbidden_loaded(loaded, ("utils",)) == ["numpy", "numpy.linalg", "utils.batch"]
@@ -0,0 +1,66 @@
+import json
+
+import numpy as np
+import pytest
+
+from models.city import City
+from utils.shared_graph import SharedGraph
+from utils.sweep import run_sweep
+from utils.synthetic import generate_graph_arrays
+from conftest import neighbor_lists
+
+
+@pytest.fixture(scope="module")
+def shared(graph):
+    shared = SharedGraph.from_graph(graph)
+    yield shared
+    shared.close()
+
+
+def test_neighbors_keep_graph_order(graph, shared):
+    assert neighbor_lists(shared) == neighbor_lists(graph)
+    for (_, _), neighbors in neighbor_lists(shared).items():
+        assert all(isinstance(distance, int) for _, distance in neighbors)
+
+
+def test_distances_match_graph(graph, shared):
+    for city1 in graph.cities:
+        for city2 in graph.cities:
+            assert shared.get_air_distance(city1, city2) == graph.get_air_distance(city1, city2)
+            assert shared.get_land_distance(city1, city2) == graph.get_land_distance(city1, city2)
+    assert shared.get_air_distance(City("Natal"), City("Atlântida")) == float('inf')
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_sweep_matches_path_finder(graph, shared, reference_results, tmp_path, processes):
+    output = tmp_path / "sweep.jsonl"
+
+    summary = run_sweep(shared, str(output), processes=processes)
+
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert summary["rows"] == len(rows) == len(reference_results)
+    swept = {
+        (row["algorithm"], row["transport_type"], row["origin"], row["destination"]):
+            (row["path"].split(" -> ") if row["path"] else None, row["distance"], row["expanded_nodes"])
+        for row in rows
+    }
+    mismatches = [key for key, expected in reference_results.items()
+                  if swept[key] != (expected[0], expected[1] if expected[0] else None, expected[2])]
+    assert mismatches == []
+
+
+def test_published_arrays_answer_lookups():
+    names, _, adjacency = generate_graph_arrays(60, seed=3)
+    shared = SharedGraph.publish(names, adjacency)
+    try:
+        for mode in ("air", "land"):
+            indptr, indices, weights = (np.asarray(a) for a in adjacency[mode])
+            get = shared.get_air_distance if mode == "air" else shared.get_land_distance
+            for i, name in enumerate(names):
+                row = dict(zip(indices[indptr[i]:indptr[i + 1]].tolist(), weights[indptr[i]:indptr[i + 1]].tolist()))
+                neighbors = shared.get_neighbors(City(name), mode)
+                assert [(city.name, w) for city, w in neighbors] == [(names[j], w) for j, w in row.items()]
+                for j in range(0, len(names), 7):
+                    assert get(City(name), City(names[j])) == row.get(j, float('inf'))
+    finally:
+        shared.close()
@@ -0,0 +1,85 @@
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from geo_coordinates import CAPITAL_COORDINATES
+from utils.map_renderer import MapRenderer, load_map_basemap, route_legs
+from utils.vector_writer import VectorRouteWriter, route_geojson
+
+SVG = "{http://www.w3.org/2000/svg}"
+PATH = ["Porto Alegre", "São Paulo", "Brasília", "Manaus"]
+
+
+@pytest.fixture(scope="module")
+def basemap():
+    return load_map_basemap(verbose=False)
+
+
+@pytest.fixture(scope="module")
+def writer(basemap):
+    return VectorRouteWriter(basemap)
+
+
+@pytest.mark.parametrize("transport_type", ["air", "land"])
+def test_route_svg_is_valid_and_complete(writer, transport_type):
+    root = ET.fromstring(writer.route_bytes(PATH, transport_type))
+
+    assert root.tag == SVG + "svg"
+    assert (root.get("width"), root.get("height")) == ("1000", "800")
+    route = root.findall(f"{SVG}g")[-1]
+    legs = [line for line in route.iter(SVG + "polyline") if line.get("marker-end") is None]
+    arrows = [line for line in route.iter(SVG + "polyline") if line.get("marker-end")]
+    assert len(legs) == len(arrows) == len(PATH) - 1
+    assert [text.text for text in route.iter(SVG + "text")] == PATH
+    texts = [text.text for text in root.iter(SVG + "text")]
+    assert f"Rota {'Aéreo' if transport_type == 'air' else 'Terrestre'}: Porto Alegre → Manaus" in texts
+
+
+def test_route_svg_escapes_names(writer):
+    document = writer.route_svg(["Recife", "A & <B>"], "air")
+
+    root = ET.fromstring(document)
+    assert any(text.text == "Rota Aéreo: Recife → A & <B>" for text in root.iter(SVG + "text"))
+
+
+def test_projection_matches_matplotlib(basemap, writer):
+    renderer = MapRenderer(basemap=basemap, figsize=(10, 8), dpi=100)
+    renderer.render(PATH, "air")
+    ax = renderer.layer.ax
+
+    for lat, lon in CAPITAL_COORDINATES.values():
+        x, y = ax.transData.transform((lon, lat))
+        assert writer.display(lon, lat) == pytest.approx((x, y), abs=0.5)
+
+
+@pytest.mark.parametrize("transport_type", ["air", "land"])
+def test_route_geojson(transport_type):
+    collection = route_geojson(PATH + ["Atlântida"], transport_type, distance=1234)
+
+    points = [f for f in collection["features"] if f["geometry"]["type"] == "Point"]
+    lines = [f for f in collection["features"] if f["geometry"]["type"] == "LineString"]
+    assert collection["properties"] == {"origin": "Porto Alegre", "destination": "Atlântida",
+                                        "transport": transport_type, "distance": 1234}
+    assert [point["properties"]["name"] for point in points] == PATH
+    assert [point["properties"]["role"] for point in points] == ["origin", "stop", "stop", "stop"]
+    lat, lon = CAPITAL_COORDINATES["Brasília"]
+    assert points[2]["geometry"]["coordinates"] == [lon, lat]
+    assert [(line["properties"]["from"], line["properties"]["to"]) for line in lines] == list(zip(PATH, PATH[1:]))
+    assert [line["geometry"]["coordinates"] for line in lines] == [
+        [list(point) for point in leg] for leg in route_legs(PATH, transport_type)
+    ]
+
+
+def test_geojson_writer_and_save(tmp_path):
+    writer = VectorRouteWriter(output_format="geojson")
+    output = tmp_path / "rota.geojson"
+
+    assert writer.save(PATH, "land", str(output)) is False
+    assert json.loads(output.read_text(encoding="utf-8"))["type"] == "FeatureCollection"
+    assert writer.content_type == "application/geo+json"
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError, match="pdf"):
+        VectorRouteWriter(output_format="pdf")
@@ -0,0 +1,50 @@
+import main
+from models.city import City
+
+
+def test_route_via_chains_legs(path_finder):
+    result = path_finder.find_route_via("Porto Alegre", ["Brasília", "Salvador"], "Manaus", "land")
+
+    legs = [path_finder.find_path(a, b, "astar", "land")
+            for a, b in (("Porto Alegre", "Brasília"), ("Brasília", "Salvador"), ("Salvador", "Manaus"))]
+    expected = legs[0].path + legs[1].path[1:] + legs[2].path[1:]
+    assert result.path == expected
+    assert result.distance == sum(leg.distance for leg in legs)
+    assert result.expanded_nodes == sum(leg.expanded_nodes for leg in legs)
+
+
+def test_repeated_stops_and_empty_route(path_finder):
+    assert path_finder.find_route_via("Natal", ["Natal"], "Natal").path == [City("Natal")]
+    assert path_finder.find_route_via("Natal", ["Natal", "Recife", "Recife"], "Recife").path == \
+        path_finder.find_path("Natal", "Recife").path
+
+
+def test_unknown_stop_returns_none(path_finder):
+    assert path_finder.find_route_via("Natal", ["Atlântida"], "Recife") is None
+
+
+def test_cached_legs_do_not_count_expanded_nodes(path_finder):
+    first = path_finder.find_route_via("Natal", ["Recife"], "Salvador")
+    assert first.expanded_nodes > 0
+
+    # Mesmo itinerário: todos os trechos vêm do cache
+    again = path_finder.find_route_via("Natal", ["Recife"], "Salvador")
+    assert again.path == first.path
+    assert again.expanded_nodes == 0
+
+    # Só o trecho novo é buscado
+    changed = path_finder.find_route_via("Natal", ["Recife"], "Maceió")
+    assert changed.expanded_nodes == path_finder.find_path("Recife", "Maceió").expanded_nodes
+
+
+def test_leg_cache_is_bounded_lru(path_finder, monkeypatch):
+    monkeypatch.setattr(main, "MAX_CACHED_LEGS", 3)
+
+    for destination in ("Recife", "Salvador", "Maceió"):
+        path_finder.find_leg("Natal", destination)
+    # Natal -> Recife passa a ser o mais recente; Natal -> Salvador sai primeiro
+    path_finder.find_leg("Natal", "Recife")
+    path_finder.find_leg("Natal", "Aracaju")
+
+    assert len(path_finder.leg_cache) == 3
+    assert [key[1] for key in path_finder.leg_cache] == ["Maceió", "Recife", "Aracaju"]
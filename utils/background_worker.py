@@ -0,0 +1,165 @@
+import queue
+import threading
+
+# A cada quantas expansões uma busca informa o progresso
+PROGRESS_EVERY = 200
+
+
+class SearchCancelled(Exception):
+    """Levantada dentro de uma busca cujo pedido foi cancelado ou substituído"""
+
+
+class CancelToken:
+    """Sinal de cancelamento de uma busca, verificado por CancellableGraph"""
+
+    def __init__(self):
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def progress(self, message):
+        """Ponto de cancelamento; o token simples descarta o progresso"""
+        if self.cancelled:
+            raise SearchCancelled()
+
+
+class Job(CancelToken):
+    def __init__(self, generation, function, args, on_done, on_progress, on_error, results):
+        super().__init__()
+        self.generation = generation
+        self.function = function
+        self.args = args
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self._results = results
+
+    def progress(self, message):
+        """Envia uma mensagem de progresso; também é um ponto de cancelamento"""
+        super().progress(message)
+        self._results.put((self, "progress", message))
+
+
+class CancellableGraph:
+    """
+    Envolve o grafo de uma busca para que ela possa ser interrompida.
+
+    Toda expansão passa por get_neighbors, que verifica o cancelamento e
+    informa o progresso periodicamente; o resto é delegado ao grafo original.
+    `job` pode ser um Job do BackgroundWorker ou um CancelToken.
+    """
+
+    def __init__(self, graph, job):
+        self.graph = graph
+        self.job = job
+        self.expanded = 0
+
+    def get_neighbors(self, city, transport_type="air"):
+        if self.job.cancelled:
+            raise SearchCancelled()
+        self.expanded += 1
+        if self.expanded % PROGRESS_EVERY == 0:
+            self.job.progress({"expanded": self.expanded})
+        return self.graph.get_neighbors(city, transport_type)
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+
+class BackgroundWorker:
+    """
+    Executa tarefas longas em uma thread separada da interface.
+
+    Os resultados voltam por uma fila que a interface esvazia com poll()
+    (por exemplo, a partir de Tk.after), de modo que os callbacks sempre
+    rodam na thread principal. Cada submit() substitui o pedido anterior:
+    ele é cancelado e seus resultados são descartados.
+    """
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.generation = 0
+        self.current = None
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="background-worker", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self):
+        return self.current is not None
+
+    def submit(self, function, *args, on_done=None, on_progress=None, on_error=None):
+        """
+        Agenda function(job, *args). A função pode chamar job.progress()
+        e deve repassar `job` às buscas (ver CancellableGraph).
+        """
+        self.cancel()
+        job = Job(self.generation, function, args, on_done, on_progress, on_error, self.results)
+        self.current = job
+        self.jobs.put(job)
+        return job
+
+    def cancel(self):
+        """Cancela o pedido atual; resultados que ainda chegarem são descartados"""
+        if self.current is not None:
+            self.current.cancel()
+            self.current = None
+        self.generation += 1
+
+    def shutdown(self):
+        self.cancel()
+        self.jobs.put(None)
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            # Pedidos substituídos antes de começar nem são executados
+            if job.generation != self.generation:
+                self.dropped += 1
+                continue
+
+            try:
+                self.results.put((job, "done", job.function(job, *job.args)))
+            except SearchCancelled:
+                self.results.put((job, "cancelled", None))
+            except Exception as e:
+                self.results.put((job, "error", e))
+
+    def poll(self):
+        """
+        Entrega os resultados pendentes chamando os callbacks (na thread de
+        quem chama). Deve ser chamado periodicamente pela interface.
+
+        Returns:
+            bool: True se o pedido atual terminou nesta chamada
+        """
+        finished = False
+        while True:
+            try:
+                job, kind, payload = self.results.get_nowait()
+            except queue.Empty:
+                return finished
+
+            if job.generation != self.generation:
+                self.dropped += 1
+                continue
+
+            if kind == "progress":
+                if job.on_progress:
+                    job.on_progress(payload)
+                continue
+
+            self.current = None
+            finished = True
+            if kind == "done" and job.on_done:
+                job.on_done(payload)
+            elif kind == "error" and job.on_error:
+                job.on_error(payload)
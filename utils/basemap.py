@@ -0,0 +1,362 @@
+import glob
+import hashlib
+import json
+import os
+import numpy as np
+
+DEFAULT_SOURCE = "data/brazil_country.geojson"
+DEFAULT_CACHE_DIR = "data/cache"
+
+# Versão do formato do cache (faz parte do nome do arquivo)
+CACHE_VERSION = 2
+
+# Tolerâncias (em graus) dos níveis de detalhe pré-calculados; 0 é o original
+LEVEL_TOLERANCES = (0.0, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def douglas_peucker(points, tolerance):
+    """
+    Simplifica uma linha aberta pelo algoritmo de Douglas-Peucker.
+
+    Returns:
+        array booleano indicando os pontos mantidos
+    """
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        start, end = points[first], points[last]
+        segment = end - start
+        inner = points[first + 1:last] - start
+        length = np.hypot(segment[0], segment[1])
+        if length == 0:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            index = first + 1 + farthest
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return keep
+
+
+def simplify_ring(ring, tolerance):
+    """
+    Simplifica um anel fechado. O anel é dividido no vértice mais distante
+    do primeiro, e cada metade é simplificada como uma linha aberta.
+
+    Returns:
+        array (n, 2) do anel simplificado (fechado), ou None se o anel
+        ficar menor que a tolerância e puder ser descartado
+    """
+    if tolerance <= 0 or len(ring) <= 4:
+        return ring
+
+    extent = ring.max(axis=0) - ring.min(axis=0)
+    if extent.max() <= tolerance:
+        return None
+
+    split = int(np.argmax(np.hypot(*(ring - ring[0]).T)))
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[:split + 1] = douglas_peucker(ring[:split + 1], tolerance)
+    keep[split:] |= douglas_peucker(ring[split:], tolerance)
+
+    simplified = ring[keep]
+    return simplified if len(simplified) >= 4 else None
+
+
+class Basemap:
+    """
+    Contorno do mapa em arrays NumPy, sem depender do geopandas.
+
+    Todos os vértices (lon, lat) ficam em um único array `coordinates`; o
+    anel i ocupa coordinates[ring_offsets[i]:ring_offsets[i + 1]] e o
+    polígono j é formado pelos anéis polygon_offsets[j]:polygon_offsets[j + 1]
+    (o primeiro é o exterior, os demais são buracos).
+    """
+
+    def __init__(self, coordinates, ring_offsets, polygon_offsets, source_hash="", tolerance=0.0):
+        self.coordinates = coordinates
+        self.ring_offsets = ring_offsets
+        self.polygon_offsets = polygon_offsets
+        self.source_hash = source_hash
+        self.tolerance = tolerance
+        # Níveis de detalhe (Basemap simplificados), do mais fino ao mais grosso
+        self.levels = [self]
+
+    @classmethod
+    def from_polygons(cls, polygons, source_hash=""):
+        """Cria a partir de uma lista de polígonos, cada um uma lista de anéis [(lon, lat), ...]"""
+        rings = [np.asarray(ring, dtype=np.float64).reshape(-1, 2) for polygon in polygons for ring in polygon]
+        ring_offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+        ring_offsets[1:] = np.cumsum([len(ring) for ring in rings])
+        polygon_offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+        polygon_offsets[1:] = np.cumsum([len(polygon) for polygon in polygons])
+        coordinates = np.concatenate(rings) if rings else np.empty((0, 2))
+        return cls(coordinates, ring_offsets, polygon_offsets, source_hash)
+
+    @classmethod
+    def from_geojson(cls, path):
+        """Lê os Polygon/MultiPolygon de um GeoJSON (FeatureCollection, Feature ou geometria)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get("type") == "FeatureCollection":
+            geometries = [feature["geometry"] for feature in data["features"]]
+        elif data.get("type") == "Feature":
+            geometries = [data["geometry"]]
+        else:
+            geometries = [data]
+
+        polygons = []
+        for geometry in geometries:
+            if geometry is None:
+                continue
+            if geometry["type"] == "Polygon":
+                polygons.append(geometry["coordinates"])
+            elif geometry["type"] == "MultiPolygon":
+                polygons.extend(geometry["coordinates"])
+
+        # Descarta uma eventual altitude (terceira coordenada)
+        polygons = [[[point[:2] for point in ring] for ring in polygon] for polygon in polygons]
+        return cls.from_polygons(polygons, file_sha256(path))
+
+    @classmethod
+    def load(cls, cache_file):
+        with np.load(cache_file) as data:
+            source_hash = str(data["source_hash"])
+            levels = [
+                cls(
+                    data[f"level{i}_coordinates"], data[f"level{i}_ring_offsets"],
+                    data[f"level{i}_polygon_offsets"], source_hash, float(tolerance)
+                )
+                for i, tolerance in enumerate(data["tolerances"])
+            ]
+        basemap = levels[0]
+        basemap.levels = levels
+        return basemap
+
+    def save(self, cache_file):
+        # Sem compressão: o arquivo é pequeno e a leitura fica mais rápida
+        arrays = {"source_hash": np.array(self.source_hash), "tolerances": np.array([level.tolerance for level in self.levels])}
+        for i, level in enumerate(self.levels):
+            arrays[f"level{i}_coordinates"] = level.coordinates
+            arrays[f"level{i}_ring_offsets"] = level.ring_offsets
+            arrays[f"level{i}_polygon_offsets"] = level.polygon_offsets
+        np.savez(cache_file, **arrays)
+
+    def simplified(self, tolerance):
+        """Novo Basemap com cada anel simplificado por Douglas-Peucker"""
+        polygons = []
+        for first, last in zip(self.polygon_offsets[:-1], self.polygon_offsets[1:]):
+            rings = [self.coordinates[self.ring_offsets[i]:self.ring_offsets[i + 1]] for i in range(first, last)]
+            exterior = simplify_ring(rings[0], tolerance)
+            # Polígonos menores que a tolerância somem (com seus buracos)
+            if exterior is None:
+                continue
+            holes = [hole for hole in (simplify_ring(ring, tolerance) for ring in rings[1:]) if hole is not None]
+            polygons.append([exterior] + holes)
+
+        basemap = Basemap.from_polygons(polygons, self.source_hash)
+        basemap.tolerance = tolerance
+        return basemap
+
+    def build_levels(self, tolerances=LEVEL_TOLERANCES):
+        self.levels = [self] + [self.simplified(tolerance) for tolerance in tolerances if tolerance > 0]
+        return self.levels
+
+    def level_for(self, degrees_per_pixel, max_error_pixels=0.5):
+        """
+        Nível mais grosso cujo erro máximo de simplificação fica abaixo de
+        `max_error_pixels` na escala atual, ou seja, visualmente idêntico.
+        """
+        chosen = self.levels[0]
+        for level in self.levels:
+            if level.tolerance <= degrees_per_pixel * max_error_pixels:
+                chosen = level
+        return chosen
+
+    @property
+    def aspect(self):
+        """Proporção dos eixos em lon/lat (a mesma usada pelo geopandas)"""
+        _, lat_min, _, lat_max = self.bounds
+        return 1 / np.cos(np.radians((lat_min + lat_max) / 2))
+
+    @property
+    def vertex_count(self):
+        return len(self.coordinates)
+
+    @property
+    def bounds(self):
+        """(lon mínima, lat mínima, lon máxima, lat máxima)"""
+        lon_min, lat_min = self.coordinates.min(axis=0)
+        lon_max, lat_max = self.coordinates.max(axis=0)
+        return lon_min, lat_min, lon_max, lat_max
+
+    def rings(self):
+        """Lista de arrays (n, 2) com os anéis (exteriores e buracos)"""
+        return [self.coordinates[begin:end] for begin, end in zip(self.ring_offsets[:-1], self.ring_offsets[1:])]
+
+    def to_path(self):
+        """Um único matplotlib Path composto com todos os anéis (buracos incluídos)"""
+        from matplotlib.path import Path
+
+        codes = np.full(len(self.coordinates), Path.LINETO, dtype=Path.code_type)
+        codes[self.ring_offsets[:-1]] = Path.MOVETO
+        codes[self.ring_offsets[1:] - 1] = Path.CLOSEPOLY
+        return Path(self.coordinates, codes)
+
+
+def cache_path_for(source, cache_dir=DEFAULT_CACHE_DIR, source_hash=None):
+    source_hash = source_hash or file_sha256(source)
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(cache_dir, f"{name}.{source_hash[:16]}.v{CACHE_VERSION}.npz")
+
+
+def build_cache(source=DEFAULT_SOURCE, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Converte o GeoJSON para o cache binário e remove caches de versões
+    anteriores do mesmo arquivo.
+
+    Returns:
+        tuple: (Basemap, caminho do cache)
+    """
+    basemap = Basemap.from_geojson(source)
+    basemap.build_levels()
+    cache_file = cache_path_for(source, cache_dir, basemap.source_hash)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(source))[0]
+    for stale in glob.glob(os.path.join(cache_dir, f"{name}.*.npz")):
+        # Arquivos .partial.npz podem ser de outro processo gravando agora
+        if stale != cache_file and not stale.endswith(".partial.npz"):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                # Outro processo já removeu
+                pass
+
+    # Grava em um arquivo temporário (um por processo) para que um leitor
+    # nunca veja um cache pela metade
+    partial = f"{cache_file[:-len('.npz')]}.{os.getpid()}.partial.npz"
+    basemap.save(partial)
+    os.replace(partial, cache_file)
+    return basemap, cache_file
+
+
+def load_basemap(source=DEFAULT_SOURCE, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Carrega o mapa base do cache binário, criando-o se ainda não existir ou
+    se o GeoJSON de origem tiver mudado (o cache é identificado pelo SHA-256).
+
+    Returns:
+        Basemap, ou None se o arquivo de origem não existir
+    """
+    if not os.path.exists(source):
+        return None
+
+    cache_file = cache_path_for(source, cache_dir)
+    if os.path.exists(cache_file):
+        try:
+            return Basemap.load(cache_file)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Cache do mapa inválido ({e}); recriando.")
+
+    basemap, cache_file = build_cache(source, cache_dir)
+    print(f"Cache do mapa criado: {cache_file}")
+    return basemap
+
+
+def degrees_per_pixel(ax):
+    """Graus de lon/lat por pixel na escala atual dos eixos (o menor dos dois)"""
+    ax.apply_aspect()
+    (lon0, lon1), (lat0, lat1) = ax.get_xlim(), ax.get_ylim()
+    (x0, y0), (x1, y1) = ax.transData.transform([(lon0, lat0), (lon1, lat1)])
+    return min(abs(lon1 - lon0) / max(abs(x1 - x0), 1), abs(lat1 - lat0) / max(abs(y1 - y0), 1))
+
+
+def draw_basemap(ax, basemap, max_error_pixels=0.5, level=None):
+    """
+    Desenha o contorno (preenchimento + borda) no nível de detalhe mais
+    grosso que ainda é idêntico na escala atual. Os limites dos eixos devem
+    ser definidos antes. Um nível específico pode ser forçado com `level`.
+
+    Returns:
+        Basemap do nível usado
+    """
+    from matplotlib.patches import PathPatch
+    from matplotlib.collections import LineCollection
+
+    ax.set_aspect(basemap.aspect)
+    if level is None:
+        level = basemap.level_for(degrees_per_pixel(ax), max_error_pixels)
+
+    ax.add_patch(PathPatch(level.to_path(), facecolor='#E6F3FF', edgecolor='#2F4F4F', linewidth=1.2, alpha=0.8))
+    # Borda mais escura para definir melhor o país
+    ax.add_collection(LineCollection(level.rings(), colors='#1C3A3A', linewidths=2.0, alpha=0.9))
+    return level
+
+
+def benchmark_levels(basemap, figsize=(10, 8), dpi=100, repeats=5):
+    """
+    Mede o tempo de redesenho de cada nível em uma figura Agg.
+
+    Returns:
+        list de dicts com tolerância, vértices e tempo médio em ms
+    """
+    import time
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    report = []
+    for level in basemap.levels:
+        figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot(111)
+        ax.set_xlim(-73, -33)
+        ax.set_ylim(-33, 5)
+        draw_basemap(ax, basemap, level=level)
+
+        figure.canvas.draw()
+        began = time.perf_counter()
+        for _ in range(repeats):
+            figure.canvas.draw()
+        report.append({
+            "tolerance": level.tolerance,
+            "vertices": level.vertex_count,
+            "rings": len(level.ring_offsets) - 1,
+            "draw_ms": (time.perf_counter() - began) / repeats * 1000
+        })
+    return report
+
+
+if __name__ == "__main__":
+    # Pré-processamento: python -m utils.basemap [arquivo.geojson] [--report]
+    import sys
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    source = args[0] if args else DEFAULT_SOURCE
+    basemap, cache_file = build_cache(source)
+    print(f"{basemap.vertex_count} vértices em {len(basemap.ring_offsets) - 1} anéis -> {cache_file}")
+
+    if "--report" in sys.argv:
+        print(f"\n{'Tolerância (°)':>15}{'Vértices':>10}{'Anéis':>8}{'Redesenho (ms)':>16}")
+        for row in benchmark_levels(basemap):
+            print(f"{row['tolerance']:>15.3f}{row['vertices']:>10}{row['rings']:>8}{row['draw_ms']:>16.1f}")
@@ -0,0 +1,183 @@
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from models.city import City
+
+TRANSPORT_TYPES = ("air", "land")
+
+# PathFinder de cada processo trabalhador
+_path_finder = None
+
+
+def _init_worker(factory):
+    global _path_finder
+    _path_finder = factory()
+
+
+def _answer_chunk(chunk, algorithm, transport_type):
+    return [answer_query(_path_finder, query, algorithm, transport_type) for query in chunk]
+
+
+def read_queries(stream, input_format=None):
+    """
+    Lê consultas de forma incremental, uma por linha.
+
+    Aceita CSV com cabeçalho (origin,destination e, opcionalmente, algorithm,
+    transport e id) ou JSONL com os mesmos campos. Sem `input_format`, o
+    formato é detectado pela primeira linha não vazia. Linhas inválidas viram
+    consultas com o campo "error", para que apareçam na saída.
+    """
+    lines = iter(stream)
+    first = next((line for line in lines if line.strip()), None)
+    if first is None:
+        return
+
+    if input_format is None:
+        input_format = "jsonl" if first.lstrip().startswith("{") else "csv"
+
+    if input_format == "csv":
+        for row in csv.DictReader(_chain(first, lines)):
+            yield {key.strip(): value.strip() for key, value in row.items() if key and value}
+        return
+
+    for number, line in enumerate(_chain(first, lines), 1):
+        if not line.strip():
+            continue
+        try:
+            query = json.loads(line)
+            if not isinstance(query, dict):
+                raise ValueError("esperado um objeto JSON")
+            yield query
+        except ValueError as e:
+            yield {"error": f"Linha {number} inválida: {e}"}
+
+
+def _chain(first, lines):
+    yield first
+    yield from lines
+
+
+def answer_query(path_finder, query, algorithm="astar", transport_type="air"):
+    """
+    Responde uma consulta e retorna o registro de saída.
+
+    Erros (cidade desconhecida, parâmetro inválido) ficam no campo "error"
+    do registro em vez de interromper o lote.
+    """
+    record = {}
+    if "id" in query:
+        record["id"] = query["id"]
+    record["origin"] = query.get("origin")
+    record["destination"] = query.get("destination")
+    record["algorithm"] = str(query.get("algorithm") or algorithm).lower()
+    record["transport"] = query.get("transport") or transport_type
+
+    if "error" in query:
+        record["error"] = query["error"]
+        return record
+    if not record["origin"] or not record["destination"]:
+        record["error"] = "Campos 'origin' e 'destination' são obrigatórios"
+        return record
+    for key in ("origin", "destination", "transport"):
+        if not isinstance(record[key], str):
+            record["error"] = f"Campo '{key}' deve ser um texto"
+            return record
+    if record["transport"] not in TRANSPORT_TYPES:
+        record["error"] = f"Transporte '{record['transport']}' inválido"
+        return record
+    if record["algorithm"] not in path_finder.algorithms:
+        record["error"] = f"Algoritmo '{record['algorithm']}' não encontrado"
+        return record
+    unknown = [name for name in (record["origin"], record["destination"]) if City(name) not in path_finder.graph.cities]
+    if unknown:
+        record["error"] = f"Cidade(s) não encontrada(s): {', '.join(unknown)}"
+        return record
+
+    result = path_finder.find_path(record["origin"], record["destination"], record["algorithm"], record["transport"])
+    if result.path:
+        record["path"] = [city.name for city in result.path]
+        record["distance"] = result.distance
+    else:
+        record["path"] = None
+        record["distance"] = None
+    record["expanded_nodes"] = result.expanded_nodes
+    return record
+
+
+def chunks(queries, size):
+    """Divide um iterável de consultas em listas de até `size` itens, sem ler tudo antes"""
+    queries = iter(queries)
+    while True:
+        chunk = list(islice(queries, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(path_finder_factory, queries, output, algorithm="astar", transport_type="air",
+              processes=1, chunk_size=256, progress=None):
+    """
+    Responde as consultas em fluxo, gravando um registro JSONL por consulta.
+
+    A memória fica limitada: as consultas são lidas em blocos de `chunk_size`
+    e no máximo 2 * `processes` blocos ficam em andamento. A saída mantém a
+    ordem da entrada e é descarregada a cada bloco concluído.
+
+    Args:
+        path_finder_factory: Função sem argumentos que cria o PathFinder
+            (chamada uma vez em cada processo trabalhador)
+        output: Arquivo texto onde os registros são gravados
+        processes: Número de processos; 1 responde no próprio processo
+        progress: Função opcional chamada com (consultas respondidas, segundos)
+
+    Returns:
+        dict: Número de consultas, de erros e tempo total em segundos
+    """
+    began = time.perf_counter()
+    summary = {"queries": 0, "errors": 0}
+
+    def write(records):
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            summary["errors"] += "error" in record
+        output.flush()
+        summary["queries"] += len(records)
+        if progress:
+            progress(summary["queries"], time.perf_counter() - began)
+
+    if processes <= 1:
+        path_finder = path_finder_factory()
+        for chunk in chunks(queries, chunk_size):
+            write([answer_query(path_finder, query, algorithm, transport_type) for query in chunk])
+    else:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(path_finder_factory,)) as executor:
+            window = deque()
+            for chunk in chunks(queries, chunk_size):
+                if len(window) >= 2 * processes:
+                    write(window.popleft().result())
+                window.append(executor.submit(_answer_chunk, chunk, algorithm, transport_type))
+            while window:
+                write(window.popleft().result())
+
+    summary["elapsed"] = time.perf_counter() - began
+    return summary
+
+
+def open_input(path):
+    """Abre o arquivo de consultas; '-' ou None usa a entrada padrão"""
+    if path in (None, "-"):
+        return sys.stdin
+    return open(path, encoding="utf-8", newline="")
+
+
+def input_format_for(path):
+    """Formato indicado pela extensão do arquivo (None para detectar)"""
+    if path in (None, "-"):
+        return None
+    extension = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(extension)
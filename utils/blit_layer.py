@@ -0,0 +1,51 @@
+class BlitLayer:
+    """
+    Camada estática em cache com artistas dinâmicos desenhados por cima.
+
+    O fundo (tudo o que não é "animated") é rasterizado por um canvas.draw()
+    completo e guardado com copy_from_bbox. Depois, trocar os artistas
+    dinâmicos só custa restaurar esse fundo e desenhar os novos artistas
+    (blitting). Quando o canvas é redesenhado por inteiro (por exemplo, ao
+    redimensionar a janela), o fundo é capturado de novo automaticamente.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        self._connection = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        figure = self.canvas.figure
+        # Mesma ordem de um draw completo
+        for artist in sorted(self.artists, key=lambda artist: artist.get_zorder()):
+            figure.draw_artist(artist)
+
+    def set_artists(self, artists):
+        """Substitui os artistas dinâmicos (os anteriores são removidos da figura)"""
+        for artist in self.artists:
+            artist.remove()
+        for artist in artists:
+            artist.set_animated(True)
+        self.artists = list(artists)
+
+    def update(self):
+        """Redesenha apenas os artistas dinâmicos sobre o fundo em cache"""
+        if self.background is None:
+            # Primeiro uso: o draw completo dispara _on_draw
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def detach(self):
+        """Desliga a camada do canvas (a figura será limpa por quem a usa)"""
+        self.canvas.mpl_disconnect(self._connection)
+        self.background = None
+        self.artists = []
@@ -1,6 +1,3 @@
-from tabulate import tabulate
-import matplotlib.pyplot as plt
-import numpy as np
 import os
 
 class AlgorithmComparison:
@@ -13,6 +10,9 @@ class AlgorithmComparison:
         self.results[name] = results
     
     def print_table(self):
+        # Importado sob demanda: só a tabela precisa do tabulate
+        from tabulate import tabulate
+        
         algorithms = list(self.results[self.scenarios[0]].keys())
         
         for scenario in self.scenarios:
@@ -35,6 +35,10 @@ class AlgorithmComparison:
             print(tabulate(table_data, headers=headers, tablefmt="grid"))
     
     def generate_chart(self, output_dir="./output"):
+        # Importados sob demanda: carregar o matplotlib é caro e só os gráficos o usam
+        import matplotlib.pyplot as plt
+        import numpy as np
+        
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
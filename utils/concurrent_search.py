@@ -0,0 +1,171 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from utils.background_worker import CancelToken, CancellableGraph
+
+# Intervalo (s) para notar o início de buscas com prazo ainda na fila do executor
+START_POLL_INTERVAL = 0.01
+
+# Grafo somente leitura de cada processo trabalhador (enviado uma única vez)
+_worker_graph = None
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _run_search(algorithm, graph, start, goal, transport_type, token=None):
+    """Executa uma busca medindo o tempo de CPU da própria thread"""
+    graph = graph if graph is not None else _worker_graph
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    if token is not None:
+        # O prazo da busca conta a partir daqui, não de quando entrou na fila
+        token.started = wall_start
+    result = algorithm.search(graph, start, goal, transport_type)
+    return result, time.thread_time() - cpu_start, time.perf_counter() - wall_start
+
+
+class TimedResult:
+    """Resultado de uma busca executada de forma concorrente"""
+
+    def __init__(self, name, result=None, cpu_time=0.0, elapsed=0.0, status="ok", error=None):
+        self.name = name
+        self.result = result
+        self.cpu_time = cpu_time
+        self.elapsed = elapsed
+        self.status = status  # "ok", "timeout" ou "error"
+        self.error = error
+
+
+def create_executor(kind, graph, max_workers=None):
+    """
+    Cria o executor para as buscas concorrentes.
+
+    Com "thread" o grafo é compartilhado diretamente. Com "process" ele é
+    enviado uma única vez para cada trabalhador, evitando a trava global do
+    interpretador (GIL) em buscas longas.
+    """
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(graph,))
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Tipo de executor desconhecido: {kind}")
+
+
+def iter_concurrent(executor, algorithms, graph, start, goal, transport_type="air", timeout=None):
+    """
+    Executa todos os algoritmos ao mesmo tempo e produz os resultados
+    conforme eles terminam.
+
+    O prazo de cada algoritmo conta a partir do início da sua busca, não do
+    envio ao executor. Em executores de thread, a busca que estoura o prazo
+    é interrompida na próxima expansão (CancellableGraph) e libera a thread.
+    Processos não podem ser interrompidos assim: depois de um "timeout" o
+    executor de processos deve ser trocado (ver discard_executor), e o
+    início da busca é o momento em que o executor a marca como em execução.
+
+    Args:
+        executor: Executor criado por create_executor
+        algorithms: dict {nome: SearchAlgorithm}
+        graph: Grafo usado pelas buscas (ignorado por executores de processo)
+        timeout: Tempo limite em segundos, único ou dict {nome: segundos}
+
+    Yields:
+        TimedResult: Um por algoritmo, na ordem de término
+    """
+    # Executores de processo usam o grafo já enviado aos trabalhadores
+    in_process = isinstance(executor, ProcessPoolExecutor)
+    futures = {}
+    tokens = {}
+    limits = {}
+
+    for name, algorithm in algorithms.items():
+        token = None if in_process else CancelToken()
+        search_graph = None if in_process else CancellableGraph(graph, token)
+        future = executor.submit(_run_search, algorithm, search_graph, start, goal, transport_type, token)
+        futures[future] = name
+        tokens[future] = token
+        limits[future] = timeout.get(name) if isinstance(timeout, dict) else timeout
+
+    started = {}
+    pending = set(futures)
+    while pending:
+        now = time.perf_counter()
+        waiting_start = False
+        for future in pending:
+            if future in started or limits[future] is None:
+                continue
+            token = tokens[future]
+            began = getattr(token, "started", None) if token is not None else (now if future.running() else None)
+            if began is None:
+                waiting_start = True
+            else:
+                started[future] = began
+
+        # Espera até o próximo término, o prazo mais próximo ou o próximo
+        # teste de início das buscas que ainda estão na fila
+        active = [started[future] + limits[future] for future in pending if future in started]
+        wait_time = max(0.0, min(active) - now) if active else None
+        if waiting_start:
+            wait_time = START_POLL_INTERVAL if wait_time is None else min(wait_time, START_POLL_INTERVAL)
+        done, pending = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            name = futures[future]
+            try:
+                result, cpu_time, elapsed = future.result()
+                yield TimedResult(name, result, cpu_time, elapsed)
+            except Exception as e:
+                yield TimedResult(name, status="error", error=e)
+
+        # Buscas que estouraram o prazo são canceladas e abandonadas
+        now = time.perf_counter()
+        for future in list(pending):
+            if future in started and now >= started[future] + limits[future]:
+                future.cancel()
+                if tokens[future] is not None:
+                    tokens[future].cancel()
+                pending.discard(future)
+                yield TimedResult(futures[future], elapsed=now - started[future], status="timeout")
+
+
+def discard_executor(executor):
+    """
+    Encerra um executor que ficou com buscas abandonadas. Os processos de um
+    ProcessPoolExecutor são terminados, já que não há como interrompê-los de
+    outra forma; threads terminam sozinhas ao notar o cancelamento.
+    """
+    processes = []
+    if isinstance(executor, ProcessPoolExecutor):
+        # Atributo interno: não há API pública para terminar os trabalhadores
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def run_concurrent(executor, algorithms, graph, start, goal, transport_type="air", timeout=None, on_result=None):
+    """
+    Executa todos os algoritmos de forma concorrente e reúne os resultados.
+
+    Args:
+        on_result: Função opcional chamada com cada TimedResult ao término
+
+    Returns:
+        tuple: (dict {nome: TimedResult} na ordem de `algorithms`,
+        dict com "wall_time" e "cpu_time" somado, em segundos)
+    """
+    wall_start = time.perf_counter()
+    collected = {}
+
+    for timed in iter_concurrent(executor, algorithms, graph, start, goal, transport_type, timeout):
+        collected[timed.name] = timed
+        if on_result:
+            on_result(timed)
+
+    timing = {
+        "wall_time": time.perf_counter() - wall_start,
+        "cpu_time": sum(timed.cpu_time for timed in collected.values())
+    }
+    return {name: collected[name] for name in algorithms}, timing
@@ -1,52 +1,201 @@
+import glob
+import hashlib
 import json
 import os
 from models.city import City
 from models.graph import Graph
 
+# Arquivo de distâncias usado pelos pontos de entrada (JSON, CSV de arestas ou binário)
+DEFAULT_DATA_FILE = os.environ.get("ROTAS_DATA", "data/distances.json")
+# Snapshots dos grafos já montados (ver load_snapshot)
+SNAPSHOT_DIR = "data/cache"
+
 class DataLoader:
     def __init__(self):
         self.graph = Graph()
         
+    def load(self, data_file=DEFAULT_DATA_FILE, snapshot_dir=SNAPSHOT_DIR):
+        """
+        Carrega o grafo de um arquivo JSON, CSV de arestas ou binário
+        (utils/graph_formats.py); o formato é detectado pelos bytes iniciais
+        ou pela extensão. Com `snapshot_dir`, o grafo montado é reaproveitado
+        entre execuções (ver load_snapshot); None sempre lê o arquivo.
+        """
+        try:
+            if snapshot_dir is None:
+                return self.read(data_file)
+            return self.load_snapshot(data_file, snapshot_dir)
+        except Exception as e:
+            print(f"Erro ao carregar dados do arquivo {data_file}: {e}")
+            # Fallback para dados simulados
+            return self._create_mock_data()
+    
+    def read(self, data_file=DEFAULT_DATA_FILE):
+        """Como load(), mas propaga os erros em vez de usar os dados simulados"""
+        from utils.graph_formats import graph_format_for, read_edge_csv, MappedGraph
+        
+        data_format = graph_format_for(data_file)
+        if data_format == "binary":
+            self.graph = MappedGraph(data_file)
+        elif data_format == "csv":
+            capitals, matrices = read_edge_csv(data_file)
+            self.graph = self._graph_from_matrices(capitals, matrices, directed=True)
+        else:
+            with open(data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.graph = self._graph_from_matrices(data['capitals'], data['distances'])
+        return self.graph
+    
     def load_from_json(self, json_file="data/distances.json"):
         try:
             with open(json_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                
-            # Adiciona todas as capitais ao grafo
-            for capital in data['capitals']:
-                self.graph.add_city(City(capital))
-            
-            # Adiciona distâncias terrestres
-            for origin, destinations in data['distances']['land'].items():
-                for destination, distance in destinations.items():
-                    # Não adiciona distâncias para a mesma cidade
-                    if origin != destination:
-                        self.graph.add_land_distance(City(origin), City(destination), distance)
-            
-            # Se houver dados aéreos no JSON, usa eles
-            if 'air' in data['distances']:
-                for origin, destinations in data['distances']['air'].items():
-                    for destination, distance in destinations.items():
-                        if origin != destination:
-                            self.graph.add_air_distance(City(origin), City(destination), distance)
-            else:
-                # Se não houver dados aéreos, usa os mesmos valores das distâncias terrestres
-                # temporariamente (isso deve ser substituído por dados reais)
-                print("ATENÇÃO: Dados de distâncias aéreas não encontrados no JSON.")
-                print("As distâncias terrestres serão usadas como aproximação.")
-                print("Substitua isto pelos dados reais de distâncias aéreas.")
-                
-                for origin, destinations in data['distances']['land'].items():
-                    for destination, distance in destinations.items():
-                        if origin != destination:
-                            self.graph.add_air_distance(City(origin), City(destination), distance)
             
+            self.graph = self._graph_from_matrices(data['capitals'], data['distances'])
             return self.graph
         except Exception as e:
             print(f"Erro ao carregar dados do arquivo JSON {json_file}: {e}")
             # Fallback para dados simulados
             return self._create_mock_data()
     
+    def _graph_from_matrices(self, capitals, distances, directed=False):
+        land = distances['land']
+        
+        # Se houver dados aéreos, usa eles
+        air = distances.get('air')
+        if air is None:
+            # Se não houver dados aéreos, usa os mesmos valores das distâncias terrestres
+            # temporariamente (isso deve ser substituído por dados reais)
+            print("ATENÇÃO: Dados de distâncias aéreas não encontrados no arquivo.")
+            print("As distâncias terrestres serão usadas como aproximação.")
+            print("Substitua isto pelos dados reais de distâncias aéreas.")
+            air = land
+        
+        return self.build_graph(capitals, {"land": land, "air": air}, directed)
+    
+    def load_snapshot(self, data_file=DEFAULT_DATA_FILE, snapshot_dir=SNAPSHOT_DIR):
+        """
+        Grafo de `data_file` a partir do snapshot binário em `snapshot_dir`,
+        aberto por mmap, sem ler nem montar o arquivo de origem de novo.
+        
+        O snapshot é identificado pelo SHA-256 do arquivo de origem: se ele
+        mudou (ou o snapshot não existe ou está corrompido), o grafo é
+        montado e o snapshot é regravado, removendo o anterior do mesmo
+        arquivo de origem.
+        """
+        from utils.graph_formats import graph_format_for, snapshot_key, write_graph_binary, MappedGraph, BINARY_VERSION
+        
+        # Um arquivo binário já é lido por mmap
+        if graph_format_for(data_file) == "binary":
+            return self.read(data_file)
+        
+        key = snapshot_key(data_file)
+        source_id = hashlib.sha256(os.path.abspath(data_file).encode("utf-8")).hexdigest()[:8]
+        path = os.path.join(snapshot_dir, f"graph.{source_id}.{key[:16]}.v{BINARY_VERSION}.rcg")
+        if os.path.exists(path):
+            try:
+                graph = MappedGraph(path)
+                if graph.metadata.get("key") == key:
+                    self.graph = graph
+                    return graph
+                graph.close()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Snapshot do grafo inválido ({e}); recriando.")
+        
+        graph = self.read(data_file)
+        try:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            write_graph_binary(graph, path, {"key": key, "source": data_file})
+        except OSError as e:
+            print(f"Não foi possível gravar o snapshot do grafo: {e}")
+            return graph
+        # Snapshots de versões anteriores do mesmo arquivo
+        for stale in glob.glob(os.path.join(snapshot_dir, f"graph.{source_id}.*.rcg")):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+        return graph
+    
+    @staticmethod
+    def build_graph(capitals, matrices, directed=False):
+        """
+        Monta o grafo a partir das matrizes {modo: {origem: {destino: distância}}}
+        em uma única passada, sem passar por Graph.add_*_distance.
+        
+        Cada cidade é criada uma única vez (os dicionários de vizinhos usam
+        sempre o mesmo objeto City). Uma matriz completa, em que toda linha
+        lista as cidades na ordem das linhas, já é a própria adjacência: cada
+        linha é copiada de uma vez (e, fora do modo directed, os pares
+        assimétricos são igualados depois). Nas demais, cada par é gravado nos dois sentidos, como em
+        add_*_distance, e as distâncias são simétricas.
+        
+        Com directed=True (CSV de arestas), cada linha é a lista de vizinhos
+        da origem, na ordem dada, e só os pares listados em um único sentido
+        são completados no sentido inverso.
+        """
+        graph = Graph()
+        cities = {name: City(name) for name in capitals}
+        for matrix in matrices.values():
+            for origin in matrix:
+                if origin not in cities:
+                    cities[origin] = City(origin)
+        
+        for mode, matrix in matrices.items():
+            adjacency = graph.adjacency[mode]
+            origins = list(matrix)
+            
+            if all(list(row) == origins for row in matrix.values()):
+                # As chaves de toda linha são as próprias origens, na mesma ordem
+                columns = [cities[origin] for origin in origins]
+                for city, row in zip(columns, matrix.values()):
+                    neighbors = dict(zip(columns, row.values()))
+                    # Não adiciona distâncias para a mesma cidade
+                    del neighbors[city]
+                    adjacency[city] = neighbors
+                if not directed:
+                    # Em uma matriz assimétrica vale, nos dois sentidos, a distância
+                    # da linha lida por último (como em add_*_distance)
+                    for i, city in enumerate(columns):
+                        neighbors = adjacency[city]
+                        for other in columns[i + 1:]:
+                            distance = adjacency[other][city]
+                            if neighbors[other] != distance:
+                                neighbors[other] = distance
+                continue
+            
+            if directed:
+                for origin, row in matrix.items():
+                    if not row.keys() <= cities.keys():
+                        for destination in row.keys() - cities.keys():
+                            cities[destination] = City(destination)
+                    city = cities[origin]
+                    neighbors = adjacency[city] = dict(zip(map(cities.__getitem__, row), row.values()))
+                    neighbors.pop(city, None)
+                
+                # Pares listados em um só sentido (verificados pelos nomes, sem criar objetos)
+                for origin, row in matrix.items():
+                    for destination, distance in row.items():
+                        if destination != origin and origin not in matrix.get(destination, ()):
+                            adjacency.setdefault(cities[destination], {})[cities[origin]] = distance
+                continue
+            
+            for origin, row in matrix.items():
+                city = cities[origin]
+                neighbors = adjacency.setdefault(city, {})
+                for destination, distance in row.items():
+                    if destination == origin:
+                        continue
+                    other = cities.get(destination)
+                    if other is None:
+                        other = cities[destination] = City(destination)
+                    neighbors[other] = distance
+                    adjacency.setdefault(other, {})[city] = distance
+        
+        graph.cities = set(cities.values())
+        return graph
+    
     def create_air_distances_json(self):
         """
         Cria um template para adicionar distâncias aéreas.
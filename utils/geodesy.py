@@ -0,0 +1,171 @@
+"""
+Geometria de grande círculo vetorizada com NumPy.
+
+Distâncias (haversine), rumos iniciais e arcos de grande círculo são
+calculados em lote. CoordinateSet guarda, para um conjunto de coordenadas
+{nome: (lat, lon)}, os vetores unitários e as matrizes de distâncias e de
+rumos (calculadas uma vez, sob demanda); coordinate_set() reaproveita o
+mesmo objeto para o mesmo conjunto, por padrão o das capitais.
+"""
+
+import numpy as np
+from geo_coordinates import CAPITAL_COORDINATES
+
+# Raio médio da Terra (km), o mesmo usado pela fórmula de haversine
+EARTH_RADIUS_KM = 6371.0088
+
+# Comprimento máximo (km) de cada segmento dos arcos desenhados
+ARC_STEP_KM = 50.0
+
+# Conjuntos de coordenadas e arcos mantidos em memória
+MAX_COORDINATE_SETS = 8
+MAX_CACHED_ARCS = 4096
+
+
+def to_unit_vectors(lats, lons):
+    """Converte latitude/longitude (graus) em vetores unitários 3D (N, 3)"""
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lon = np.radians(np.asarray(lons, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def chord_to_km(chord):
+    """Converte a distância em corda (esfera unitária) para distância de grande círculo em km"""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+def km_to_chord(distance_km):
+    """Converte distância de grande círculo em km para distância em corda"""
+    angle = np.minimum(np.asarray(distance_km, dtype=float) / EARTH_RADIUS_KM, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Distância de grande círculo em km; os argumentos (graus) seguem o broadcasting do NumPy"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def initial_bearing(lat1, lon1, lat2, lon2):
+    """Rumo inicial (graus a partir do norte, sentido horário, 0-360) de 1 para 2"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    y = np.sin(dlon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return np.degrees(np.arctan2(y, x)) % 360
+
+
+def polyline_lengths_km(lons, lats):
+    """Comprimento de cada segmento de uma polilinha"""
+    lons, lats = np.asarray(lons, dtype=float), np.asarray(lats, dtype=float)
+    return haversine(lats[:-1], lons[:-1], lats[1:], lons[1:])
+
+
+def great_circle_arc(lat1, lon1, lat2, lon2, step_km=ARC_STEP_KM):
+    """
+    Pontos do arco de grande círculo entre duas coordenadas, com segmentos
+    de no máximo `step_km` (interpolação esférica dos vetores unitários).
+
+    Returns:
+        array (n, 2) de (lon, lat), com os extremos exatos
+    """
+    a, b = to_unit_vectors([lat1, lat2], [lon1, lon2])
+    angle = float(np.arccos(np.clip(np.dot(a, b), -1.0, 1.0)))
+    if angle < 1e-12:
+        return np.array([(lon1, lat1), (lon2, lat2)], dtype=float)
+    segments = max(1, int(np.ceil(angle * EARTH_RADIUS_KM / step_km)))
+
+    t = np.linspace(0.0, 1.0, segments + 1)[:, None]
+    points = (np.sin((1 - t) * angle) * a + np.sin(t * angle) * b) / np.sin(angle)
+    lats = np.degrees(np.arcsin(np.clip(points[:, 2], -1.0, 1.0)))
+    lons = np.degrees(np.arctan2(points[:, 1], points[:, 0]))
+    arc = np.stack([lons, lats], axis=1)
+    arc[0], arc[-1] = (lon1, lat1), (lon2, lat2)
+    return arc
+
+
+class CoordinateSet:
+    """
+    Coordenadas nomeadas com geometria pré-calculada.
+
+    Args:
+        coordinates: dict nome -> (lat, lon); a ordem define os índices
+    """
+
+    def __init__(self, coordinates):
+        self.names = list(coordinates)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        latlon = np.array([coordinates[name] for name in self.names], dtype=float).reshape(-1, 2)
+        self.lats = latlon[:, 0]
+        self.lons = latlon[:, 1]
+        self.unit_vectors = to_unit_vectors(self.lats, self.lons)
+        self._distances = None
+        self._bearings = None
+        self._arcs = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def distances(self):
+        """Matriz (N, N) de distâncias de grande círculo em km"""
+        if self._distances is None:
+            self._distances = haversine(self.lats[:, None], self.lons[:, None], self.lats[None, :], self.lons[None, :])
+        return self._distances
+
+    @property
+    def bearings(self):
+        """Matriz (N, N) de rumos iniciais de cada linha para cada coluna"""
+        if self._bearings is None:
+            self._bearings = initial_bearing(self.lats[:, None], self.lons[:, None], self.lats[None, :], self.lons[None, :])
+        return self._bearings
+
+    def distances_from(self, name):
+        """Distâncias de `name` até todos (uma linha, sem montar a matriz inteira)"""
+        if self._distances is not None:
+            return self._distances[self.index[name]]
+        i = self.index[name]
+        return haversine(self.lats[i], self.lons[i], self.lats, self.lons)
+
+    def distance(self, origin, destination):
+        return float(self.distances_from(origin)[self.index[destination]])
+
+    def bearing(self, origin, destination):
+        i, j = self.index[origin], self.index[destination]
+        if self._bearings is not None:
+            return float(self._bearings[i, j])
+        return float(initial_bearing(self.lats[i], self.lons[i], self.lats[j], self.lons[j]))
+
+    def arc(self, origin, destination, step_km=ARC_STEP_KM):
+        """Arco de grande círculo (array (n, 2) de lon, lat) entre duas cidades do conjunto"""
+        key = (origin, destination, step_km)
+        arc = self._arcs.get(key)
+        if arc is None:
+            if len(self._arcs) >= MAX_CACHED_ARCS:
+                self._arcs.clear()
+            i, j = self.index[origin], self.index[destination]
+            arc = great_circle_arc(self.lats[i], self.lons[i], self.lats[j], self.lons[j], step_km)
+            arc.setflags(write=False)
+            self._arcs[key] = arc
+        return arc
+
+
+_coordinate_sets = {}
+
+
+def coordinate_set(coordinates=None):
+    """
+    CoordinateSet compartilhado para `coordinates` (padrão: as capitais).
+    Conjuntos com os mesmos nomes e coordenadas, na mesma ordem, usam o
+    mesmo objeto e, portanto, as mesmas matrizes já calculadas.
+    """
+    coordinates = CAPITAL_COORDINATES if coordinates is None else coordinates
+    key = tuple((name, tuple(coordinates[name])) for name in coordinates)
+    found = _coordinate_sets.get(key)
+    if found is None:
+        if len(_coordinate_sets) >= MAX_COORDINATE_SETS:
+            _coordinate_sets.pop(next(iter(_coordinate_sets)))
+        found = _coordinate_sets[key] = CoordinateSet(coordinates)
+    return found
@@ -0,0 +1,336 @@
+"""
+Formatos compactos dos dados de distâncias, alternativos ao distances.json.
+
+CSV de arestas: cabeçalho mode,origin,destination,distance e uma linha por
+distância (mode é "air" ou "land"). As linhas são lidas como as linhas das
+matrizes do JSON, então cada par pode aparecer em um só sentido.
+
+Binário (.rcg): o grafo já montado, em CSR, pronto para mmap:
+
+    MAGIC (8 bytes) | tamanho do cabeçalho (uint32) | cabeçalho JSON | arrays
+
+O cabeçalho traz a tabela de cidades e, para cada modo, a posição dos
+arrays indptr (int64, len(names) + 1), indices (int32) e weights (int32 se
+todas as distâncias forem inteiras, float64 caso contrário). Os vizinhos de
+names[i] são indices[indptr[i]:indptr[i + 1]], na ordem do grafo original.
+As posições são relativas ao fim do cabeçalho (alinhado em 8 bytes), os
+valores são little-endian e cada array começa em múltiplo de 8.
+Só a biblioteca padrão é usada (a linha de comando não carrega o NumPy).
+
+MappedGraph usa o arquivo binário diretamente como grafo; é assim que são
+lidos os snapshots de DataLoader.load_snapshot.
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from models.city import City
+from models.graph import Graph
+
+MAGIC = b"RCGRAPH\x00"
+BINARY_VERSION = 2
+# Versão da montagem do grafo (DataLoader.build_graph): incremente ao mudar
+# como as distâncias viram adjacência, para invalidar os snapshots antigos
+SNAPSHOT_VERSION = 1
+TRANSPORT_TYPES = ("air", "land")
+CSV_FIELDS = ("mode", "origin", "destination", "distance")
+# Tipos aceitos para o array de distâncias (ver write_graph_binary)
+WEIGHT_TYPES = ("i", "d")
+
+# Extensão -> formato; outros arquivos são identificados pelo conteúdo
+FORMAT_EXTENSIONS = {".json": "json", ".csv": "csv", ".rcg": "binary", ".bin": "binary"}
+
+
+def graph_format_for(path):
+    """
+    Formato do arquivo de distâncias: "binary" (pelos bytes iniciais ou pela
+    extensão), "json" ou "csv" (pela extensão ou pelo primeiro caractere).
+    """
+    with open(path, 'rb') as f:
+        head = f.read(len(MAGIC))
+    if head == MAGIC:
+        return "binary"
+
+    found = FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if found is not None:
+        return found
+    return "json" if head.lstrip().startswith(b"{") else "csv"
+
+
+def _number(text):
+    """Distância do CSV: inteiro quando possível, como no JSON"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def read_edge_csv(path):
+    """
+    Returns:
+        tuple: (nomes das cidades, {modo: {origem: {destino: distância}}}),
+        no mesmo formato de data['capitals'] e data['distances'] do JSON
+    """
+    matrices = {}
+    names = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = [field.strip() for field in next(reader, [])]
+        if tuple(header) != CSV_FIELDS:
+            raise ValueError(f"cabeçalho esperado: {','.join(CSV_FIELDS)}")
+        current, neighbors = None, None
+        for number, row in enumerate(reader, 2):
+            if not row:
+                continue
+            try:
+                mode, origin, destination, distance = row
+                # Linhas da mesma origem costumam vir juntas: reaproveita o dicionário
+                if (mode, origin) != current:
+                    if mode not in TRANSPORT_TYPES:
+                        raise ValueError(f"modo desconhecido: {mode}")
+                    current = (mode, origin)
+                    neighbors = matrices.setdefault(mode, {}).setdefault(origin, {})
+                    names[origin] = None
+                neighbors[destination] = _number(distance)
+            except ValueError as e:
+                raise ValueError(f"linha {number} inválida: {e}") from None
+    # Destinos que não aparecem como origem
+    for rows in matrices.values():
+        for neighbors in rows.values():
+            names.update(dict.fromkeys(neighbors))
+    return list(names), matrices
+
+
+def write_edge_csv(graph, path):
+    """Grava as distâncias de `graph` como CSV de arestas, na ordem dos vizinhos"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        for mode in TRANSPORT_TYPES:
+            for city, neighbors in graph.adjacency[mode].items():
+                writer.writerows((mode, city.name, neighbor.name, distance)
+                                 for neighbor, distance in neighbors.items())
+
+
+def _check_byteorder():
+    if sys.byteorder != "little":
+        raise ValueError("o formato binário exige uma plataforma little-endian")
+
+
+def write_graph_binary(graph, path, metadata=None):
+    """
+    Grava `graph` no formato binário (arquivo temporário + os.replace).
+    `metadata` (dict serializável em JSON) vai para o cabeçalho.
+    """
+    _check_byteorder()
+    cities = sorted(graph.cities, key=lambda city: city.name)
+    index = {city: i for i, city in enumerate(cities)}
+
+    header = {"version": BINARY_VERSION, "names": [city.name for city in cities], "modes": {},
+              "metadata": metadata or {}}
+    arrays = []
+    # Posições relativas ao início da área de dados (logo após o cabeçalho)
+    position = 0
+    for mode in TRANSPORT_TYPES:
+        adjacency = graph.adjacency[mode]
+        indptr, indices, distances = array('q', [0]), array('i'), []
+        for city in cities:
+            neighbors = adjacency.get(city, {})
+            indices.extend(index[neighbor] for neighbor in neighbors)
+            distances.extend(neighbors.values())
+            indptr.append(len(indices))
+        integer = all(isinstance(distance, int) for distance in distances)
+        weights = array('i' if integer else 'd', distances)
+
+        info = header["modes"][mode] = {"edges": len(indices), "weights_type": weights.typecode}
+        for key, values in (("indptr", indptr), ("indices", indices), ("weights", weights)):
+            info[key] = position
+            arrays.append((position, values))
+            position = _align(position + len(values) * values.itemsize)
+
+    encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + 4 + len(encoded))
+
+    # Um nome temporário por processo: vários podem gravar o mesmo snapshot ao mesmo tempo
+    partial = f"{path}.{os.getpid()}.partial"
+    with open(partial, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(encoded)))
+        f.write(encoded)
+        for offset, values in arrays:
+            f.write(b"\x00" * (data_start + offset - f.tell()))
+            values.tofile(f)
+    os.replace(partial, path)
+
+
+def _align(position):
+    return (position + 7) // 8 * 8
+
+
+def _is_count(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+class BinaryGraph:
+    """
+    Arquivo binário aberto com mmap; os arrays são memoryviews sobre o
+    arquivo, sem cópia. Use como gerenciador de contexto (ou chame close())
+    depois de copiar o que for necessário.
+    """
+
+    def __init__(self, path):
+        _check_byteorder()
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            if self._mmap[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} não é um grafo binário")
+            start = len(MAGIC) + 4
+            if len(self._mmap) < start:
+                raise ValueError(f"{path} está truncado")
+            (size,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+            if start + size > len(self._mmap):
+                raise ValueError(f"{path} está truncado")
+            self.header = json.loads(self._mmap[start:start + size].decode("utf-8"))
+            self._data_start = _align(start + size)
+            version = self.header.get("version") if isinstance(self.header, dict) else None
+            if version != BINARY_VERSION:
+                raise ValueError(f"versão {version} do formato binário não suportada")
+            self._check_layout(path)
+        except Exception:
+            self.close()
+            raise
+        self.names = self.header["names"]
+
+    def _check_layout(self, path):
+        """
+        Confere o cabeçalho com o tamanho do arquivo: um arquivo truncado ou
+        corrompido levanta ValueError em vez de produzir arrays mais curtos.
+        """
+        header = self.header
+        names = header.get("names")
+        modes = header.get("modes")
+        if (not isinstance(names, list) or not all(isinstance(name, str) for name in names)
+                or not isinstance(modes, dict) or not all(mode in modes for mode in TRANSPORT_TYPES)):
+            raise ValueError(f"cabeçalho de {path} inválido")
+
+        for mode in TRANSPORT_TYPES:
+            info = modes[mode]
+            if not isinstance(info, dict) or info.get("weights_type") not in WEIGHT_TYPES:
+                raise ValueError(f"cabeçalho de {path} inválido no modo {mode}")
+            edges = info.get("edges")
+            for key, count, typecode in (("indptr", len(names) + 1, 'q'), ("indices", edges, 'i'),
+                                         ("weights", edges, info["weights_type"])):
+                offset = info.get(key)
+                if not _is_count(offset) or not _is_count(count):
+                    raise ValueError(f"cabeçalho de {path} inválido no modo {mode}")
+                if self._data_start + offset + count * array(typecode).itemsize > len(self._mmap):
+                    raise ValueError(f"{path} está truncado ({mode}/{key})")
+
+            # Os limites de cada linha precisam caber em indices
+            indptr = self._view(info["indptr"], len(names) + 1, 'q')
+            if indptr[0] != 0 or indptr[-1] != edges or any(indptr[i] > indptr[i + 1] for i in range(len(names))):
+                raise ValueError(f"{path} está corrompido ({mode}/indptr)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _view(self, offset, count, typecode):
+        offset += self._data_start
+        view = memoryview(self._mmap)[offset:offset + count * array(typecode).itemsize].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def csr(self, mode):
+        """(indptr, indices, weights) do modo, como memoryviews"""
+        info = self.header["modes"][mode]
+        return (
+            self._view(info["indptr"], len(self.names) + 1, 'q'),
+            self._view(info["indices"], info["edges"], 'i'),
+            self._view(info["weights"], info["edges"], info["weights_type"])
+        )
+
+    def close(self):
+        # As views precisam ser liberadas antes de fechar o mmap
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+
+def snapshot_key(path):
+    """SHA-256 do conteúdo de `path` e das versões do formato e da montagem"""
+    digest = hashlib.sha256(f"{BINARY_VERSION}:{SNAPSHOT_VERSION}:".encode("utf-8"))
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MappedGraph(Graph):
+    """
+    Graph somente leitura sobre um arquivo binário aberto por mmap.
+
+    Abrir o arquivo só lê o cabeçalho e cria as cidades; os vizinhos de cada
+    cidade são copiados do arquivo no primeiro acesso. Ao ser enviado a
+    outro processo (pickle), o grafo é reaberto a partir do mesmo arquivo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._binary = BinaryGraph(path)
+        self.metadata = self._binary.header.get("metadata", {})
+        self._city_list = [City(name) for name in self._binary.names]
+        self._index = {city: i for i, city in enumerate(self._city_list)}
+        self.cities = set(self._city_list)
+        self._csr = {mode: self._binary.csr(mode) for mode in TRANSPORT_TYPES}
+        self._rows = {mode: {} for mode in TRANSPORT_TYPES}
+        self._complete = False
+
+    def __reduce__(self):
+        return (MappedGraph, (self.path,))
+
+    def _row(self, mode, city):
+        rows = self._rows[mode]
+        row = rows.get(city)
+        if row is None:
+            i = self._index.get(city)
+            if i is None:
+                return {}
+            indptr, indices, weights = self._csr[mode]
+            begin, end = indptr[i], indptr[i + 1]
+            row = rows[city] = dict(zip(map(self._city_list.__getitem__, indices[begin:end]), weights[begin:end]))
+        return row
+
+    @property
+    def adjacency(self):
+        """Adjacência completa, como em Graph (lê as linhas que ainda faltam)"""
+        if not self._complete:
+            for mode in TRANSPORT_TYPES:
+                # Na ordem das cidades do arquivo, não na ordem de acesso
+                self._rows[mode] = {city: self._row(mode, city) for city in self._city_list}
+            self._complete = True
+        return self._rows
+
+    def get_neighbors(self, city, transport_type="air"):
+        return list(self._row("air" if transport_type == "air" else "land", city).items())
+
+    def get_air_distance(self, city1, city2):
+        return self._row("air", city1).get(city2, float('inf'))
+
+    def get_land_distance(self, city1, city2):
+        return self._row("land", city1).get(city2, float('inf'))
+
+    def close(self):
+        """Fecha o arquivo; as linhas já copiadas continuam válidas"""
+        self._csr = None
+        self._binary.close()
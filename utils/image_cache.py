@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_CACHE_DIR = "data/cache/images"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# A limpeza remove imagens até o total cair para esta fração do limite,
+# para não varrer o diretório a cada nova imagem
+EVICT_TO = 0.9
+
+# Versão do estilo dos mapas de rotas: incremente ao mudar o desenho em
+# utils/map_renderer.py para que as imagens antigas deixem de ser usadas
+ROUTE_STYLE_VERSION = 4
+
+
+def base_fingerprint(map_hash, city_names):
+    """Identifica o mapa base: contorno do país e conjunto de capitais desenhadas"""
+    digest = hashlib.sha256(str(map_hash).encode("utf-8"))
+    for name in sorted(city_names):
+        digest.update(b"\0" + name.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def route_key(path_names, transport_type, size, dpi, base, style_version=ROUTE_STYLE_VERSION):
+    """
+    Chave de conteúdo da imagem de uma rota.
+
+    Args:
+        path_names: Cidades do caminho, em ordem
+        size: (largura, altura) da imagem em pixels
+        base: Identificação do mapa base (ver base_fingerprint)
+    """
+    content = json.dumps(
+        [style_version, base, list(path_names), transport_type, [int(size[0]), int(size[1])], float(dpi)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    """
+    Cache em disco de imagens renderizadas, endereçado pelo conteúdo.
+
+    Cada imagem fica em <diretório>/<2 primeiros caracteres>/<chave>.png e é
+    gravada de forma atômica, então vários processos podem compartilhar o
+    mesmo diretório. Quando o total passa de `max_bytes`, as imagens usadas
+    há mais tempo (pela data de modificação, atualizada a cada acerto) são
+    removidas. Os contadores de acertos são do objeto (por processo).
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, extension=".png"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = {}  # chave -> (bytes, último uso)
+        self._total = 0
+        self._scan()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + self.extension)
+
+    def _scan(self):
+        """Reconstrói o índice a partir do disco (inclui o que outros processos gravaram)"""
+        entries = {}
+        if os.path.isdir(self.directory):
+            for bucket in os.scandir(self.directory):
+                if not bucket.is_dir():
+                    continue
+                for entry in os.scandir(bucket.path):
+                    if entry.name.endswith(self.extension):
+                        try:
+                            info = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        entries[entry.name[:-len(self.extension)]] = (info.st_size, info.st_mtime)
+        self._entries = entries
+        self._total = sum(size for size, _ in entries.values())
+
+    def get(self, key):
+        """Retorna o conteúdo da imagem ou None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            now = time.time()
+            os.utime(path, (now, now))
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                if key in self._entries:
+                    self._total -= self._entries.pop(key)[0]
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if key not in self._entries:
+                self._total += len(data)
+            self._entries[key] = (len(data), now)
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.partial"
+        with open(partial, "wb") as f:
+            f.write(data)
+        os.replace(partial, path)
+
+        with self._lock:
+            self.stores += 1
+            if key in self._entries:
+                self._total -= self._entries[key][0]
+            self._entries[key] = (len(data), time.time())
+            self._total += len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def get_or_create(self, key, create):
+        """
+        Returns:
+            tuple: (conteúdo, True se veio do cache); `create()` gera o conteúdo
+        """
+        data = self.get(key)
+        if data is not None:
+            return data, True
+        data = create()
+        self.put(key, data)
+        return data, False
+
+    def _evict(self):
+        # Outros processos podem ter gravado no mesmo diretório
+        self._scan()
+        for key, (size, _) in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if self._total <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            del self._entries[key]
+            self._total -= size
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes
+            }
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._entries = {}
+            self._total = 0
@@ -0,0 +1,27 @@
+"""
+Serialização JSON das respostas do servidor HTTP (server.py) e do daemon
+(route_daemon.py).
+
+Distâncias infinitas (algoritmo sem caminho) viram null: json.dumps as
+escreveria como Infinity, que não é JSON válido e é rejeitado pelos
+clientes estritos.
+"""
+
+import json
+import math
+
+
+def finite(value):
+    """Troca distâncias infinitas ou NaN por None, percorrendo dicionários e listas"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [finite(item) for item in value]
+    return value
+
+
+def dumps(value):
+    """JSON estrito (sem Infinity/NaN) de `value`"""
+    return json.dumps(finite(value), ensure_ascii=False, allow_nan=False)
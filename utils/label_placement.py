@@ -0,0 +1,215 @@
+"""
+Posicionamento de rótulos sem sobreposição.
+
+Cada rótulo tem um ponto de ancoragem e oito posições candidatas ao redor
+dele, no formato (ha, va) do matplotlib: ("left", "bottom") coloca o texto
+acima e à direita do ponto. Os rótulos são posicionados de forma gulosa, em
+ordem de prioridade, escolhendo a primeira candidata livre; as caixas já
+posicionadas e os obstáculos (trechos de rota, marcadores) ficam em uma
+grade uniforme, então cada teste só olha os itens das células vizinhas.
+
+As coordenadas são em pixels com o eixo y para cima (como no display do
+matplotlib); para SVG, inverta o y antes.
+"""
+
+# Ordem padrão das candidatas: direita, esquerda, acima, abaixo, diagonais
+CANDIDATES = (
+    ("left", "center"), ("right", "center"), ("center", "bottom"), ("center", "top"),
+    ("left", "bottom"), ("right", "bottom"), ("left", "top"), ("right", "top")
+)
+
+# Custo de cruzar um trecho de rota, em pixels² de sobreposição equivalente
+SEGMENT_COST = 400.0
+# Custo por pixel fora da área visível
+OUTSIDE_COST = 50.0
+
+class Label:
+    """
+    Args:
+        text: Texto (usado só para identificar o rótulo)
+        anchor: (x, y) do ponto rotulado, em pixels
+        size: (largura, altura) da caixa do rótulo em pixels
+        gap: (dx, dy) distância entre o ponto e a caixa
+        priority: Rótulos com prioridade maior são posicionados antes
+        preferred: (ha, va) tentado primeiro (por exemplo, um ajuste manual)
+        optional: Se True, o rótulo é omitido quando não houver posição livre
+        ignore: Obstáculos (índices de LabelPlacer.add_box) que o rótulo pode
+            cobrir, como o marcador do próprio ponto
+    """
+
+    def __init__(self, text, anchor, size, gap=(4, 4), priority=0, preferred=None, optional=False, ignore=()):
+        self.text = text
+        self.anchor = anchor
+        self.size = size
+        self.gap = gap
+        self.priority = priority
+        self.preferred = preferred
+        self.optional = optional
+        self.ignore = ignore
+
+    def box(self, ha, va):
+        """Caixa (x0, y0, x1, y1) do rótulo na posição (ha, va)"""
+        x, y = self.anchor
+        width, height = self.size
+        gap_x, gap_y = self.gap
+        if ha == "left":
+            x0 = x + gap_x
+        elif ha == "right":
+            x0 = x - gap_x - width
+        else:
+            x0 = x - width / 2
+        if va == "bottom":
+            y0 = y + gap_y
+        elif va == "top":
+            y0 = y - gap_y - height
+        else:
+            y0 = y - height / 2
+        return x0, y0, x0 + width, y0 + height
+
+    def candidates(self):
+        if self.preferred is None:
+            return CANDIDATES
+        return (self.preferred,) + tuple(c for c in CANDIDATES if c != self.preferred)
+
+
+def _segment_hits_box(p, q, box):
+    """Teste de interseção segmento x retângulo (recorte de Liang-Barsky)"""
+    (x1, y1), (x2, y2) = p, q
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for edge_p, edge_q in ((-dx, x1 - box[0]), (dx, box[2] - x1), (-dy, y1 - box[1]), (dy, box[3] - y1)):
+        if edge_p == 0:
+            if edge_q < 0:
+                return False
+            continue
+        t = edge_q / edge_p
+        if edge_p < 0:
+            if t > t1:
+                return False
+            t0 = max(t0, t)
+        else:
+            if t < t0:
+                return False
+            t1 = min(t1, t)
+    return True
+
+class LabelPlacer:
+    """
+    Índice de colisão em grade uniforme com posicionamento guloso.
+
+    Uso:
+        placer = LabelPlacer(bounds=(0, 0, largura, altura))
+        placer.add_segment(p, q, width=3)
+        placer.add_box(caixa_do_marcador)
+        posicoes = placer.place(rotulos)   # {texto: (ha, va) ou None}
+    """
+
+    def __init__(self, bounds=None, cell_size=32):
+        self.bounds = bounds
+        self.cell_size = cell_size
+        self.cells = {}      # (i, j) -> índices em self.items
+        self.items = []      # (caixa envolvente, None) ou (caixa envolvente, (p, q, meia largura))
+
+    def _cell_range(self, box):
+        size = self.cell_size
+        return (int(box[0] // size), int(box[1] // size), int(box[2] // size), int(box[3] // size))
+
+    def _insert(self, item, cells):
+        index = len(self.items)
+        self.items.append(item)
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(index)
+        return index
+
+    def add_box(self, box):
+        """Obstáculo retangular; retorna o índice usado em Label.ignore"""
+        i0, j0, i1, j1 = self._cell_range(box)
+        return self._insert((box, None), [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)])
+
+    def add_segment(self, p, q, width=0.0):
+        """Obstáculo linear (um trecho de rota desenhado com `width` pixels)"""
+        half = width / 2
+        (x1, y1), (x2, y2) = p, q
+        # Amostra o segmento a cada meia célula; todo ponto do segmento fica a
+        # no máximo um quarto de célula de uma amostra
+        steps = max(1, int(max(abs(x2 - x1), abs(y2 - y1)) / (self.cell_size / 2)))
+        reach = half + self.cell_size / 4
+        cells = set()
+        for k in range(steps + 1):
+            x = x1 + (x2 - x1) * k / steps
+            y = y1 + (y2 - y1) * k / steps
+            i0, j0, i1, j1 = self._cell_range((x - reach, y - reach, x + reach, y + reach))
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    cells.add((i, j))
+        extent = (min(x1, x2) - half, min(y1, y2) - half, max(x1, x2) + half, max(y1, y2) + half)
+        return self._insert((extent, (p, q, half)), cells)
+
+    def cost(self, box, ignore=(), limit=None):
+        """
+        Sobreposição com o que já foi posicionado, trechos cruzados e parte
+        fora da área. A soma para assim que passa de `limit`.
+        """
+        total = 0.0
+        if self.bounds is not None:
+            x0, y0, x1, y1 = self.bounds
+            outside = (max(0, x0 - box[0]) + max(0, box[2] - x1) + max(0, y0 - box[1]) + max(0, box[3] - y1))
+            total += outside * OUTSIDE_COST
+
+        b0, b1, b2, b3 = box
+        i0, j0, i1, j1 = self._cell_range(box)
+        items = self.items
+        seen = set(ignore)
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                for index in self.cells.get((i, j), ()):
+                    if index in seen:
+                        continue
+                    seen.add(index)
+                    extent, segment = items[index]
+                    if extent[0] >= b2 or extent[2] <= b0 or extent[1] >= b3 or extent[3] <= b1:
+                        continue
+                    if segment is None:
+                        total += (min(b2, extent[2]) - max(b0, extent[0])) * (min(b3, extent[3]) - max(b1, extent[1]))
+                    else:
+                        p, q, half = segment
+                        if _segment_hits_box(p, q, (b0 - half, b1 - half, b2 + half, b3 + half)):
+                            total += SEGMENT_COST
+                    if limit is not None and total > limit:
+                        return total
+        return total
+
+    def place(self, labels):
+        """
+        Posiciona os rótulos (em ordem decrescente de prioridade) e registra
+        as caixas escolhidas como obstáculos.
+
+        Returns:
+            dict: texto -> (ha, va), ou None para rótulos opcionais omitidos
+        """
+        placements = {}
+        for label in sorted(labels, key=lambda label: -label.priority):
+            best, best_cost = None, None
+            for ha, va in label.candidates():
+                box = label.box(ha, va)
+                # Rótulos opcionais só aceitam posições livres
+                cost = self.cost(box, label.ignore, 0.0 if label.optional else best_cost)
+                if best_cost is None or cost < best_cost:
+                    best, best_cost = (ha, va, box), cost
+                if cost == 0:
+                    break
+
+            if best_cost > 0 and label.optional:
+                placements[label.text] = None
+                continue
+            ha, va, box = best
+            placements[label.text] = (ha, va)
+            self.add_box(box)
+        return placements
+
+def text_size(text, fontsize_px, bold=False, pad=0.0):
+    """Tamanho estimado (largura, altura) da caixa de um rótulo, em pixels"""
+    width = len(text) * fontsize_px * (0.62 if bold else 0.58)
+    height = fontsize_px * 1.2
+    padding = 2 * pad * fontsize_px
+    return width + padding, height + padding
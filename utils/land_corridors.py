@@ -0,0 +1,367 @@
+"""
+Corredores terrestres pré-calculados para os trechos por terra.
+
+O contorno do país é rasterizado em uma grade de `resolution` graus e, para
+cada trecho terrestre do grafo, o caminho mais curto sobre a grade (8
+vizinhos; células de água muito mais caras e as da costa um pouco mais) é
+convertido em uma polilinha simplificada que continua sobre a terra. Há um Dijkstra por
+cidade de origem, que para quando todos os destinos dela foram alcançados.
+
+As polilinhas de todos os trechos ficam em um único .npz (mesmo formato de
+offsets do utils/basemap.py), identificado pelo SHA-256 do mapa, das
+coordenadas, dos trechos e dos parâmetros; se algum deles mudar, o arquivo
+é recriado na próxima carga.
+"""
+
+import glob
+import hashlib
+import heapq
+import json
+import math
+import os
+import numpy as np
+from utils.basemap import DEFAULT_CACHE_DIR
+from utils.geodesy import EARTH_RADIUS_KM, polyline_lengths_km
+
+# Versão do formato do arquivo (faz parte do nome)
+CORRIDOR_VERSION = 1
+
+DEFAULT_RESOLUTION = 0.2
+# Multiplicador do custo de atravessar uma célula de água (rios largos, baías)
+WATER_COST = 10.0
+# Multiplicador para células de terra a até COAST_CELLS células da água, para
+# que os corredores não fiquem em cima da linha da costa
+COAST_COST = 1.5
+COAST_CELLS = 2
+# Desvio máximo (em graus) da polilinha simplificada em relação ao caminho da grade
+SIMPLIFY_TOLERANCE = 0.15
+
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def rasterize(basemap, resolution=DEFAULT_RESOLUTION):
+    """
+    Máscara de terra do contorno (regra par-ímpar, buracos incluídos).
+
+    Returns:
+        tuple: (máscara booleana [linha, coluna], (lon, lat) do canto
+        inferior esquerdo da grade); a linha 0 é a mais ao sul
+    """
+    level = basemap.level_for(resolution, 0.5)
+    lon_min, lat_min, lon_max, lat_max = basemap.bounds
+    origin = (lon_min - resolution, lat_min - resolution)
+    columns = int(math.ceil((lon_max - lon_min) / resolution)) + 2
+    rows = int(math.ceil((lat_max - lat_min) / resolution)) + 2
+
+    # Todas as arestas de todos os anéis de uma vez
+    starts, ends = [], []
+    for ring in level.rings():
+        starts.append(ring)
+        ends.append(np.roll(ring, -1, axis=0))
+    start, end = np.concatenate(starts), np.concatenate(ends)
+    x1, y1, x2, y2 = start[:, 0], start[:, 1], end[:, 0], end[:, 1]
+
+    mask = np.zeros((rows, columns), dtype=bool)
+    centers = origin[0] + (np.arange(columns) + 0.5) * resolution
+    for row in range(rows):
+        y = origin[1] + (row + 0.5) * resolution
+        crossing = (y1 <= y) != (y2 <= y)
+        xs = x1[crossing] + (y - y1[crossing]) * (x2[crossing] - x1[crossing]) / (y2[crossing] - y1[crossing])
+        xs.sort()
+        for left, right in zip(xs[0::2], xs[1::2]):
+            mask[row] |= (centers >= left) & (centers < right)
+    return mask, origin
+
+
+class LandCorridors:
+    """
+    Polilinhas (lon, lat) dos trechos terrestres.
+
+    O trecho k liga names[edges[k, 0]] a names[edges[k, 1]] e seus pontos
+    são points[offsets[k]:offsets[k + 1]] (float32); o sentido inverso usa
+    os mesmos pontos invertidos. As coordenadas exatas das cidades ficam em
+    `cities` e substituem os extremos de cada polilinha.
+    """
+
+    def __init__(self, names, cities, edges, offsets, points, key=""):
+        self.names = [str(name) for name in names]
+        self.cities = cities
+        self.edges = edges
+        self.offsets = offsets
+        self.points = points
+        self.key = key
+        self._edge_index = {}
+        for k, (a, b) in enumerate(edges.tolist()):
+            self._edge_index[(self.names[a], self.names[b])] = (k, False)
+            self._edge_index[(self.names[b], self.names[a])] = (k, True)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["names"], data["cities"], data["edges"], data["offsets"], data["points"], str(data["key"]))
+
+    def save(self, path):
+        # Grava em um arquivo temporário (um por processo) para que um leitor
+        # nunca veja o arquivo pela metade
+        partial = f"{path[:-len('.npz')]}.{os.getpid()}.partial.npz"
+        np.savez(partial, names=np.array(self.names), cities=self.cities, edges=self.edges, offsets=self.offsets,
+                 points=self.points, key=np.array(self.key))
+        os.replace(partial, path)
+
+    def __len__(self):
+        return len(self.edges)
+
+    def __contains__(self, pair):
+        return tuple(pair) in self._edge_index
+
+    def leg(self, origin, destination):
+        """Array (n, 2) de (lon, lat) de origem a destino, ou None se o trecho não existir"""
+        found = self._edge_index.get((origin, destination))
+        if found is None:
+            return None
+        k, reverse = found
+        points = self.points[self.offsets[k]:self.offsets[k + 1]].astype(np.float64)
+        points[0], points[-1] = self.cities[self.edges[k, 0]], self.cities[self.edges[k, 1]]
+        return points[::-1] if reverse else points
+
+    def cumulative_km(self, origin, destination):
+        """Distância acumulada (km) em cada ponto da polilinha do trecho"""
+        points = self.leg(origin, destination)
+        if points is None:
+            return None
+        return np.concatenate(([0.0], np.cumsum(polyline_lengths_km(points[:, 0], points[:, 1]))))
+
+    def length_km(self, origin, destination):
+        cumulative = self.cumulative_km(origin, destination)
+        return None if cumulative is None else float(cumulative[-1])
+
+    def position_at(self, origin, destination, km):
+        """(lon, lat) a `km` quilômetros da origem ao longo do corredor"""
+        points = self.leg(origin, destination)
+        if points is None:
+            return None
+        cumulative = np.concatenate(([0.0], np.cumsum(polyline_lengths_km(points[:, 0], points[:, 1]))))
+        km = min(max(km, 0.0), cumulative[-1])
+        i = min(int(np.searchsorted(cumulative, km, side="right")) - 1, len(points) - 2)
+        span = cumulative[i + 1] - cumulative[i]
+        t = (km - cumulative[i]) / span if span else 0.0
+        lon, lat = points[i] + (points[i + 1] - points[i]) * t
+        return float(lon), float(lat)
+
+
+class _Grid:
+    """Grade de custo sobre a máscara de terra, em listas para o laço do Dijkstra"""
+
+    def __init__(self, mask, origin, resolution):
+        self.rows, self.columns = mask.shape
+        self.origin = origin
+        self.resolution = resolution
+        self.mask = mask
+        self.land = mask.ravel().tolist()
+
+        # Terra longe da costa: erosão da máscara por COAST_CELLS células
+        interior = mask.copy()
+        for _ in range(COAST_CELLS):
+            eroded = interior.copy()
+            eroded[1:] &= interior[:-1]
+            eroded[:-1] &= interior[1:]
+            eroded[:, 1:] &= interior[:, :-1]
+            eroded[:, :-1] &= interior[:, 1:]
+            interior = eroded
+        weight = np.where(mask, np.where(interior, 1.0, COAST_COST), WATER_COST)
+        self.weight = weight.ravel().tolist()
+
+        # Custo (km) de cada um dos 8 passos, por linha (a largura da célula depende da latitude)
+        self.steps = []
+        for row in range(self.rows):
+            lat = origin[1] + (row + 0.5) * resolution
+            dx = resolution * KM_PER_DEGREE * math.cos(math.radians(lat))
+            dy = resolution * KM_PER_DEGREE
+            diagonal = math.hypot(dx, dy)
+            self.steps.append(((0, 1, dx), (0, -1, dx), (1, 0, dy), (-1, 0, dy),
+                               (1, 1, diagonal), (1, -1, diagonal), (-1, 1, diagonal), (-1, -1, diagonal)))
+
+    def cell(self, lon, lat):
+        column = int((lon - self.origin[0]) / self.resolution)
+        row = int((lat - self.origin[1]) / self.resolution)
+        return min(max(row, 0), self.rows - 1) * self.columns + min(max(column, 0), self.columns - 1)
+
+    def center(self, index):
+        row, column = divmod(index, self.columns)
+        return (self.origin[0] + (column + 0.5) * self.resolution, self.origin[1] + (row + 0.5) * self.resolution)
+
+    def is_land(self, lon, lat):
+        column = int((lon - self.origin[0]) / self.resolution)
+        row = int((lat - self.origin[1]) / self.resolution)
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            return False
+        return self.land[row * self.columns + column]
+
+    def shortest_paths(self, source, targets):
+        """Dijkstra a partir de `source`, até todos os `targets` (índices de célula)"""
+        rows, columns, weight, steps = self.rows, self.columns, self.weight, self.steps
+        distance = {source: 0.0}
+        previous = {source: None}
+        pending = set(targets)
+        pending.discard(source)
+        done = set()
+        heap = [(0.0, source)]
+
+        while heap and pending:
+            d, index = heapq.heappop(heap)
+            if index in done:
+                continue
+            done.add(index)
+            pending.discard(index)
+
+            row, column = divmod(index, columns)
+            for d_row, d_column, step in steps[row]:
+                r, c = row + d_row, column + d_column
+                if not (0 <= r < rows and 0 <= c < columns):
+                    continue
+                neighbor = r * columns + c
+                cost = d + step * weight[neighbor]
+                if cost < distance.get(neighbor, math.inf):
+                    distance[neighbor] = cost
+                    previous[neighbor] = index
+                    heapq.heappush(heap, (cost, neighbor))
+        return previous
+
+    def segment_on_land(self, p, q):
+        """Se o segmento p-q (lon, lat) fica inteiro sobre células de terra"""
+        samples = max(1, int(math.hypot(q[0] - p[0], q[1] - p[1]) / (self.resolution / 2)))
+        return all(self.is_land(p[0] + (q[0] - p[0]) * k / samples, p[1] + (q[1] - p[1]) * k / samples)
+                   for k in range(samples + 1))
+
+
+def _simplify(points, grid, tolerance=SIMPLIFY_TOLERANCE):
+    """
+    Douglas-Peucker que só aceita um atalho se ele também ficar sobre a terra
+    (ou se o próprio caminho da grade já atravessava água naquele trecho).
+    """
+    on_land = [grid.is_land(x, y) for x, y in points]
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        (x1, y1), (x2, y2) = points[first], points[last]
+        dx, dy = x2 - x1, y2 - y1
+        norm = math.hypot(dx, dy) or 1.0
+        farthest, worst = first + 1, -1.0
+        for i in range(first + 1, last):
+            x, y = points[i]
+            deviation = abs(dy * (x - x1) - dx * (y - y1)) / norm
+            if deviation > worst:
+                farthest, worst = i, deviation
+
+        crosses_water = all(on_land[first:last + 1]) and not grid.segment_on_land(points[first], points[last])
+        if worst > tolerance or crosses_water:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def build_corridors(basemap, coordinates, edges, resolution=DEFAULT_RESOLUTION, key=""):
+    """
+    Calcula as polilinhas terrestres.
+
+    Args:
+        coordinates: dict nome -> (lat, lon)
+        edges: Pares (origem, destino); cada par não ordenado é calculado uma vez
+
+    Returns:
+        LandCorridors
+    """
+    mask, origin = rasterize(basemap, resolution)
+    grid = _Grid(mask, origin, resolution)
+
+    names = sorted({name for edge in edges for name in edge if name in coordinates})
+    index = {name: i for i, name in enumerate(names)}
+    pairs = sorted({tuple(sorted(edge)) for edge in edges
+                    if edge[0] != edge[1] and edge[0] in index and edge[1] in index})
+
+    # Agrupa por origem: um Dijkstra por cidade, até alcançar todos os seus destinos
+    by_source = {}
+    for a, b in pairs:
+        by_source.setdefault(a, []).append(b)
+
+    cells = {name: grid.cell(coordinates[name][1], coordinates[name][0]) for name in names}
+    polylines = {}
+    for source, destinations in by_source.items():
+        previous = grid.shortest_paths(cells[source], [cells[name] for name in destinations])
+        for destination in destinations:
+            chain = []
+            cell = cells[destination]
+            while cell is not None and cell in previous:
+                chain.append(cell)
+                cell = previous[cell]
+            chain.reverse()
+
+            lat1, lon1 = coordinates[source]
+            lat2, lon2 = coordinates[destination]
+            # Extremos exatos; os centros das células das cidades são substituídos
+            points = [(lon1, lat1)] + [grid.center(cell) for cell in chain[1:-1]] + [(lon2, lat2)]
+            polylines[(source, destination)] = _simplify(points, grid)
+
+    cities = np.array([(coordinates[name][1], coordinates[name][0]) for name in names], dtype=np.float64).reshape(-1, 2)
+    offsets = np.zeros(len(pairs) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(polylines[pair]) for pair in pairs])
+    points = np.array([point for pair in pairs for point in polylines[pair]], dtype=np.float32).reshape(-1, 2)
+    edge_array = np.array([(index[a], index[b]) for a, b in pairs], dtype=np.int32).reshape(-1, 2)
+    return LandCorridors(names, cities, edge_array, offsets, points, key)
+
+
+def corridor_key(basemap, coordinates, edges, resolution=DEFAULT_RESOLUTION):
+    """SHA-256 de tudo que determina as polilinhas"""
+    pairs = sorted({tuple(sorted(edge)) for edge in edges if edge[0] != edge[1]})
+    content = json.dumps([
+        CORRIDOR_VERSION, basemap.source_hash, resolution, WATER_COST, COAST_COST, COAST_CELLS, SIMPLIFY_TOLERANCE,
+        sorted((name, list(coordinates[name])) for name in {n for pair in pairs for n in pair} if name in coordinates),
+        pairs
+    ], ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def land_edges_from_json(json_file="data/distances.json"):
+    """Pares (origem, destino) com distância terrestre no arquivo de dados"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [(origin, destination) for origin, destinations in data['distances']['land'].items()
+            for destination in destinations]
+
+
+def load_corridors(basemap, coordinates, edges, resolution=DEFAULT_RESOLUTION, cache_dir=DEFAULT_CACHE_DIR,
+                   verbose=False):
+    """
+    Carrega as polilinhas do cache, calculando-as (e removendo arquivos de
+    versões anteriores) se o mapa, as coordenadas ou os trechos mudaram.
+    """
+    key = corridor_key(basemap, coordinates, edges, resolution)
+    path = os.path.join(cache_dir, f"land_corridors.{key[:16]}.v{CORRIDOR_VERSION}.npz")
+    if os.path.exists(path):
+        try:
+            corridors = LandCorridors.load(path)
+            if corridors.key == key:
+                return corridors
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Cache de corredores inválido ({e}); recriando.")
+
+    corridors = build_corridors(basemap, coordinates, edges, resolution, key)
+    os.makedirs(cache_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(cache_dir, "land_corridors.*.npz")):
+        # Arquivos .partial.npz podem ser de outro processo gravando agora
+        if stale != path and not stale.endswith(".partial.npz"):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                # Outro processo já removeu
+                pass
+    corridors.save(path)
+    if verbose:
+        print(f"Corredores terrestres criados: {path} ({len(corridors)} trechos, {len(corridors.points)} pontos)")
+    return corridors
@@ -0,0 +1,882 @@
+"""
+Desenho dos mapas de rotas, independente da interface gráfica.
+
+As funções draw_* desenham em qualquer eixo do matplotlib (a interface Tk
+usa as mesmas). MapRenderer cria uma figura Agg, sem display, com o mapa e
+as capitais desenhados uma única vez; cada rota renderizada depois só
+desenha os próprios artistas sobre esse fundo em cache.
+ComparisonLayer mostra as rotas de vários algoritmos em painéis que
+reaproveitam uma única imagem rasterizada do mapa.
+"""
+
+import io
+import threading
+from geo_coordinates import CAPITAL_COORDINATES
+from utils.basemap import Basemap, load_basemap, draw_basemap
+from utils.blit_layer import BlitLayer
+from utils.geodesy import coordinate_set
+from utils.image_cache import base_fingerprint, route_key
+from utils.land_corridors import land_edges_from_json, load_corridors
+from utils.label_placement import Label, LabelPlacer, text_size
+
+DEFAULT_MAP_SOURCE = "data/brazil_country.geojson"
+DEFAULT_DATA_FILE = "data/distances.json"
+
+# Limites (lon, lat) dos mapas
+MAP_XLIM = (-73, -33)
+MAP_YLIM = (-33, 5)
+
+# Posicionamento dos rótulos das cidades de uma rota
+ROUTE_LABEL_POSITIONS = {
+    "São Paulo": ("center", "top"),
+    "Rio de Janeiro": ("left", "bottom"),
+    "Brasília": ("center", "bottom"),
+    "Salvador": ("right", "bottom"),
+    "Manaus": ("center", "bottom"),
+    "Porto Alegre": ("center", "top"),
+    "Recife": ("left", "center"),
+    "Belém": ("center", "top"),
+    "Fortaleza": ("right", "center"),
+    "Belo Horizonte": ("right", "top"),
+    "Curitiba": ("right", "bottom"),
+    "Goiânia": ("left", "top"),
+    "Vitória": ("right", "center"),
+    "Florianópolis": ("left", "center"),
+    "Campo Grande": ("center", "bottom"),
+    "Cuiabá": ("left", "bottom"),
+    "João Pessoa": ("right", "top"),
+    "Natal": ("right", "bottom"),
+    "Aracaju": ("left", "center"),
+    "Maceió": ("left", "bottom"),
+    "Teresina": ("center", "top"),
+    "São Luís": ("right", "bottom"),
+    "Palmas": ("right", "center"),
+    "Macapá": ("center", "bottom"),
+    "Boa Vista": ("center", "bottom"),
+    "Rio Branco": ("center", "top"),
+    "Porto Velho": ("left", "center")
+}
+
+# Posicionamento dos rótulos do mapa com todas as capitais
+MAP_LABEL_POSITIONS = {
+    "São Paulo": ("right", "bottom"),
+    "Rio de Janeiro": ("right", "top"),
+    "Brasília": ("center", "bottom"),
+    "Salvador": ("right", "center"),
+    "Manaus": ("center", "bottom"),
+    "Porto Alegre": ("center", "bottom"),
+    "Recife": ("right", "center"),
+    "Belém": ("right", "bottom"),
+    "Fortaleza": ("right", "bottom"),
+    "Belo Horizonte": ("left", "bottom"),
+    "Curitiba": ("left", "bottom"),
+    "Goiânia": ("center", "bottom"),
+    "Vitória": ("right", "bottom"),
+    "Florianópolis": ("center", "bottom"),
+    "Campo Grande": ("center", "top"),
+    "Cuiabá": ("center", "top"),
+    "João Pessoa": ("left", "bottom"),
+    "Natal": ("center", "bottom"),
+    "Aracaju": ("left", "center"),
+    "Maceió": ("center", "top"),
+    "Teresina": ("center", "top"),
+    "São Luís": ("left", "bottom"),
+    "Palmas": ("right", "bottom"),
+    "Macapá": ("center", "bottom"),
+    "Boa Vista": ("left", "bottom"),
+    "Rio Branco": ("center", "bottom"),
+    "Porto Velho": ("center", "bottom")
+}
+
+# Contorno simplificado do Brasil (lat, lon), usado sem o GeoJSON
+SIMPLIFIED_BRAZIL_OUTLINE = [
+    (-33.742, -53.374), (-33.750, -53.647), (-32.392, -52.166), (-31.216, -51.320),
+    (-30.034, -51.217), (-29.358, -50.338), (-28.558, -49.571), (-27.384, -48.555),
+    (-26.330, -48.710), (-25.493, -48.301), (-24.578, -47.287), (-23.966, -46.603),
+    (-23.335, -46.574), (-22.970, -43.207), (-22.775, -42.032), (-22.057, -41.058),
+    (-21.046, -40.920), (-18.348, -39.467), (-16.697, -39.167), (-15.253, -38.954),
+    (-14.234, -38.808), (-12.946, -38.839), (-11.851, -37.317), (-10.478, -36.579),
+    (-9.511, -35.128), (-8.533, -35.096), (-7.588, -35.377), (-7.122, -34.834),
+    (-6.295, -35.036), (-5.195, -36.523), (-4.553, -37.288), (-3.239, -38.613),
+    (-2.243, -40.051), (-1.349, -42.000), (-0.947, -44.644), (-0.159, -46.594),
+    (0.040, -48.973), (0.728, -50.454), (1.689, -51.140), (2.813, -51.643),
+    (4.307, -52.684), (5.266, -54.624), (4.281, -55.969), (2.329, -56.778),
+    (1.626, -58.925), (2.021, -59.748), (3.416, -60.048), (4.776, -60.733),
+    (5.210, -61.849), (4.060, -63.370), (3.780, -64.547), (4.583, -67.868),
+    (2.347, -68.880), (1.176, -69.803), (-0.703, -70.093), (-2.564, -70.160),
+    (-4.229, -69.906), (-6.298, -70.039), (-7.345, -72.017), (-9.032, -73.236),
+    (-10.305, -72.248), (-10.846, -70.992), (-11.525, -69.455), (-11.773, -67.467),
+    (-12.870, -65.746), (-14.535, -64.548), (-15.867, -63.196), (-16.582, -60.584),
+    (-17.738, -59.313), (-19.407, -57.870), (-21.948, -57.130), (-23.798, -57.777),
+    (-25.166, -57.636), (-26.171, -57.847), (-27.378, -58.427), (-28.877, -57.881),
+    (-30.174, -57.182), (-30.741, -55.919), (-31.585, -55.611), (-32.619, -55.797),
+    (-33.253, -54.625), (-33.742, -53.374)
+]
+
+# Contorno ainda mais grosso, desenhado se o mapa base falhar
+FALLBACK_OUTLINE = [
+    (-33.8, -53.2), (-33.7, -53.5), (-32.0, -52.0), (-29.3, -49.7),
+    (-25.3, -48.0), (-22.9, -43.2), (-22.5, -41.9), (-21.0, -40.9),
+    (-18.3, -39.7), (-15.5, -38.9), (-12.9, -38.5), (-11.5, -37.4),
+    (-9.5, -35.5), (-7.1, -34.8), (-5.8, -35.2), (-4.8, -37.1),
+    (-2.5, -40.4), (-1.5, -43.3), (-1.1, -44.5), (-0.1, -49.9),
+    (-0.2, -50.4), (1.3, -50.0), (3.9, -51.8), (4.5, -51.9),
+    (4.0, -52.6), (2.8, -52.6), (3.1, -54.6), (2.5, -55.9),
+    (2.0, -56.0), (2.8, -57.9), (2.4, -60.0), (4.4, -61.8),
+    (3.7, -67.1), (1.3, -69.6), (-2.3, -69.9), (-4.2, -69.9),
+    (-7.1, -73.0), (-9.4, -72.5), (-9.2, -70.8), (-11.1, -68.8),
+    (-10.9, -66.0), (-12.4, -63.1), (-12.6, -60.0), (-15.0, -59.9),
+    (-18.0, -58.4), (-20.5, -58.0), (-22.0, -57.8), (-23.4, -58.2),
+    (-25.5, -57.7), (-27.1, -58.4), (-30.2, -57.3), (-30.5, -56.0),
+    (-31.3, -55.9), (-32.9, -56.8), (-33.5, -53.5), (-33.8, -53.2)
+]
+
+
+def simplified_brazil_basemap():
+    """Contorno simplificado do Brasil caso o GeoJSON não esteja disponível"""
+    # Inverte as coordenadas para (longitude, latitude)
+    coords = [(lon, lat) for lat, lon in SIMPLIFIED_BRAZIL_OUTLINE]
+    return Basemap.from_polygons([[coords]])
+
+
+def load_map_basemap(source=DEFAULT_MAP_SOURCE, verbose=True):
+    """
+    Carrega o contorno do Brasil a partir do cache binário (.npz), que é
+    criado a partir do GeoJSON na primeira execução. Usa o contorno
+    simplificado se o arquivo não puder ser lido.
+    """
+    try:
+        basemap = load_basemap(source)
+        if basemap is not None and basemap.vertex_count:
+            if verbose:
+                print(f"Mapa carregado com sucesso! Contém {basemap.vertex_count} vértices")
+            return basemap
+    except Exception as e:
+        print(f"Erro ao carregar o mapa do Brasil: {e}")
+
+    return simplified_brazil_basemap()
+
+
+def create_land_route(lat1, lon1, lat2, lon2):
+    """Cria uma rota terrestre que evita passar pelo mar"""
+    # Pontos de controle para roteamento terrestre inteligente
+    # Baseado na geografia do Brasil para evitar oceano
+
+    # Se a rota é principalmente norte-sul (mesma região)
+    if abs(lon2 - lon1) < 3:  # Mesma região longitudinal
+        return [(lon1, lat1), (lon2, lat2)]
+
+    # Se a rota é leste-oeste, usa pontos intermediários terrestres
+    elif abs(lat2 - lat1) < 3:  # Mesma região latitudinal
+        # Encontra um ponto intermediário no interior
+        mid_lat = (lat1 + lat2) / 2
+        interior_lon = min(lon1, lon2) + abs(lon2 - lon1) * 0.3  # Mais para o interior
+        return [(lon1, lat1), (interior_lon, mid_lat), (lon2, lat2)]
+
+    # Para rotas diagonais longas, usa roteamento por regiões
+    else:
+        # Determina se passa pelo interior (Brasília como hub)
+        if "Brasília" in CAPITAL_COORDINATES:
+            brasilia_lat, brasilia_lon = CAPITAL_COORDINATES["Brasília"]
+        else:
+            brasilia_lat, brasilia_lon = -15.7975, -47.8919
+
+        # Se uma das cidades é muito ao norte ou nordeste
+        if (lat1 > -10 or lat2 > -10) and (lon1 > -45 or lon2 > -45):
+            # Rota pelo interior passando por região central
+            return [(lon1, lat1), (brasilia_lon, brasilia_lat), (lon2, lat2)]
+
+        # Para outras rotas, ponto intermediário no interior
+        mid_lat = (lat1 + lat2) / 2
+        mid_lon = (lon1 + lon2) / 2
+        # Ajusta para o interior se estiver muito próximo da costa
+        if mid_lon > -42:  # Muito próximo da costa leste
+            mid_lon = -45  # Move para o interior
+
+        return [(lon1, lat1), (mid_lon, mid_lat), (lon2, lat2)]
+
+
+def calculate_best_legend_position(path_names):
+    """Calcula a melhor posição para a legenda baseada nas cidades da rota"""
+    # Obtem coordenadas de todas as cidades da rota
+    route_coords = []
+    for name in path_names:
+        if name in CAPITAL_COORDINATES:
+            lat, lon = CAPITAL_COORDINATES[name]
+            route_coords.append((lon, lat))
+
+    if not route_coords:
+        return 'lower right'  # fallback padrão
+
+    # Calcula centro da rota
+    center_lon = sum(coord[0] for coord in route_coords) / len(route_coords)
+    center_lat = sum(coord[1] for coord in route_coords) / len(route_coords)
+
+    # Calcula em que região do mapa a rota está concentrada
+    rel_lon = (center_lon - MAP_XLIM[0]) / (MAP_XLIM[1] - MAP_XLIM[0])
+    rel_lat = (center_lat - MAP_YLIM[0]) / (MAP_YLIM[1] - MAP_YLIM[0])
+
+    # Escolhe posição da legenda baseada na posição da rota
+    if rel_lon > 0.6:  # Rota à direita
+        if rel_lat > 0.6:  # Parte superior direita
+            return 'lower left'
+        else:  # Parte inferior direita
+            return 'upper left'
+    else:  # Rota à esquerda ou centro
+        if rel_lat > 0.6:  # Parte superior
+            return 'lower right'
+        else:  # Parte inferior
+            return 'upper right'
+
+
+_land_corridors = None
+_land_corridors_lock = threading.Lock()
+
+
+def land_corridors(json_file=DEFAULT_DATA_FILE):
+    """
+    Corredores terrestres dos trechos do arquivo de dados (utils/land_corridors.py),
+    calculados na primeira chamada se o cache não existir. None se não for
+    possível calculá-los; nesse caso as rotas usam create_land_route.
+    """
+    global _land_corridors
+    with _land_corridors_lock:
+        if _land_corridors is None:
+            try:
+                edges = land_edges_from_json(json_file)
+                _land_corridors = load_corridors(load_map_basemap(verbose=False), CAPITAL_COORDINATES, edges, verbose=True)
+            except (OSError, KeyError, ValueError) as e:
+                print(f"Corredores terrestres indisponíveis ({e}); usando rotas aproximadas.")
+                _land_corridors = False
+        return _land_corridors or None
+
+
+def route_legs(path_names, transport_type):
+    """
+    Polilinhas (lon, lat) de cada trecho desenhado da rota: arcos de grande
+    círculo para o transporte aéreo e corredores terrestres para o terrestre
+    """
+    corridors = land_corridors() if transport_type != "air" else None
+    geometry = coordinate_set()
+    legs = []
+    for origin, destination in zip(path_names, path_names[1:]):
+        if origin not in CAPITAL_COORDINATES or destination not in CAPITAL_COORDINATES:
+            continue
+        lat1, lon1 = CAPITAL_COORDINATES[origin]
+        lat2, lon2 = CAPITAL_COORDINATES[destination]
+        if transport_type == "air":
+            legs.append([tuple(point) for point in geometry.arc(origin, destination).tolist()])
+        else:
+            leg = corridors.leg(origin, destination) if corridors is not None else None
+            if leg is None:
+                legs.append(create_land_route(lat1, lon1, lat2, lon2))
+            else:
+                # Os pontos são float32 no arquivo: arredonda o ruído da conversão
+                legs.append([(round(lon, 5), round(lat, 5)) for lon, lat in leg.tolist()])
+    return legs
+
+
+def label_offsets(ha, va, offset_x, offset_y):
+    """Deslocamento (lon, lat) do texto em relação ao ponto para o alinhamento (ha, va)"""
+    dx = offset_x if ha == "left" else (-offset_x if ha == "right" else 0)
+    dy = offset_y if va == "bottom" else (-offset_y if va == "top" else 0)
+    return dx, dy
+
+
+def _pixels_per_degree(to_pixels):
+    (x0, y0), (x1, y1) = to_pixels(0, 0), to_pixels(1, 1)
+    return abs(x1 - x0), abs(y1 - y0)
+
+
+def place_route_labels(path_names, transport_type, to_pixels, bounds, pt=100 / 72):
+    """
+    Escolhe o alinhamento (ha, va) do rótulo de cada cidade da rota, evitando
+    os trechos, os marcadores e os outros rótulos. As posições de
+    ROUTE_LABEL_POSITIONS são tentadas primeiro.
+
+    Args:
+        to_pixels: Função (lon, lat) -> (x, y) em pixels, com y para cima
+        bounds: (x0, y0, x1, y1) da área visível em pixels
+        pt: Pixels por ponto tipográfico
+
+    Returns:
+        dict: nome -> (ha, va)
+    """
+    placer = LabelPlacer(bounds)
+    for leg in route_legs(path_names, transport_type):
+        points = [to_pixels(lon, lat) for lon, lat in leg]
+        for p, q in zip(points, points[1:]):
+            placer.add_segment(p, q, 3 * pt)
+
+    per_degree_x, per_degree_y = _pixels_per_degree(to_pixels)
+    labels = []
+    for i, name in enumerate(path_names):
+        if name not in CAPITAL_COORDINATES:
+            continue
+        lat, lon = CAPITAL_COORDINATES[name]
+        x, y = to_pixels(lon, lat)
+        endpoint = i == 0 or i == len(path_names) - 1
+        marker, fontsize, pad, shift = (14, 11, 0.4, 1.0) if endpoint else (11, 9, 0.3, 0.7)
+        radius = marker / 2 * pt
+        own_marker = placer.add_box((x - radius, y - radius, x + radius, y + radius))
+
+        padding = pad * fontsize * pt
+        labels.append(Label(
+            name, (x, y), text_size(name, fontsize * pt, endpoint, pad),
+            gap=(max(0.4 * shift * per_degree_x - padding, 0), max(0.4 * shift * per_degree_y - padding, 0)),
+            priority=2 if endpoint else 1, preferred=ROUTE_LABEL_POSITIONS.get(name), ignore=(own_marker,)
+        ))
+    return placer.place(labels)
+
+
+def place_map_labels(city_names, to_pixels, bounds, pt=100 / 72):
+    """Alinhamento (ha, va) dos nomes no mapa com todas as capitais"""
+    placer = LabelPlacer(bounds)
+    per_degree_x, per_degree_y = _pixels_per_degree(to_pixels)
+    labels = []
+    for name in city_names:
+        if name not in CAPITAL_COORDINATES:
+            continue
+        lat, lon = CAPITAL_COORDINATES[name]
+        x, y = to_pixels(lon, lat)
+        radius = 4 * pt
+        own_marker = placer.add_box((x - radius, y - radius, x + radius, y + radius))
+
+        padding = 0.2 * 8 * pt
+        labels.append(Label(
+            name, (x, y), text_size(name, 8 * pt, pad=0.2),
+            gap=(max(0.6 * per_degree_x - padding, 0), max(0.4 * per_degree_y - padding, 0)),
+            preferred=MAP_LABEL_POSITIONS.get(name), ignore=(own_marker,)
+        ))
+    return placer.place(labels)
+
+
+def _axes_pixels(ax):
+    """to_pixels e limites em pixels de um eixo já com limites e proporção definidos"""
+    ax.apply_aspect()
+    transform = ax.transData.transform
+    return (lambda lon, lat: tuple(transform((lon, lat)))), tuple(ax.bbox.extents)
+
+
+def draw_brazil_map(ax, basemap):
+    """Desenha o contorno do Brasil com o zoom e o fundo dos mapas de rotas"""
+    try:
+        # Limita o mapa ao Brasil com zoom aproximado
+        ax.set_xlim(*MAP_XLIM)
+        ax.set_ylim(*MAP_YLIM)
+
+        # Desenha o mapa do Brasil no nível de detalhe adequado ao tamanho da figura
+        draw_basemap(ax, basemap)
+
+        # Remove eixos de coordenadas
+        ax.set_axis_off()
+
+        # Adiciona um fundo oceânico sutil
+        ax.set_facecolor('#F0F8FF')
+
+    except Exception as e:
+        print(f"Erro ao desenhar mapa do Brasil: {e}")
+        # Fallback: desenha um contorno simplificado
+        draw_brazil_outline(ax)
+
+
+def draw_brazil_outline(ax):
+    """Contorno simplificado do Brasil (apenas para fallback)"""
+    brazil_x = [point[1] for point in FALLBACK_OUTLINE]
+    brazil_y = [point[0] for point in FALLBACK_OUTLINE]
+
+    # Plota o contorno do Brasil
+    ax.fill(brazil_x, brazil_y, color='lightblue', alpha=0.5)
+    ax.plot(brazil_x, brazil_y, 'k-', linewidth=1, alpha=0.7)
+
+    # Configura os limites do mapa com zoom aproximado
+    ax.set_xlim(*MAP_XLIM)
+    ax.set_ylim(*MAP_YLIM)
+
+    # Remove eixos de coordenadas
+    ax.set_axis_off()
+
+
+def draw_capital_dots(ax, city_names):
+    """Plota as capitais com um tamanho pequeno (fundo dos mapas de rotas)"""
+    known = set(city_names)
+    for city_name, (lat, lon) in CAPITAL_COORDINATES.items():
+        if city_name in known:
+            ax.plot(lon, lat, 'o', markersize=3, color='#708090', alpha=0.6,
+                    markeredgecolor='white', markeredgewidth=0.5)
+
+
+def draw_route(ax, path_names, transport_type):
+    """
+    Desenha uma rota (marcadores, rótulos, trechos, setas, título e legenda)
+    sobre um mapa já desenhado em `ax`.
+
+    Args:
+        path_names: Nomes das cidades do caminho, da origem ao destino
+        transport_type: "air" ou "land"
+    """
+    from matplotlib.lines import Line2D
+
+    # Rótulos posicionados sem sobrepor trechos, marcadores e outros rótulos
+    to_pixels, bounds = _axes_pixels(ax)
+    positions = place_route_labels(path_names, transport_type, to_pixels, bounds, ax.figure.dpi / 72)
+
+    # Plota as cidades no caminho com tamanho maior e cores destacadas
+    for i, name in enumerate(path_names):
+        if name in CAPITAL_COORDINATES:
+            lat, lon = CAPITAL_COORDINATES[name]
+
+            ha, va = positions[name]
+            offset_x, offset_y = label_offsets(ha, va, 0.4, 0.4)
+
+            if i == 0:  # Origem
+                ax.plot(lon, lat, 'o', markersize=14, color='#228B22', alpha=0.9,
+                        markeredgecolor='white', markeredgewidth=2)
+                ax.annotate(name, (lon + offset_x, lat + offset_y),
+                            fontsize=11, ha=ha, va=va, weight='bold',
+                            bbox=dict(boxstyle="round,pad=0.4", facecolor='#90EE90',
+                                      alpha=0.95, edgecolor='#228B22', linewidth=2))
+            elif i == len(path_names) - 1:  # Destino
+                ax.plot(lon, lat, 'o', markersize=14, color='#DC143C', alpha=0.9,
+                        markeredgecolor='white', markeredgewidth=2)
+                ax.annotate(name, (lon + offset_x, lat + offset_y),
+                            fontsize=11, ha=ha, va=va, weight='bold',
+                            bbox=dict(boxstyle="round,pad=0.4", facecolor='#FFB6C1',
+                                      alpha=0.95, edgecolor='#DC143C', linewidth=2))
+            else:  # Cidades intermediárias
+                ax.plot(lon, lat, 'o', markersize=11, color='#4169E1', alpha=0.9,
+                        markeredgecolor='white', markeredgewidth=1.5)
+                ax.annotate(name, (lon + offset_x*0.7, lat + offset_y*0.7),
+                            fontsize=9, ha=ha, va=va,
+                            bbox=dict(boxstyle="round,pad=0.3", facecolor='#ADD8E6',
+                                      alpha=0.9, edgecolor='#4169E1', linewidth=1))
+
+    # Plota as conexões do caminho
+    for route_points in route_legs(path_names, transport_type):
+        # Estilo da linha com base no tipo de transporte
+        if transport_type == "air":
+            # Para transporte aéreo, arco de grande círculo
+            lons, lats = zip(*route_points)
+            ax.plot(lons, lats, '-', linewidth=3, color='#4169E1',
+                    alpha=0.8, solid_capstyle='round')
+            # Adiciona seta do meio do arco até o destino para indicar direção
+            middle = len(route_points) // 2
+            ax.plot(lons[middle:], lats[middle:], '-', linewidth=2, color='#4169E1')
+            ax.annotate('', xy=route_points[-1], xytext=route_points[-2],
+                        arrowprops=dict(arrowstyle='->', color='#4169E1', lw=2))
+        else:
+            # Para transporte terrestre, desenha a rota com múltiplos segmentos se necessário
+            for j in range(len(route_points) - 1):
+                x1, y1 = route_points[j]
+                x2, y2 = route_points[j + 1]
+                ax.plot([x1, x2], [y1, y2], '-', linewidth=3, color='#8B4513',
+                        alpha=0.8, solid_capstyle='round')
+
+            # Adiciona seta no final da rota, do penúltimo para o último ponto
+            pen_x, pen_y = route_points[-2]
+            last_x, last_y = route_points[-1]
+            ax.annotate('', xy=(last_x, last_y), xytext=(pen_x, pen_y),
+                        arrowprops=dict(arrowstyle='->', color='#8B4513', lw=2))
+
+    # Adiciona título com melhor formatação
+    transport_name = "Aéreo" if transport_type == "air" else "Terrestre"
+    # (texto próprio em vez de set_title, para poder ser trocado a cada rota)
+    ax.annotate(f"Rota {transport_name}: {path_names[0]} → {path_names[-1]}",
+                xy=(0.5, 1), xycoords='axes fraction', xytext=(0, 20),
+                textcoords='offset points', ha='center', va='baseline',
+                fontsize=14, fontweight='bold')
+
+    # Calcula posição inteligente da legenda para evitar sobreposição
+    legend_position = calculate_best_legend_position(path_names)
+
+    # Adiciona legenda melhorada com posicionamento inteligente
+    legend_elements = [
+        Line2D([0], [0], marker='o', color='w', markerfacecolor='#228B22',
+               markersize=10, label='Origem', markeredgecolor='white', markeredgewidth=2),
+        Line2D([0], [0], marker='o', color='w', markerfacecolor='#DC143C',
+               markersize=10, label='Destino', markeredgecolor='white', markeredgewidth=2),
+        Line2D([0], [0], marker='o', color='w', markerfacecolor='#4169E1',
+               markersize=8, label='Parada', markeredgecolor='white', markeredgewidth=1),
+        Line2D([0], [0], color='#4169E1' if transport_type == "air" else '#8B4513',
+               linewidth=3, label=f'Rota {transport_name}')
+    ]
+
+    # Posiciona a legenda de forma inteligente
+    ax.legend(handles=legend_elements, loc=legend_position, fontsize=9,
+              framealpha=0.95, shadow=True, fancybox=True,
+              borderpad=0.8, columnspacing=1, handlelength=1.5)
+
+
+def draw_capitals_map(ax, basemap, city_names):
+    """Desenha o mapa com todas as capitais do grafo e seus nomes"""
+    draw_brazil_map(ax, basemap)
+
+    known = set(city_names)
+    # Nomes posicionados sem sobreposição (os ajustes manuais são tentados primeiro)
+    to_pixels, bounds = _axes_pixels(ax)
+    positions = place_map_labels([name for name in CAPITAL_COORDINATES if name in known],
+                                 to_pixels, bounds, ax.figure.dpi / 72)
+
+    # Plota todas as capitais com estilo melhorado
+    for city_name, (lat, lon) in CAPITAL_COORDINATES.items():
+        if city_name in known:
+            ax.plot(lon, lat, 'o', markersize=8, color='#1E90FF', alpha=0.9,
+                    markeredgecolor='white', markeredgewidth=1.5)
+
+            # Ajusta offset baseado na posição com espaçamento maior
+            ha, va = positions[city_name]
+            offset_x, offset_y = label_offsets(ha, va, 0.6, 0.4)
+
+            ax.annotate(city_name, (lon + offset_x, lat + offset_y),
+                        fontsize=8, ha=ha, va=va,
+                        bbox=dict(boxstyle="round,pad=0.2", facecolor='white',
+                                  alpha=0.9, edgecolor='#1E90FF', linewidth=0.5))
+
+    # Adiciona título com melhor formatação
+    ax.set_title("Mapa do Brasil - Capitais dos Estados", fontsize=14,
+                 fontweight='bold', pad=20)
+
+    # Adiciona informação sobre o número de capitais (posição ajustada para o zoom)
+    num_capitals = len([name for name in CAPITAL_COORDINATES.keys() if name in known])
+    ax.text(-72, -30, f"Total: {num_capitals} capitais", fontsize=10,
+            bbox=dict(boxstyle="round,pad=0.3", facecolor='lightgray', alpha=0.8))
+
+
+def encode_png(rgba, dpi=100):
+    from matplotlib.image import imsave
+
+    output = io.BytesIO()
+    imsave(output, rgba, format="png", dpi=dpi)
+    return output.getvalue()
+
+
+def decode_png(data):
+    """PNG -> array RGBA uint8"""
+    import numpy as np
+    from PIL import Image
+
+    return np.asarray(Image.open(io.BytesIO(data)).convert("RGBA"))
+
+
+class RouteLayer:
+    """
+    Mapa base (contorno e capitais) desenhado uma vez em `figure`, com as
+    rotas em uma camada dinâmica redesenhada por blitting.
+
+    Com um ImageCache, cada quadro de rota desenhado é guardado (em uma
+    thread, para não atrasar a interface) e uma rota repetida do mesmo
+    tamanho é copiada do cache direto para o canvas, sem criar os artistas
+    nem posicionar os rótulos; eles só são criados se o canvas for
+    redesenhado por inteiro enquanto essa rota estiver na tela.
+    """
+
+    def __init__(self, figure, canvas, basemap, city_names, cache=None):
+        self.figure = figure
+        self.canvas = canvas
+        self.cache = cache
+        self.base_id = base_fingerprint(basemap.source_hash, city_names)
+        self.pending = None  # (caminho, transporte) exibido do cache, ainda sem artistas
+        figure.clear()
+        self.ax = figure.add_subplot(111)
+        draw_brazil_map(self.ax, basemap)
+        draw_capital_dots(self.ax, city_names)
+        # Conectado antes da BlitLayer: os artistas pendentes precisam existir
+        # quando ela capturar o fundo e redesenhar a camada dinâmica
+        self._connection = canvas.mpl_connect("draw_event", self._on_draw)
+        self.blit = BlitLayer(canvas)
+
+    @property
+    def size(self):
+        """(largura, altura) da figura em pixels"""
+        width, height = self.figure.bbox.size
+        return int(round(width)), int(round(height))
+
+    def cache_key(self, path_names, transport_type):
+        return route_key(path_names, transport_type, self.size, self.figure.dpi, self.base_id)
+
+    def show_route(self, path_names, transport_type):
+        """Troca a rota exibida, redesenhando só os artistas da rota"""
+        # Remove a rota anterior antes de criar a nova (a legenda é única por eixo)
+        self.blit.set_artists([])
+        self.pending = None
+
+        # Antes do primeiro desenho completo não há o que substituir no canvas
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(path_names, transport_type)
+            if self.blit.background is not None:
+                data = self.cache.get(key)
+                if data is not None and self._paste(decode_png(data)):
+                    self.pending = (list(path_names), transport_type)
+                    return
+
+        self._draw_route(path_names, transport_type)
+        self.blit.update()
+        if key is None:
+            return
+
+        import numpy as np
+        frame = np.array(self.canvas.buffer_rgba())
+        threading.Thread(target=self._store, args=(key, frame), daemon=True).start()
+
+    def _draw_route(self, path_names, transport_type):
+        # Artistas criados a partir daqui formam a camada dinâmica
+        previous = set(self.ax.get_children())
+        draw_route(self.ax, path_names, transport_type)
+        self.blit.set_artists([artist for artist in self.ax.get_children() if artist not in previous])
+
+    def _on_draw(self, event):
+        # Um redesenho completo apaga a imagem colada do cache
+        if self.pending is not None:
+            path_names, transport_type = self.pending
+            self.pending = None
+            self._draw_route(path_names, transport_type)
+
+    def _paste(self, frame):
+        import numpy as np
+
+        buffer = np.asarray(self.canvas.buffer_rgba())
+        if buffer.shape != frame.shape:
+            return False
+        buffer[...] = frame
+        self.canvas.blit(self.figure.bbox)
+        return True
+
+    def _store(self, key, frame):
+        try:
+            self.cache.put(key, encode_png(frame, self.figure.dpi))
+        except OSError as e:
+            print(f"Erro ao gravar imagem no cache: {e}")
+
+    def detach(self):
+        self.canvas.mpl_disconnect(self._connection)
+        self.pending = None
+        self.blit.detach()
+
+
+def rasterize_map(basemap, city_names, size, dpi=100):
+    """
+    Mapa base (contorno e capitais) rasterizado uma vez em uma imagem RGBA
+    de `size` = (largura, altura) pixels, com os limites MAP_XLIM/MAP_YLIM
+    ocupando a imagem inteira.
+    """
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    width, height = size
+    figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_axes([0, 0, 1, 1])
+    draw_brazil_map(ax, basemap)
+    # A proporção já está no tamanho pedido; o eixo não deve encolher
+    ax.set_aspect('auto')
+    draw_capital_dots(ax, city_names)
+    canvas.draw()
+    return np.array(canvas.buffer_rgba())
+
+
+class ComparisonLayer:
+    """
+    Rotas de vários algoritmos lado a lado (pequenos múltiplos), uma por
+    painel de uma grade com duas linhas; o último painel traz a legenda.
+
+    O contorno do país é rasterizado uma única vez e a mesma imagem é
+    exibida em todos os painéis. Nomes dos algoritmos e legenda ficam no
+    fundo em cache; as linhas, os marcadores e os textos de cada painel são
+    criados uma vez e só recebem novos dados a cada comparação (blitting).
+
+    Args:
+        names: Nomes dos algoritmos, na ordem dos painéis
+    """
+
+    def __init__(self, figure, canvas, basemap, city_names, names):
+        import math
+        from matplotlib.lines import Line2D
+
+        self.figure = figure
+        self.canvas = canvas
+        self.basemap = basemap
+        self.city_names = city_names
+        self.names = list(names)
+        figure.clear()
+
+        columns = math.ceil((len(self.names) + 1) / 2)
+        self.axes = []
+        artists = []
+        self.panels = {}
+        for i, name in enumerate(self.names):
+            ax = figure.add_subplot(2, columns, i + 1)
+            ax.set_xlim(*MAP_XLIM)
+            ax.set_ylim(*MAP_YLIM)
+            ax.set_aspect(basemap.aspect)
+            ax.set_axis_off()
+            ax.set_title(name, fontsize=10, fontweight='bold', pad=16)
+            # Trechos em uma única linha (separados por NaN) e marcadores agrupados por tipo
+            panel = {
+                "route": ax.plot([], [], '-', linewidth=2, alpha=0.8, solid_capstyle='round')[0],
+                "stops": ax.plot([], [], 'o', markersize=5, color='#4169E1',
+                                 markeredgecolor='white', markeredgewidth=0.8)[0],
+                "origin": ax.plot([], [], 'o', markersize=8, color='#228B22',
+                                  markeredgecolor='white', markeredgewidth=1.2)[0],
+                "destination": ax.plot([], [], 'o', markersize=8, color='#DC143C',
+                                       markeredgecolor='white', markeredgewidth=1.2)[0],
+                "summary": ax.text(0.5, 1.01, "", transform=ax.transAxes, ha='center', va='bottom', fontsize=9)
+            }
+            self.panels[name] = panel
+            self.axes.append(ax)
+            artists.extend(panel.values())
+
+        legend_ax = figure.add_subplot(2, columns, len(self.names) + 1)
+        legend_ax.set_axis_off()
+        legend_ax.legend(handles=[
+            Line2D([0], [0], marker='o', color='w', markerfacecolor='#228B22', markersize=8, label='Origem'),
+            Line2D([0], [0], marker='o', color='w', markerfacecolor='#DC143C', markersize=8, label='Destino'),
+            Line2D([0], [0], marker='o', color='w', markerfacecolor='#4169E1', markersize=6, label='Parada'),
+            Line2D([0], [0], color='#4169E1', linewidth=2, label='Rota Aérea'),
+            Line2D([0], [0], color='#8B4513', linewidth=2, label='Rota Terrestre')
+        ], loc='center', fontsize=9, title="Em verde: menor distância", title_fontsize=9)
+        self.title = legend_ax.text(0.5, 0.85, "", transform=legend_ax.transAxes, ha='center',
+                                    fontsize=11, fontweight='bold')
+        artists.append(self.title)
+
+        self.base_size = None
+        self.images = []
+        self._refresh_base()
+        self.blit = BlitLayer(canvas)
+        self.blit.set_artists(artists)
+
+    def _panel_size(self):
+        """(largura, altura) em pixels da área do mapa em cada painel"""
+        ax = self.axes[0]
+        ax.apply_aspect()
+        box = ax.get_position()
+        width, height = self.figure.bbox.size
+        return max(1, int(round(box.width * width))), max(1, int(round(box.height * height)))
+
+    def _refresh_base(self):
+        """Rasteriza o mapa base de novo só se o tamanho dos painéis mudou"""
+        size = self._panel_size()
+        if size == self.base_size:
+            return False
+        self.base_size = size
+        image = rasterize_map(self.basemap, self.city_names, size, self.figure.dpi)
+        if not self.images:
+            extent = (MAP_XLIM[0], MAP_XLIM[1], MAP_YLIM[0], MAP_YLIM[1])
+            self.images = [ax.imshow(image, extent=extent, aspect=self.basemap.aspect,
+                                     interpolation='nearest', zorder=0) for ax in self.axes]
+        else:
+            for artist in self.images:
+                artist.set_data(image)
+        return True
+
+    def show(self, routes, transport_type):
+        """
+        Args:
+            routes: dict algoritmo -> (nomes do caminho ou None, distância, nós expandidos)
+            transport_type: "air" ou "land"
+        """
+        # Janela redimensionada: nova imagem base e redesenho completo
+        if self._refresh_base():
+            self.blit.background = None
+
+        found = [distance for path_names, distance, _ in routes.values() if path_names]
+        best_distance = min(found) if found else None
+        color = '#4169E1' if transport_type == "air" else '#8B4513'
+
+        self.title.set_text("")
+        for name, panel in self.panels.items():
+            path_names, distance, expanded_nodes = routes.get(name, (None, None, 0))
+            self._set_route(panel, path_names or [], transport_type, color)
+            if path_names:
+                optimal = distance == best_distance
+                panel["summary"].set_text(f"{distance} km · {expanded_nodes} nós")
+                transport_name = "Aérea" if transport_type == "air" else "Terrestre"
+                self.title.set_text(f"Rota {transport_name}:\n{path_names[0]} → {path_names[-1]}")
+            else:
+                optimal = False
+                panel["summary"].set_text("Nenhum caminho encontrado")
+            panel["summary"].set_color('#228B22' if optimal else 'black')
+            panel["summary"].set_fontweight('bold' if optimal else 'normal')
+
+        self.blit.update()
+
+    def _set_route(self, panel, path_names, transport_type, color):
+        lons, lats = [], []
+        for points in route_legs(path_names, transport_type):
+            lons.extend(point[0] for point in points)
+            lats.extend(point[1] for point in points)
+            lons.append(float('nan'))
+            lats.append(float('nan'))
+        panel["route"].set_data(lons, lats)
+        panel["route"].set_color(color)
+
+        known = [CAPITAL_COORDINATES[name] for name in path_names if name in CAPITAL_COORDINATES]
+        stops = known[1:-1]
+        panel["stops"].set_data([lon for _, lon in stops], [lat for lat, _ in stops])
+        for key, points in (("origin", known[:1]), ("destination", known[-1:])):
+            panel[key].set_data([lon for _, lon in points], [lat for lat, _ in points])
+
+    def detach(self):
+        self.blit.detach()
+
+
+class MapRenderer:
+    """
+    Renderizador de rotas sem interface gráfica (backend Agg).
+
+    A figura com o mapa base é preparada uma vez; render() só desenha a rota
+    sobre o fundo em cache, então o mesmo objeto deve ser reutilizado para
+    muitas rotas (por exemplo, um por processo em render_routes). Com um
+    ImageCache, png_bytes() devolve rotas já renderizadas sem desenhar.
+    """
+
+    def __init__(self, basemap=None, city_names=None, figsize=(10, 8), dpi=100, cache=None):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        if basemap is None:
+            basemap = load_map_basemap(verbose=False)
+        if city_names is None:
+            city_names = list(CAPITAL_COORDINATES)
+
+        self.dpi = dpi
+        self.cache = cache
+        self.extension = ".png"
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.layer = RouteLayer(self.figure, self.canvas, basemap, city_names)
+
+    def render(self, path_names, transport_type="air"):
+        """
+        Returns:
+            numpy.ndarray: imagem RGBA (altura x largura x 4, uint8) da rota
+        """
+        import numpy as np
+
+        self.layer.show_route(path_names, transport_type)
+        return np.array(self.canvas.buffer_rgba())
+
+    def png_bytes(self, path_names, transport_type="air"):
+        """
+        Returns:
+            tuple: (PNG da rota, True se veio do cache)
+        """
+        def create():
+            return encode_png(self.render(path_names, transport_type), self.dpi)
+
+        if self.cache is None:
+            return create(), False
+        return self.cache.get_or_create(self.layer.cache_key(path_names, transport_type), create)
+
+    def save(self, path_names, transport_type, output):
+        """
+        Grava a rota como PNG no arquivo `output`.
+
+        Returns:
+            bool: True se a imagem veio do cache
+        """
+        data, cached = self.png_bytes(path_names, transport_type)
+        with open(output, "wb") as f:
+            f.write(data)
+        return cached
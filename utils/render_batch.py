@@ -0,0 +1,146 @@
+import json
+import os
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from utils.batch import answer_query, chunks
+
+# Estado de cada processo trabalhador: PathFinder e figura com o mapa pronto
+_path_finder = None
+_renderer = None
+
+
+def _init_worker(path_finder_factory, figsize, dpi, cache_options, output_format="png"):
+    global _path_finder, _renderer
+
+    _path_finder = path_finder_factory()
+    city_names = [city.name for city in _path_finder.graph.cities]
+    if output_format == "png":
+        from utils.map_renderer import MapRenderer
+        from utils.image_cache import ImageCache
+
+        cache = ImageCache(**cache_options) if cache_options is not None else None
+        _renderer = MapRenderer(city_names=city_names, figsize=figsize, dpi=dpi, cache=cache)
+    else:
+        # SVG e GeoJSON são gerados como texto, sem matplotlib
+        from utils.vector_writer import VectorRouteWriter
+
+        _renderer = VectorRouteWriter(city_names=city_names, width=round(figsize[0] * dpi),
+                                      height=round(figsize[1] * dpi), dpi=dpi, output_format=output_format)
+
+
+def _render_chunk(chunk, output_dir, algorithm, transport_type):
+    return [render_query(_path_finder, _renderer, query, output_dir, algorithm, transport_type) for query in chunk]
+
+
+def slugify(text):
+    """'São Paulo' -> 'sao-paulo' (nomes de arquivo portáveis)"""
+    ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return "-".join("".join(c if c.isalnum() else " " for c in ascii_text.lower()).split())
+
+
+def image_name(record, extension=".png"):
+    """
+    Nome do arquivo de uma consulta: [id_]origem_destino_transporte_algoritmo.png.
+    O algoritmo faz parte do nome porque rotas do mesmo par com algoritmos
+    diferentes podem ter caminhos diferentes.
+    """
+    parts = [slugify(record["origin"]), slugify(record["destination"]), record["transport"], record["algorithm"]]
+    if "id" in record:
+        parts.insert(0, slugify(str(record["id"])))
+    return "_".join(parts) + extension
+
+
+def all_pairs_queries(city_names, transport_types=("air",)):
+    """Uma consulta para cada par origem-destino distinto"""
+    for transport_type in transport_types:
+        for origin in city_names:
+            for destination in city_names:
+                if origin != destination:
+                    yield {"origin": origin, "destination": destination, "transport": transport_type}
+
+
+def render_query(path_finder, renderer, query, output_dir, algorithm="astar", transport_type="air"):
+    """
+    Responde a consulta e grava o mapa da rota em `output_dir`.
+
+    Returns:
+        dict: registro de answer_query com os campos "image" (None sem
+        caminho) e "cached" (imagem copiada do cache)
+    """
+    record = answer_query(path_finder, query, algorithm, transport_type)
+    if "error" in record:
+        return record
+
+    record["image"] = None
+    if record["path"]:
+        name = image_name(record, renderer.extension)
+        record["cached"] = renderer.save(record["path"], record["transport"], os.path.join(output_dir, name))
+        record["image"] = name
+    return record
+
+
+def render_routes(path_finder_factory, queries, output_dir, manifest, algorithm="astar", transport_type="air",
+                  processes=None, chunk_size=16, figsize=(10, 8), dpi=100, cache_options=None, progress=None,
+                  output_format="png"):
+    """
+    Renderiza um mapa (PNG, SVG ou GeoJSON) por consulta em um Pool de processos.
+
+    Cada processo cria seu PathFinder e uma única figura Agg com o mapa base
+    já desenhado, reutilizada para todas as rotas que ele renderiza. No
+    máximo 2 * `processes` blocos de consultas ficam em andamento. Rotas já
+    renderizadas com o mesmo tamanho e estilo são copiadas do cache de imagens.
+
+    Args:
+        path_finder_factory: Função sem argumentos que cria o PathFinder
+        manifest: Arquivo texto onde é gravado um registro JSONL por consulta
+        processes: Número de processos (padrão: núcleos disponíveis); 1
+            renderiza no próprio processo
+        cache_options: Argumentos do ImageCache de cada processo (diretório,
+            max_bytes); None desliga o cache
+        progress: Função opcional chamada com (consultas concluídas, segundos)
+        output_format: "png" (matplotlib), "svg" ou "geojson" (utils.vector_writer)
+
+    Returns:
+        dict: Número de consultas, de imagens (e quantas vieram do cache),
+        de erros e tempo total em segundos
+    """
+    from utils.map_renderer import land_corridors, load_map_basemap
+
+    began = time.perf_counter()
+    summary = {"queries": 0, "images": 0, "cached": 0, "errors": 0}
+    processes = processes or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    # Cria o cache do mapa (e dos corredores terrestres) antes que os processos tentem criá-lo ao mesmo tempo
+    load_map_basemap(verbose=False)
+    land_corridors()
+
+    def write(records):
+        for record in records:
+            manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            summary["errors"] += "error" in record
+            summary["images"] += bool(record.get("image"))
+            summary["cached"] += bool(record.get("cached"))
+        manifest.flush()
+        summary["queries"] += len(records)
+        if progress:
+            progress(summary["queries"], time.perf_counter() - began)
+
+    if processes <= 1:
+        _init_worker(path_finder_factory, figsize, dpi, cache_options, output_format)
+        for chunk in chunks(queries, chunk_size):
+            write(_render_chunk(chunk, output_dir, algorithm, transport_type))
+    else:
+        with ProcessPoolExecutor(processes, initializer=_init_worker,
+                                 initargs=(path_finder_factory, figsize, dpi, cache_options, output_format)) as executor:
+            window = deque()
+            for chunk in chunks(queries, chunk_size):
+                if len(window) >= 2 * processes:
+                    write(window.popleft().result())
+                window.append(executor.submit(_render_chunk, chunk, output_dir, algorithm, transport_type))
+            while window:
+                write(window.popleft().result())
+
+    summary["elapsed"] = time.perf_counter() - began
+    return summary
@@ -0,0 +1,154 @@
+import numpy as np
+from multiprocessing import shared_memory
+from models.city import City
+
+TRANSPORT_TYPES = ("air", "land")
+
+
+class SharedGraph:
+    """
+    Grafo somente leitura em formato CSR publicado em memória compartilhada.
+
+    O processo principal publica os arrays uma única vez; os trabalhadores se
+    conectam pelo manifesto (nome do bloco e posição de cada array), sem que o
+    grafo seja serializado para cada um. Implementa a mesma interface de
+    leitura de Graph usada pelos algoritmos de busca.
+    """
+
+    def __init__(self, manifest, shm, owner=False):
+        self.manifest = manifest
+        self._shm = shm
+        self._owner = owner
+
+        arrays = {
+            key: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for key, (dtype, shape, offset) in manifest["arrays"].items()
+        }
+        self._arrays = arrays
+
+        # Nomes das cidades: bytes UTF-8 concatenados mais deslocamentos
+        blob = arrays["names"].tobytes()
+        offsets = arrays["name_offsets"].tolist()
+        self.names = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+        self.city_list = [City(name) for name in self.names]
+        self.index = {city: i for i, city in enumerate(self.city_list)}
+        self.cities = set(self.city_list)
+
+        self.adjacency = {
+            mode: (arrays[f"{mode}_indptr"], arrays[f"{mode}_indices"], arrays[f"{mode}_weights"])
+            for mode in TRANSPORT_TYPES
+        }
+        # Cópia de cada linha ordenada pelo índice do vizinho, para as
+        # consultas de distância (busca binária) sem alterar a ordem acima
+        self.lookup = {
+            mode: (arrays[f"{mode}_sorted_indices"], arrays[f"{mode}_sorted_weights"])
+            for mode in TRANSPORT_TYPES
+        }
+
+    @classmethod
+    def publish(cls, names, adjacency):
+        """
+        Copia o grafo para um novo bloco de memória compartilhada.
+
+        Args:
+            names: Lista com o nome de cada cidade (índice = identificador)
+            adjacency: dict {modo: (indptr, indices, weights)} em CSR; a
+                ordem dos vizinhos de cada linha é a ordem de get_neighbors
+        """
+        encoded = [name.encode("utf-8") for name in names]
+        arrays = {
+            "names": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            "name_offsets": np.concatenate([[0], np.cumsum([len(e) for e in encoded])]).astype(np.int64),
+        }
+        for mode in TRANSPORT_TYPES:
+            indptr, indices, weights = adjacency[mode]
+            indptr = np.asarray(indptr, dtype=np.int64)
+            indices = np.asarray(indices, dtype=np.int32)
+            weights = np.asarray(weights)
+            # Distâncias inteiras continuam inteiras, como no Graph
+            weights = weights.astype(np.int64 if weights.dtype.kind in "iu" else np.float64)
+            rows = np.repeat(np.arange(len(names)), np.diff(indptr))
+            order = np.lexsort((indices, rows))
+            arrays[f"{mode}_indptr"] = indptr
+            arrays[f"{mode}_indices"] = indices
+            arrays[f"{mode}_weights"] = weights
+            arrays[f"{mode}_sorted_indices"] = indices[order]
+            arrays[f"{mode}_sorted_weights"] = weights[order]
+
+        # Posiciona os arrays no bloco, alinhados em 8 bytes
+        layout = {}
+        size = 0
+        for key, array in arrays.items():
+            layout[key] = (array.dtype.str, array.shape, size)
+            size += (array.nbytes + 7) // 8 * 8
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for key, array in arrays.items():
+            dtype, shape, offset = layout[key]
+            np.ndarray(shape, dtype=array.dtype, buffer=shm.buf, offset=offset)[...] = array
+
+        return cls({"name": shm.name, "arrays": layout}, shm, owner=True)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Publica um Graph carregado pelo DataLoader"""
+        names = sorted(city.name for city in graph.cities)
+        index = {name: i for i, name in enumerate(names)}
+        adjacency = {}
+
+        for mode in TRANSPORT_TYPES:
+            rows = [[] for _ in names]
+            for city, neighbors in graph.adjacency[mode].items():
+                rows[index[city.name]] = [(index[neighbor.name], distance) for neighbor, distance in neighbors.items()]
+
+            indptr = np.zeros(len(names) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(row) for row in rows])
+            pairs = [pair for row in rows for pair in row]
+            indices = np.array([j for j, _ in pairs], dtype=np.int32)
+            distances = [d for _, d in pairs]
+            integer = all(isinstance(d, int) for d in distances)
+            weights = np.array(distances, dtype=np.int64 if integer else np.float64)
+            adjacency[mode] = (indptr, indices, weights)
+
+        return cls.publish(names, adjacency)
+
+    @classmethod
+    def attach(cls, manifest):
+        """Conecta-se a um grafo já publicado (usado pelos trabalhadores)"""
+        return cls(manifest, shared_memory.SharedMemory(name=manifest["name"]))
+
+    def close(self):
+        # Libera as views antes de fechar o bloco
+        self._arrays = self.adjacency = self.lookup = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __len__(self):
+        return len(self.names)
+
+    def get_neighbors(self, city, transport_type="air"):
+        indptr, indices, weights = self.adjacency["air" if transport_type == "air" else "land"]
+        i = self.index[city]
+        begin, end = indptr[i], indptr[i + 1]
+        cities = self.city_list
+        return [(cities[j], w) for j, w in zip(indices[begin:end].tolist(), weights[begin:end].tolist())]
+
+    def _distance(self, mode, city1, city2):
+        i, j = self.index.get(city1), self.index.get(city2)
+        if i is None or j is None:
+            return float('inf')
+
+        indptr = self.adjacency[mode][0]
+        indices, weights = self.lookup[mode]
+        begin, end = indptr[i], indptr[i + 1]
+        pos = begin + np.searchsorted(indices[begin:end], j)
+        if pos < end and indices[pos] == j:
+            return weights[pos].item()
+        return float('inf')
+
+    def get_air_distance(self, city1, city2):
+        return self._distance("air", city1, city2)
+
+    def get_land_distance(self, city1, city2):
+        return self._distance("land", city1, city2)
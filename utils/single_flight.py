@@ -0,0 +1,94 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce chamadas idênticas e simultâneas feitas a partir de threads.
+
+    A primeira chamada para uma chave executa a função; as que chegam
+    enquanto ela está em andamento esperam e recebem o mesmo resultado (ou a
+    mesma exceção). Nada é memorizado após o término: uma nova chamada
+    executa a função novamente.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, function, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    Equivalente de SingleFlight para corrotinas asyncio.
+
+    A execução roda em uma tarefa própria, então o cancelamento de um dos
+    interessados (por exemplo, um cliente que desconectou) não afeta os demais.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key, coroutine_function, *args, **kwargs):
+        # Importado aqui para que o uso com threads não carregue o asyncio
+        import asyncio
+        
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coroutine_function(*args, **kwargs))
+            self._tasks[key] = task
+            task.add_done_callback(lambda finished: self._finish(key, finished))
+            self.executed += 1
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Evita o aviso de exceção não observada se todos cancelaram a espera
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._tasks)}
@@ -0,0 +1,263 @@
+import numpy as np
+from utils.geodesy import chord_to_km, coordinate_set, km_to_chord, to_unit_vectors
+
+
+class SpatialIndex:
+    """
+    Índice espacial em grade sobre os vetores unitários das coordenadas.
+
+    A distância em corda entre vetores unitários é monotônica em relação à
+    distância de grande círculo, então as consultas são exatas (equivalentes
+    a haversine). Todas as consultas aceitam lotes de pontos e são
+    vetorizadas com NumPy, sem laços Python por ponto.
+    """
+
+    # Quantidade média de pontos desejada por célula da grade
+    POINTS_PER_CELL = 4
+    # Células finas por eixo em cada bloco do nível grosso
+    BLOCK = 8
+    # Número máximo de consultas processadas de uma vez (limita a memória)
+    CHUNK_SIZE = 4096
+
+    def __init__(self, coordinates=None):
+        # Vetores unitários compartilhados com as outras consultas geométricas
+        geometry = coordinate_set(coordinates)
+        self.names = geometry.names
+        self.points = geometry.unit_vectors
+
+        # Área aproximada ocupada pelos pontos: produto das duas maiores
+        # extensões do envelope 3D (limitado à área da esfera, 4π)
+        count = max(len(self.names), 1)
+        if len(self.names) > 1:
+            extents = np.sort(np.ptp(self.points, axis=0))
+            self.area = float(np.clip(extents[1] * extents[2], 1e-12, 4 * np.pi))
+        else:
+            self.area = 4 * np.pi
+
+        # Lado da célula para ter aproximadamente POINTS_PER_CELL pontos cada
+        self.cell_size = float(min(2.0, np.sqrt(self.area * self.POINTS_PER_CELL / count)))
+        self.grid_dim = int(np.ceil(2.0 / self.cell_size)) + 1
+        self.block_dim = self.grid_dim // self.BLOCK + 1
+
+        # Ordena os pontos pela chave da célula para localizar cada célula
+        # como um intervalo contíguo. A chave agrupa as células de um mesmo
+        # bloco grosso, que também ficam contíguas.
+        coords = self._cell_coords(self.points)
+        keys = self._cell_keys(coords)
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, first, self.cell_counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+        self.cell_starts = first
+        self.cell_lower = coords[self.order[first]] * self.cell_size - 1.0
+
+        # Nível grosso: cada bloco aponta para o intervalo de células finas
+        block_keys = self.cell_keys // self.BLOCK ** 3
+        _, self.block_starts, self.block_counts = np.unique(block_keys, return_index=True, return_counts=True)
+        self.block_size = self.cell_size * self.BLOCK
+        self.block_lower = (coords[self.order[first[self.block_starts]]] // self.BLOCK) * self.block_size - 1.0
+
+        # Envelope de todos os pontos
+        self.lower = self.points.min(axis=0) if len(self) else np.zeros(3)
+        self.upper = self.points.max(axis=0) if len(self) else np.zeros(3)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _cell_coords(self, points):
+        return np.floor((points + 1.0) / self.cell_size).astype(np.int64)
+
+    def _cell_keys(self, coords):
+        block = coords // self.BLOCK
+        local = coords % self.BLOCK
+        block_key = (block[..., 0] * self.block_dim + block[..., 1]) * self.block_dim + block[..., 2]
+        local_key = (local[..., 0] * self.BLOCK + local[..., 1]) * self.BLOCK + local[..., 2]
+        return block_key * self.BLOCK ** 3 + local_key
+
+    def _candidates(self, queries, chords):
+        """
+        Retorna pares (consulta, ponto) cujas células intersectam a bola de
+        raio chords[i] em torno de cada consulta i.
+        """
+        span = int(np.ceil(2 * chords.max() / self.cell_size)) + 1
+
+        # Raios grandes: é mais barato filtrar as células ocupadas pelos
+        # blocos grossos do que percorrer o cubo de células vizinhas
+        if span ** 3 > len(self.cell_keys):
+            return self._candidates_by_cell_bounds(queries, chords)
+
+        steps = np.arange(span)
+        offsets = np.stack(np.meshgrid(steps, steps, steps, indexing='ij'), axis=-1).reshape(-1, 3)
+
+        lower = self._cell_coords(queries - chords[:, None])
+        cells = lower[:, None, :] + offsets[None, :, :]
+        valid = np.all((cells >= 0) & (cells < self.grid_dim), axis=-1)
+        keys = self._cell_keys(cells)
+
+        # Localiza cada célula no índice ordenado; células inexistentes são descartadas
+        slots = np.clip(np.searchsorted(self.cell_keys, keys), 0, len(self.cell_keys) - 1)
+        found = valid & (self.cell_keys[slots] == keys)
+        query_ids = np.repeat(np.arange(len(queries)), keys.shape[1])
+        return self._points_of(query_ids[found.ravel()], slots[found])
+
+    def _block_pairs(self, queries, limits):
+        """Pares (consulta, bloco) com o bloco a até sqrt(limits[i]) da consulta i"""
+        step = max(1, 1_000_000 // max(len(self.block_starts), 1))
+        query_ids, blocks = [], []
+
+        for begin in range(0, len(queries), step):
+            block = queries[begin:begin + step, None, :]
+            gap = np.maximum(self.block_lower[None] - block, 0) + np.maximum(block - self.block_lower[None] - self.block_size, 0)
+            rows, cols = np.nonzero(np.einsum('ijk,ijk->ij', gap, gap) <= limits[begin:begin + len(block), None])
+            query_ids.append(rows + begin)
+            blocks.append(cols)
+
+        return np.concatenate(query_ids), np.concatenate(blocks)
+
+    def _candidates_by_cell_bounds(self, queries, chords):
+        """Seleciona as células cuja caixa está a até chords[i] da consulta i, em dois níveis"""
+        limits = chords ** 2
+        query_ids, blocks = self._block_pairs(queries, limits)
+
+        # Expande os blocos aprovados em suas células e testa cada célula
+        query_ids, slots = self._expand(query_ids, self.block_starts[blocks], self.block_counts[blocks])
+        diff = queries[query_ids] - self.cell_lower[slots]
+        gap = np.maximum(-diff, 0) + np.maximum(diff - self.cell_size, 0)
+        near = np.einsum('ij,ij->i', gap, gap) <= limits[query_ids]
+        return self._points_of(query_ids[near], slots[near])
+
+    def _points_of(self, query_ids, slots):
+        """Expande cada par (consulta, célula) nos pontos da célula"""
+        query_ids, positions = self._expand(query_ids, self.cell_starts[slots], self.cell_counts[slots])
+        return query_ids, self.order[positions]
+
+    @staticmethod
+    def _expand(ids, starts, counts):
+        """Expande intervalos [início, início + contagem) sem laços Python"""
+        total = int(counts.sum())
+        exclusive = np.cumsum(counts) - counts
+        positions = np.repeat(starts - exclusive, counts) + np.arange(total)
+        return np.repeat(ids, counts), positions
+
+    def _distance_to_blocks(self, queries):
+        """Distância em corda de cada consulta até o bloco ocupado mais próximo"""
+        step = max(1, 1_000_000 // max(len(self.block_starts), 1))
+        distances = []
+
+        for begin in range(0, len(queries), step):
+            block = queries[begin:begin + step, None, :]
+            gap = np.maximum(self.block_lower[None] - block, 0) + np.maximum(block - self.block_lower[None] - self.block_size, 0)
+            distances.append(np.sqrt(np.einsum('ijk,ijk->ij', gap, gap).min(axis=1)))
+
+        return np.concatenate(distances)
+
+    def _chord_distances(self, queries, query_ids, point_ids):
+        diff = queries[query_ids] - self.points[point_ids]
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+    def query(self, lats, lons, k=1):
+        """
+        Busca os k pontos mais próximos de cada coordenada.
+
+        Args:
+            lats, lons: Escalares ou arrays com as coordenadas (graus)
+            k: Número de vizinhos por ponto
+
+        Returns:
+            tuple: (distâncias em km, índices em self.names), ambos com forma (M, k)
+        """
+        queries = to_unit_vectors(np.atleast_1d(lats), np.atleast_1d(lons)).reshape(-1, 3)
+        k = min(k, len(self))
+        distances = np.full((len(queries), k), np.inf)
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+
+        if k == 0:
+            return distances, indices
+
+        # Raio esperado para conter k pontos, pela densidade média
+        guess = 1.5 * np.sqrt(k * self.area / (np.pi * len(self)))
+
+        for begin in range(0, len(queries), self.CHUNK_SIZE):
+            chunk = np.arange(begin, min(begin + self.CHUNK_SIZE, len(queries)))
+
+            # Nenhum ponto está mais perto que o bloco ocupado mais próximo;
+            # o raio cresce a partir dele, assim consultas distantes da região
+            # examinam apenas uma faixa estreita de pontos
+            base = np.zeros(len(chunk))
+            outside = np.any((queries[chunk] < self.lower - guess) | (queries[chunk] > self.upper + guess), axis=1)
+            if outside.any():
+                base[outside] = self._distance_to_blocks(queries[chunk[outside]])
+            step = np.full(len(chunk), guess)
+
+            # Dobra o incremento das consultas pendentes até cobrir k pontos
+            while len(chunk):
+                chunk_dist, chunk_idx, complete = self._knn_within(queries[chunk], k, base + step)
+                distances[chunk[complete]] = chunk_dist[complete]
+                indices[chunk[complete]] = chunk_idx[complete]
+                chunk, base, step = chunk[~complete], base[~complete], step[~complete] * 2
+
+        return chord_to_km(distances), indices
+
+    def _knn_within(self, queries, k, chords):
+        """Calcula os k vizinhos dentro de chords; indica quais consultas foram resolvidas"""
+        # Uma corda de 2 cobre a esfera inteira
+        chords = np.minimum(chords, 2.0)
+        query_ids, point_ids = self._candidates(queries, chords)
+        dist = self._chord_distances(queries, query_ids, point_ids)
+
+        inside = dist <= chords[query_ids]
+        query_ids, point_ids, dist = query_ids[inside], point_ids[inside], dist[inside]
+
+        counts = np.bincount(query_ids, minlength=len(queries))
+        complete = (counts >= k) | (chords >= 2.0)
+
+        # Ordena por consulta e distância, mantendo os k primeiros de cada grupo
+        order = np.lexsort((dist, query_ids))
+        query_ids, point_ids, dist = query_ids[order], point_ids[order], dist[order]
+        group_start = np.cumsum(counts) - counts
+        rank = np.arange(len(query_ids)) - group_start[query_ids]
+        keep = rank < k
+
+        out_dist = np.full((len(queries), k), np.inf)
+        out_idx = np.full((len(queries), k), -1, dtype=np.int64)
+        out_dist[query_ids[keep], rank[keep]] = dist[keep]
+        out_idx[query_ids[keep], rank[keep]] = point_ids[keep]
+        return out_dist, out_idx, complete
+
+    def query_radius(self, lats, lons, radius_km):
+        """
+        Busca todos os pontos a até radius_km de cada coordenada.
+
+        Returns:
+            list: Para cada coordenada, uma tupla (índices, distâncias em km)
+            ordenada pela distância
+        """
+        queries = to_unit_vectors(np.atleast_1d(lats), np.atleast_1d(lons)).reshape(-1, 3)
+        chord = float(min(km_to_chord(radius_km), 2.0))
+        results = []
+
+        for begin in range(0, len(queries), self.CHUNK_SIZE):
+            chunk = queries[begin:begin + self.CHUNK_SIZE]
+            query_ids, point_ids = self._candidates(chunk, np.full(len(chunk), chord))
+            dist = self._chord_distances(chunk, query_ids, point_ids)
+
+            inside = dist <= chord
+            query_ids, point_ids, dist = query_ids[inside], point_ids[inside], dist[inside]
+            order = np.lexsort((dist, query_ids))
+            query_ids, point_ids, dist = query_ids[order], point_ids[order], dist[order]
+
+            bounds = np.cumsum(np.bincount(query_ids, minlength=len(chunk)))[:-1]
+            for ids, chords in zip(np.split(point_ids, bounds), np.split(dist, bounds)):
+                results.append((ids, chord_to_km(chords)))
+
+        return results
+
+    def nearest(self, lat, lon):
+        """Retorna (nome, distância em km) do ponto mais próximo de uma coordenada"""
+        distances, indices = self.query(lat, lon, k=1)
+        return self.names[indices[0, 0]], float(distances[0, 0])
+
+    def nearest_names(self, lats, lons):
+        """Retorna o nome do ponto mais próximo para cada coordenada de um lote"""
+        _, indices = self.query(lats, lons, k=1)
+        return [self.names[i] for i in indices[:, 0]]
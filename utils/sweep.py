@@ -0,0 +1,107 @@
+import csv
+import json
+import os
+import time
+from multiprocessing import Pool
+from search.bfs import BFS
+from search.dfs import DFS
+from search.ucs import UCS
+from search.greedy import Greedy
+from search.astar import AStar
+from utils.shared_graph import SharedGraph
+
+ALGORITHMS = {
+    "bfs": BFS,
+    "dfs": DFS,
+    "ucs": UCS,
+    "greedy": Greedy,
+    "astar": AStar
+}
+
+FIELDS = ["origin", "destination", "transport_type", "algorithm", "distance", "expanded_nodes", "stops", "time_ms", "path"]
+
+# Estado de cada processo trabalhador
+_graph = None
+_algorithms = None
+_modes = None
+
+
+def _init_worker(manifest, algorithm_names, modes):
+    global _graph, _algorithms, _modes
+    _graph = SharedGraph.attach(manifest)
+    _algorithms = {name: ALGORITHMS[name]() for name in algorithm_names}
+    _modes = modes
+
+
+def _sweep_origin(origin_id):
+    """Executa todos os algoritmos de uma origem para todos os destinos"""
+    start = _graph.city_list[origin_id]
+    rows = []
+
+    for goal in _graph.city_list:
+        if goal == start:
+            continue
+        for mode in _modes:
+            for name, algorithm in _algorithms.items():
+                began = time.perf_counter()
+                result = algorithm.search(_graph, start, goal, mode)
+                elapsed = (time.perf_counter() - began) * 1000
+                rows.append({
+                    "origin": start.name,
+                    "destination": goal.name,
+                    "transport_type": mode,
+                    "algorithm": name,
+                    "distance": result.distance if result.path else None,
+                    "expanded_nodes": result.expanded_nodes,
+                    "stops": max(len(result.path) - 2, 0) if result.path else None,
+                    "time_ms": round(elapsed, 3),
+                    "path": " -> ".join(city.name for city in result.path)
+                })
+
+    return rows
+
+
+def run_sweep(shared_graph, output_file, algorithms=None, modes=("air", "land"), processes=None, origins=None, progress=None):
+    """
+    Executa todos os algoritmos para todos os pares origem-destino e modos.
+
+    O trabalho é dividido por origem entre os processos de um Pool. O grafo
+    é lido da memória compartilhada, e cada origem concluída é gravada no
+    arquivo de saída imediatamente (CSV, ou JSONL se a extensão for .jsonl).
+
+    Args:
+        shared_graph: SharedGraph já publicado
+        algorithms: Nomes dos algoritmos (padrão: todos)
+        origins: Nomes das origens (padrão: todas as cidades)
+        progress: Função opcional chamada com (origens concluídas, total)
+
+    Returns:
+        dict: Número de linhas gravadas e tempo total em segundos
+    """
+    algorithms = list(algorithms or ALGORITHMS)
+    if origins is None:
+        origin_ids = list(range(len(shared_graph)))
+    else:
+        origin_ids = [shared_graph.names.index(name) for name in origins]
+
+    jsonl = os.path.splitext(output_file)[1].lower() == ".jsonl"
+    began = time.perf_counter()
+    written = 0
+
+    with open(output_file, 'w', encoding='utf-8', newline='') as f, \
+            Pool(processes, initializer=_init_worker, initargs=(shared_graph.manifest, algorithms, tuple(modes))) as pool:
+        writer = None if jsonl else csv.DictWriter(f, fieldnames=FIELDS)
+        if writer:
+            writer.writeheader()
+
+        for done, rows in enumerate(pool.imap_unordered(_sweep_origin, origin_ids), 1):
+            if jsonl:
+                f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+            else:
+                writer.writerows(rows)
+            f.flush()
+            written += len(rows)
+            if progress:
+                progress(done, len(origin_ids))
+
+    return {"rows": written, "elapsed": time.perf_counter() - began}
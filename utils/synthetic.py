@@ -0,0 +1,70 @@
+import numpy as np
+from utils.geodesy import haversine
+from utils.spatial_index import SpatialIndex
+
+# Fator aproximado entre a distância rodoviária e a distância em linha reta
+ROAD_FACTOR = 1.3
+
+
+def generate_graph_arrays(num_cities, land_neighbors=6, seed=0, bounds=(-33.0, 5.0, -73.0, -35.0)):
+    """
+    Gera um grafo sintético com cidades aleatórias dentro de `bounds`.
+
+    A malha aérea é completa (distância de grande círculo entre todos os
+    pares) e a terrestre liga cada cidade às `land_neighbors` mais próximas,
+    com a distância multiplicada por ROAD_FACTOR.
+
+    Args:
+        bounds: (lat mínima, lat máxima, lon mínima, lon máxima)
+
+    Returns:
+        tuple: (nomes, coordenadas {nome: (lat, lon)}, adjacência CSR no
+        formato aceito por SharedGraph.publish)
+    """
+    rng = np.random.default_rng(seed)
+    lat_min, lat_max, lon_min, lon_max = bounds
+    lats = rng.uniform(lat_min, lat_max, num_cities)
+    lons = rng.uniform(lon_min, lon_max, num_cities)
+    names = [f"Cidade {i:05d}" for i in range(num_cities)]
+    coordinates = dict(zip(names, zip(lats.tolist(), lons.tolist())))
+
+    # Malha aérea: todos os pares, em blocos de linhas para limitar a memória
+    air_indptr = np.arange(num_cities + 1, dtype=np.int64) * (num_cities - 1)
+    air_indices = np.empty(num_cities * (num_cities - 1), dtype=np.int32)
+    air_weights = np.empty(num_cities * (num_cities - 1), dtype=np.float64)
+    others = np.arange(num_cities)
+    block = max(1, 1_000_000 // max(num_cities, 1))
+
+    for begin in range(0, num_cities, block):
+        rows = np.arange(begin, min(begin + block, num_cities))
+        distances = haversine(lats[rows, None], lons[rows, None], lats[None, :], lons[None, :])
+        # Remove a diagonal; cada linha fica com as outras num_cities - 1 cidades, em ordem
+        off_diagonal = others[None, :] != rows[:, None]
+        first, last = air_indptr[rows[0]], air_indptr[rows[-1] + 1]
+        air_indices[first:last] = np.broadcast_to(others, off_diagonal.shape)[off_diagonal]
+        air_weights[first:last] = np.round(distances[off_diagonal])
+
+    # Malha terrestre: k vizinhos mais próximos (o primeiro é a própria
+    # cidade), tornada simétrica. O índice preserva a ordem de `names`.
+    index = SpatialIndex(coordinates)
+    k = min(land_neighbors + 1, num_cities)
+    distances, neighbors = index.query(lats, lons, k=k)
+    sources = np.repeat(np.arange(num_cities), k - 1)
+    targets = neighbors[:, 1:].ravel()
+    weights = np.round(distances[:, 1:].ravel() * ROAD_FACTOR)
+
+    edges = {}
+    for i, j, w in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+        edges[(i, j)] = edges[(j, i)] = w
+
+    keys = sorted(edges)
+    land_indices = np.array([j for _, j in keys], dtype=np.int32)
+    land_weights = np.array([edges[key] for key in keys], dtype=np.float64)
+    land_indptr = np.zeros(num_cities + 1, dtype=np.int64)
+    land_indptr[1:] = np.cumsum(np.bincount([i for i, _ in keys], minlength=num_cities))
+
+    adjacency = {
+        "air": (air_indptr, air_indices, air_weights),
+        "land": (land_indptr, land_indices, land_weights),
+    }
+    return names, coordinates, adjacency
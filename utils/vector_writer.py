@@ -0,0 +1,311 @@
+"""
+Saída vetorial (SVG e GeoJSON) dos mapas de rotas, sem matplotlib.
+
+O contorno do país, o fundo e as capitais são convertidos para SVG uma única
+vez por VectorRouteWriter; cada rota só acrescenta seus próprios elementos
+(marcadores, rótulos, trechos, setas, título e legenda) com o mesmo estilo
+de utils/map_renderer.py. Gerar uma rota é só formatação de texto.
+"""
+
+import json
+from xml.sax.saxutils import escape
+from geo_coordinates import CAPITAL_COORDINATES
+from utils.geodesy import coordinate_set
+from utils.label_placement import text_size
+from utils.map_renderer import (
+    MAP_XLIM, MAP_YLIM, calculate_best_legend_position, label_offsets, load_map_basemap,
+    place_route_labels, route_legs
+)
+
+# Área dos eixos na figura (padrão do matplotlib: left, bottom, right, top)
+AXES_AREA = (0.125, 0.11, 0.9, 0.88)
+
+# Estilos dos marcadores e rótulos: (tamanho do marcador, borda, cor,
+# fonte, negrito, fundo do rótulo, borda do rótulo, espessura, margem, deslocamento)
+CITY_STYLES = {
+    "origin": (14, 2, '#228B22', 11, True, '#90EE90', '#228B22', 2, 0.4, 1.0),
+    "destination": (14, 2, '#DC143C', 11, True, '#FFB6C1', '#DC143C', 2, 0.4, 1.0),
+    "stop": (11, 1.5, '#4169E1', 9, False, '#ADD8E6', '#4169E1', 1, 0.3, 0.7)
+}
+
+ROUTE_COLORS = {"air": '#4169E1', "land": '#8B4513'}
+TRANSPORT_NAMES = {"air": "Aéreo", "land": "Terrestre"}
+
+CONTENT_TYPES = {"svg": "image/svg+xml", "geojson": "application/geo+json"}
+
+
+def city_role(index, count):
+    if index == 0:
+        return "origin"
+    if index == count - 1:
+        return "destination"
+    return "stop"
+
+
+def route_geojson(path_names, transport_type, distance=None):
+    """
+    FeatureCollection da rota: um Point por cidade (com o papel na rota) e
+    um LineString por trecho.
+    """
+    features = []
+    for i, name in enumerate(path_names):
+        if name in CAPITAL_COORDINATES:
+            lat, lon = CAPITAL_COORDINATES[name]
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {"name": name, "role": city_role(i, len(path_names)), "order": i}
+            })
+    geometry = coordinate_set()
+    # route_legs ignora os trechos com cidades sem coordenadas
+    pairs = [(origin, destination) for origin, destination in zip(path_names, path_names[1:])
+             if origin in CAPITAL_COORDINATES and destination in CAPITAL_COORDINATES]
+    for i, ((origin, destination), leg) in enumerate(zip(pairs, route_legs(path_names, transport_type))):
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": [list(point) for point in leg]},
+            "properties": {
+                "from": origin, "to": destination, "transport": transport_type, "leg": i,
+                # Rumo inicial e distância de grande círculo entre as duas cidades
+                "bearing": round(geometry.bearing(origin, destination), 1),
+                "great_circle_km": round(geometry.distance(origin, destination), 1)
+            }
+        })
+
+    properties = {"origin": path_names[0], "destination": path_names[-1], "transport": transport_type}
+    if distance is not None:
+        properties["distance"] = distance
+    return {"type": "FeatureCollection", "properties": properties, "features": features}
+
+
+class VectorRouteWriter:
+    """
+    Gera o mapa de uma rota em SVG (ou GeoJSON) sem criar figuras.
+
+    A projeção reproduz a do matplotlib (limites MAP_XLIM/MAP_YLIM e a
+    proporção do mapa base, centralizados na área padrão dos eixos), então
+    um SVG de 1000x800 se sobrepõe ao PNG de MapRenderer com figsize=(10, 8).
+    """
+
+    def __init__(self, basemap=None, city_names=None, width=1000, height=800, dpi=100,
+                 output_format="svg", max_error_pixels=0.5):
+        if output_format not in CONTENT_TYPES:
+            raise ValueError(f"Formato '{output_format}' inválido (use svg ou geojson)")
+        self.format = output_format
+        self.extension = "." + output_format
+        self.content_type = CONTENT_TYPES[output_format]
+        if output_format == "geojson":
+            return
+
+        if basemap is None:
+            basemap = load_map_basemap(verbose=False)
+        if city_names is None:
+            city_names = list(CAPITAL_COORDINATES)
+
+        self.width = width
+        self.height = height
+        # Pontos tipográficos -> pixels
+        self.pt = dpi / 72
+
+        left, bottom, right, top = AXES_AREA
+        area_width = (right - left) * width
+        area_height = (top - bottom) * height
+        lon_span = MAP_XLIM[1] - MAP_XLIM[0]
+        lat_span = MAP_YLIM[1] - MAP_YLIM[0]
+        aspect = float(basemap.aspect)
+        self.scale = min(area_width / lon_span, area_height / (lat_span * aspect))
+        self.x0 = left * width + (area_width - lon_span * self.scale) / 2
+        self.y0 = (1 - top) * height + (area_height - lat_span * aspect * self.scale) / 2
+        self.y_scale = self.scale * aspect
+        self.axes_box = (self.x0, self.y0, self.x0 + lon_span * self.scale, self.y0 + lat_span * self.y_scale)
+
+        self.base = self._base_fragment(basemap.level_for(1 / self.scale, max_error_pixels), city_names)
+
+    def project(self, lon, lat):
+        return self.x0 + (lon - MAP_XLIM[0]) * self.scale, self.y0 + (MAP_YLIM[1] - lat) * self.y_scale
+
+    def display(self, lon, lat):
+        """Como project, mas com y para cima (coordenadas de display do matplotlib)"""
+        x, y = self.project(lon, lat)
+        return x, self.height - y
+
+    def _base_fragment(self, level, city_names):
+        """Fundo, contorno do país e capitais (o que não muda entre as rotas)"""
+        x_min, y_min, x_max, y_max = self.axes_box
+        axes_rect = f'x="{x_min:.1f}" y="{y_min:.1f}" width="{x_max - x_min:.1f}" height="{y_max - y_min:.1f}"'
+
+        rings = []
+        for ring in level.rings():
+            points = " ".join(f"{x:.1f},{y:.1f}" for x, y in (self.project(lon, lat) for lon, lat in ring))
+            rings.append(f"M{points}Z")
+
+        parts = [
+            f'<rect width="{self.width}" height="{self.height}" fill="white"/>',
+            '<defs>',
+            f'<clipPath id="axes"><rect {axes_rect}/></clipPath>',
+            # O contorno é definido uma vez e usado no preenchimento e na borda
+            f'<path id="country" d="{"".join(rings)}" fill-rule="evenodd"/>'
+        ]
+        for transport_type, color in ROUTE_COLORS.items():
+            parts.append(
+                f'<marker id="arrow-{transport_type}" viewBox="0 0 10 10" refX="10" refY="5" '
+                f'markerWidth="{4 * self.pt:.1f}" markerHeight="{4 * self.pt:.1f}" markerUnits="userSpaceOnUse" orient="auto">'
+                f'<path d="M0,0 L10,5 L0,10" fill="none" stroke="{color}" stroke-width="2"/></marker>'
+            )
+        parts.append('</defs>')
+
+        parts.append(f'<rect {axes_rect} fill="#F0F8FF"/>')
+        parts.append('<g clip-path="url(#axes)">')
+        parts.append(f'<use href="#country" fill="#E6F3FF" fill-opacity="0.8" '
+                     f'stroke="#2F4F4F" stroke-width="{1.2 * self.pt:.2f}" stroke-opacity="0.8"/>')
+        parts.append(f'<use href="#country" fill="none" stroke="#1C3A3A" stroke-width="{2 * self.pt:.2f}" '
+                     f'stroke-opacity="0.9" stroke-linejoin="round"/>')
+
+        known = set(city_names)
+        radius = 1.5 * self.pt
+        for name, (lat, lon) in CAPITAL_COORDINATES.items():
+            if name in known:
+                x, y = self.project(lon, lat)
+                parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{radius:.1f}" fill="#708090" '
+                             f'fill-opacity="0.6" stroke="white" stroke-width="{0.5 * self.pt:.2f}"/>')
+        parts.append('</g>')
+        return "\n".join(parts)
+
+    def _text_box(self, x, y, text, fontsize, bold, ha, va, facecolor, edgecolor, linewidth, pad, alpha):
+        """Texto com caixa arredondada alinhado como o annotate do matplotlib"""
+        size = fontsize * self.pt
+        # Largura estimada (sem medir a fonte), a mesma usada no posicionamento
+        text_width, text_height = text_size(text, size, bold)
+        if ha == "left":
+            left = x
+        elif ha == "right":
+            left = x - text_width
+        else:
+            left = x - text_width / 2
+        if va == "bottom":
+            top = y - text_height
+        elif va == "top":
+            top = y
+        else:
+            top = y - text_height / 2
+
+        padding = pad * size
+        weight = ' font-weight="bold"' if bold else ''
+        return (
+            f'<rect x="{left - padding:.1f}" y="{top - padding:.1f}" width="{text_width + 2 * padding:.1f}" '
+            f'height="{text_height + 2 * padding:.1f}" rx="{padding:.1f}" fill="{facecolor}" fill-opacity="{alpha}" '
+            f'stroke="{edgecolor}" stroke-width="{linewidth * self.pt:.2f}"/>'
+            f'<text x="{left + text_width / 2:.1f}" y="{top + text_height * 0.8:.1f}" font-size="{size:.1f}"'
+            f'{weight} text-anchor="middle">{escape(text)}</text>'
+        )
+
+    def _legend(self, transport_type, location):
+        size = 9 * self.pt
+        row = size * 1.6
+        box_width, box_height = size * 9, row * 4 + size
+        x_min, y_min, x_max, y_max = self.axes_box
+        margin = size
+        vertical, horizontal = location.split()
+        left = x_min + margin if horizontal == "left" else x_max - margin - box_width
+        top = y_min + margin if vertical == "upper" else y_max - margin - box_height
+
+        color = ROUTE_COLORS[transport_type]
+        parts = [
+            f'<rect x="{left + 2:.1f}" y="{top + 2:.1f}" width="{box_width:.1f}" height="{box_height:.1f}" '
+            f'rx="{size * 0.4:.1f}" fill="black" fill-opacity="0.3"/>',
+            f'<rect x="{left:.1f}" y="{top:.1f}" width="{box_width:.1f}" height="{box_height:.1f}" '
+            f'rx="{size * 0.4:.1f}" fill="white" fill-opacity="0.95" stroke="#cccccc"/>'
+        ]
+        entries = [
+            ("circle", '#228B22', 'Origem'),
+            ("circle", '#DC143C', 'Destino'),
+            ("circle", '#4169E1', 'Parada'),
+            ("line", color, f'Rota {TRANSPORT_NAMES[transport_type]}')
+        ]
+        for i, (kind, entry_color, label) in enumerate(entries):
+            y = top + size + row * i + row / 2
+            x = left + size * 1.5
+            if kind == "circle":
+                parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{size * 0.5:.1f}" fill="{entry_color}" stroke="white"/>')
+            else:
+                parts.append(f'<line x1="{x - size * 0.7:.1f}" y1="{y:.1f}" x2="{x + size * 0.7:.1f}" y2="{y:.1f}" '
+                             f'stroke="{entry_color}" stroke-width="{3 * self.pt:.1f}"/>')
+            parts.append(f'<text x="{x + size * 1.3:.1f}" y="{y + size * 0.35:.1f}" font-size="{size:.1f}">{escape(label)}</text>')
+        return "".join(parts)
+
+    def route_svg(self, path_names, transport_type="air"):
+        """Documento SVG completo da rota"""
+        color = ROUTE_COLORS[transport_type]
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+            f'viewBox="0 0 {self.width} {self.height}" font-family="DejaVu Sans, sans-serif">',
+            self.base,
+            '<g clip-path="url(#axes)">'
+        ]
+
+        # Posicionamento dos rótulos em pixels com y para cima, como no PNG
+        x_min, y_min, x_max, y_max = self.axes_box
+        positions = place_route_labels(
+            path_names, transport_type, self.display, (x_min, self.height - y_max, x_max, self.height - y_min), self.pt
+        )
+
+        # Mesma ordem de desenho do matplotlib: marcadores, trechos, rótulos e setas
+        labels = []
+        for i, name in enumerate(path_names):
+            if name not in CAPITAL_COORDINATES:
+                continue
+            lat, lon = CAPITAL_COORDINATES[name]
+            marker, edge, marker_color, fontsize, bold, facecolor, edgecolor, linewidth, pad, shift = \
+                CITY_STYLES[city_role(i, len(path_names))]
+            ha, va = positions[name]
+            offset_x, offset_y = label_offsets(ha, va, 0.4, 0.4)
+
+            x, y = self.project(lon, lat)
+            parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{marker / 2 * self.pt:.1f}" fill="{marker_color}" '
+                         f'fill-opacity="0.9" stroke="white" stroke-width="{edge * self.pt:.1f}"/>')
+            label_x, label_y = self.project(lon + offset_x * shift, lat + offset_y * shift)
+            labels.append(self._text_box(label_x, label_y, name, fontsize, bold, ha, va,
+                                         facecolor, edgecolor, linewidth, pad, 0.95 if bold else 0.9))
+
+        arrows = []
+        line_width = 3 * self.pt
+        for leg in route_legs(path_names, transport_type):
+            points = [self.project(lon, lat) for lon, lat in leg]
+            coords = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+            parts.append(f'<polyline points="{coords}" fill="none" stroke="{color}" stroke-opacity="0.8" '
+                         f'stroke-width="{line_width:.1f}" stroke-linecap="round" stroke-linejoin="round"/>')
+            # Como no mapa PNG: seta do meio do arco (aéreo) ou do último segmento (terrestre) até o destino
+            shaft = points[len(points) // 2:] if transport_type == "air" else points[-2:]
+            shaft_coords = " ".join(f"{x:.1f},{y:.1f}" for x, y in shaft)
+            arrows.append(f'<polyline points="{shaft_coords}" fill="none" stroke="{color}" '
+                          f'stroke-width="{2 * self.pt:.1f}" marker-end="url(#arrow-{transport_type})"/>')
+
+        parts.extend(labels)
+        parts.extend(arrows)
+        parts.append('</g>')
+
+        # Título acima dos eixos e legenda no canto mais livre
+        title = f"Rota {TRANSPORT_NAMES[transport_type]}: {path_names[0]} → {path_names[-1]}"
+        title_y = self.axes_box[1] - 20 * self.pt
+        parts.append(f'<text x="{self.width / 2:.1f}" y="{title_y:.1f}" font-size="{14 * self.pt:.1f}" '
+                     f'font-weight="bold" text-anchor="middle">{escape(title)}</text>')
+        parts.append(self._legend(transport_type, calculate_best_legend_position(path_names)))
+        parts.append('</svg>')
+        return "\n".join(parts)
+
+    def route_bytes(self, path_names, transport_type="air", distance=None):
+        """Conteúdo do arquivo no formato do escritor"""
+        if self.format == "geojson":
+            return json.dumps(route_geojson(path_names, transport_type, distance), ensure_ascii=False).encode("utf-8")
+        return self.route_svg(path_names, transport_type).encode("utf-8")
+
+    def save(self, path_names, transport_type, output):
+        """
+        Grava a rota no arquivo `output`.
+
+        Returns:
+            bool: sempre False (a saída vetorial não passa pelo cache de imagens)
+        """
+        with open(output, "wb") as f:
+            f.write(self.route_bytes(path_names, transport_type))
+        return False